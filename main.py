@@ -1,9 +1,22 @@
 # main.py
+import argparse
+import asyncio
+
 from src.agent import terminal_agent
 
 if __name__ == "__main__":
     # Antes de rodar, certifique-se de que o servidor FastAPI (mcp_server.py)
     # esteja rodando em outro terminal:
     # poetry run uvicorn src.services.mcp_server:app --reload
+    parser = argparse.ArgumentParser(description="Agente de terminal para busca de carros.")
+    parser.add_argument("--assincrono", action="store_true",
+                        help="Busca em paralelo com o LLM e adianta a próxima página de resultados.")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Mostra os filtros entendidos à medida que o LLM responde.")
+    args = parser.parse_args()
 
-    terminal_agent.iniciar_conversa()
\ No newline at end of file
+    if args.assincrono:
+        from src.agent.agente_assincrono import iniciar_conversa_assincrona
+        asyncio.run(iniciar_conversa_assincrona(streaming=args.streaming))
+    else:
+        terminal_agent.iniciar_conversa(streaming=args.streaming)
@@ -0,0 +1,133 @@
+# src/agent/agente_assincrono.py
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from src.agent.cliente_busca import ClienteBuscaAutomoveis
+from src.agent.terminal_agent import (
+    PALAVRAS_SAIR, apresentar_resultados, buscar_pagina, deve_extrair, extrair_e_mostrar, filtros_para_servidor,
+    mostrar_entendimento, pediu_busca, reportar_estatisticas_extracao, responder_sem_busca, slots_vazios, tem_filtros,
+)
+
+# Modo assíncrono do agente. No modo tradicional cada turno é sequencial
+# (input -> LLM -> busca); aqui a busca com os slots atuais começa enquanto o
+# LLM ainda interpreta a frase, e a próxima página é buscada enquanto o usuário
+# lê a atual. Assim, a espera por turno fica perto de max(LLM, busca) em vez da
+# soma. As chamadas bloqueantes (input, LLM, requests) rodam em threads via
+# asyncio.to_thread.
+
+PALAVRAS_MAIS = ["mais", "proxima", "próxima"]
+
+
+class BuscasEspeculativas:
+    """
+    Buscas em andamento, por (filtros, cursor). Uma busca iniciada antes de ser
+    pedida é reaproveitada se os filtros continuarem os mesmos; quando os filtros
+    mudam, as buscas anteriores são canceladas (a thread da requisição termina
+    sozinha, mas o resultado é descartado). Cada resultado é entregue uma vez:
+    um novo "buscar" com os mesmos filtros consulta o servidor de novo.
+    """
+
+    def __init__(self, cliente: Optional[ClienteBuscaAutomoveis] = None):
+        self.cliente = cliente
+        self._tarefas: Dict[tuple, asyncio.Task] = {}
+        self.iniciadas = 0
+        self.reaproveitadas = 0
+        self.canceladas = 0
+
+    @staticmethod
+    def _chave(slots: dict, cursor: Optional[str]) -> tuple:
+        return tuple(sorted(filtros_para_servidor(slots).items())), cursor
+
+    def iniciar(self, slots: dict, cursor: Optional[str] = None) -> asyncio.Task:
+        chave = self._chave(slots, cursor)
+        for chave_obsoleta in [c for c in self._tarefas if c[0] != chave[0]]:
+            self._cancelar(chave_obsoleta)
+        if chave not in self._tarefas:
+            self._tarefas[chave] = asyncio.create_task(
+                asyncio.to_thread(buscar_pagina, dict(slots), cursor, self.cliente, False)
+            )
+            self.iniciadas += 1
+        return self._tarefas[chave]
+
+    async def obter(self, slots: dict, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+        chave = self._chave(slots, cursor)
+        if chave in self._tarefas:
+            self.reaproveitadas += 1
+        tarefa = self.iniciar(slots, cursor)
+        try:
+            return await tarefa
+        finally:
+            self._tarefas.pop(chave, None)
+
+    def _cancelar(self, chave: tuple) -> None:
+        tarefa = self._tarefas.pop(chave)
+        if not tarefa.done():
+            tarefa.cancel()
+            self.canceladas += 1
+
+    def cancelar_todas(self) -> None:
+        for chave in list(self._tarefas):
+            self._cancelar(chave)
+
+
+async def ler_entrada_terminal() -> str:
+    return await asyncio.to_thread(input, "\nVocê: ")
+
+async def iniciar_conversa_assincrona(
+    ler_entrada: Callable[[], Awaitable[str]] = ler_entrada_terminal,
+    buscas: Optional[BuscasEspeculativas] = None,
+    streaming: bool = False,
+):
+    print("👋 Olá! Sou seu agente virtual de busca de carros (com Gemini!).")
+    print("Como posso te ajudar a encontrar um veículo hoje? (Ex: 'quero um Fiat Uno até 30000', 'Chevrolet Onix 2019 flex')")
+    slots = slots_vazios()
+    buscas = buscas or BuscasEspeculativas()
+    slots_pagina, proximo_cursor = None, None # Filtros e cursor da última página mostrada, para o "mais"
+    try:
+        while True:
+            entrada_usuario = (await ler_entrada()).strip()
+            if not entrada_usuario and not tem_filtros(slots):
+                print("Por favor, me diga o que você procura ou forneça alguns detalhes.")
+                continue
+
+            if entrada_usuario.lower() in PALAVRAS_SAIR:
+                print("Até logo! 👋")
+                reportar_estatisticas_extracao()
+                print(f"📊 Buscas antecipadas: {buscas.reaproveitadas} reaproveitada(s) de {buscas.iniciadas} "
+                      f"iniciada(s), {buscas.canceladas} cancelada(s).")
+                break
+
+            if entrada_usuario.lower() in PALAVRAS_MAIS:
+                if proximo_cursor is None:
+                    print("Agente: Não há mais resultados para esses filtros.")
+                    continue
+                automoveis, proximo_cursor = await buscas.obter(slots_pagina, proximo_cursor)
+                apresentar_resultados(automoveis)
+                if proximo_cursor:
+                    buscas.iniciar(slots_pagina, proximo_cursor)
+                continue
+
+            if tem_filtros(slots):
+                buscas.iniciar(slots) # Se a frase não mudar os filtros, a busca já estará a caminho
+            if deve_extrair(slots, entrada_usuario):
+                slots = await asyncio.to_thread(extrair_e_mostrar, entrada_usuario, slots, streaming)
+            else:
+                mostrar_entendimento(slots, entrada_usuario)
+
+            if pediu_busca(slots, entrada_usuario):
+                filtros = filtros_para_servidor(slots)
+                print(f"\n🕵️ Buscando com os seguintes filtros: {filtros if filtros else 'todos os carros'}...")
+                automoveis, proximo_cursor = await buscas.obter(slots)
+                slots_pagina = dict(slots)
+                apresentar_resultados(automoveis)
+                if proximo_cursor:
+                    buscas.iniciar(slots_pagina, proximo_cursor) # Próxima página enquanto o usuário lê esta
+                    print("(Digite 'mais' para ver outros resultados.)")
+                print("\nO que mais posso fazer por você? (Forneça mais detalhes, 'buscar' novamente, ou 'sair')")
+                continue
+
+            responder_sem_busca(slots, entrada_usuario)
+            if tem_filtros(slots):
+                buscas.iniciar(slots) # Filtros novos: adianta a busca para o próximo "buscar"
+    finally:
+        buscas.cancelar_todas()
@@ -0,0 +1,128 @@
+# src/agent/cache_extracao.py
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Callable, Optional
+
+# Cache persistente das extrações do LLM. As frases dos usuários se repetem
+# muito entre sessões ("carro flex até 50 mil"), e para o mesmo texto com os
+# mesmos filtros já coletados (e o mesmo prompt) a resposta do LLM é a mesma:
+# guardá-la em um arquivo SQLite evita a chamada de centenas de milissegundos.
+# Entradas expiram após um TTL e, passado o limite de tamanho, as menos usadas
+# recentemente são descartadas (LRU).
+
+CACHE_EXTRACAO_ARQUIVO = os.getenv("CACHE_EXTRACAO_ARQUIVO", "./data/cache_extracao.db")
+CACHE_EXTRACAO_TTL = float(os.getenv("CACHE_EXTRACAO_TTL", str(7 * 24 * 3600)))  # Segundos
+CACHE_EXTRACAO_MAX_ENTRADAS = int(os.getenv("CACHE_EXTRACAO_MAX_ENTRADAS", "10000"))
+CACHE_EXTRACAO_ATIVO = os.getenv("CACHE_EXTRACAO", "1") != "0"
+
+def normalizar_texto(texto: str) -> str:
+    """Forma canônica da frase: Unicode NFKC, minúsculas, espaços colapsados e sem pontuação final."""
+    texto = unicodedata.normalize("NFKC", texto).casefold()
+    texto = re.sub(r"\s+", " ", texto).strip()
+    return texto.rstrip(" .!?")
+
+
+class CacheExtracao:
+    def __init__(
+        self,
+        caminho: str = CACHE_EXTRACAO_ARQUIVO,
+        ttl: float = CACHE_EXTRACAO_TTL,
+        max_entradas: int = CACHE_EXTRACAO_MAX_ENTRADAS,
+        relogio: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self.relogio = relogio
+        self.acertos = 0
+        self.faltas = 0
+        if caminho != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        # check_same_thread=False + trava: o cache pode ser usado por threads de um executor
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._trava = threading.Lock()
+        self._conexao.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS extracoes (
+                chave TEXT PRIMARY KEY,
+                resultado TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                ultimo_acesso REAL NOT NULL,
+                acertos INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS ix_extracoes_ultimo_acesso ON extracoes (ultimo_acesso);
+        """)
+
+    @staticmethod
+    def chave(texto: str, contexto_slots: dict, versao_prompt: str) -> str:
+        """sha256 do texto normalizado + filtros já coletados + versão do prompt/modelo."""
+        material = json.dumps(
+            [normalizar_texto(texto), contexto_slots, versao_prompt], sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def obter(self, chave: str) -> Optional[dict]:
+        agora = self.relogio()
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT resultado, criado_em FROM extracoes WHERE chave = ?", (chave,)
+            ).fetchone()
+            if linha is not None and agora - linha[1] > self.ttl:
+                self._conexao.execute("DELETE FROM extracoes WHERE chave = ?", (chave,))
+                linha = None
+            if linha is None:
+                self.faltas += 1
+                return None
+            self._conexao.execute(
+                "UPDATE extracoes SET ultimo_acesso = ?, acertos = acertos + 1 WHERE chave = ?", (agora, chave)
+            )
+            self.acertos += 1
+            return json.loads(linha[0])
+
+    def guardar(self, chave: str, resultado: dict) -> None:
+        agora = self.relogio()
+        with self._trava:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO extracoes (chave, resultado, criado_em, ultimo_acesso) VALUES (?, ?, ?, ?)",
+                (chave, json.dumps(resultado, ensure_ascii=False), agora, agora),
+            )
+            # Expiradas primeiro; depois, acima do limite, as de acesso mais antigo
+            self._conexao.execute("DELETE FROM extracoes WHERE criado_em < ?", (agora - self.ttl,))
+            self._conexao.execute(
+                "DELETE FROM extracoes WHERE chave IN ("
+                " SELECT chave FROM extracoes ORDER BY ultimo_acesso DESC LIMIT -1 OFFSET ?)",
+                (self.max_entradas,),
+            )
+
+    def estatisticas(self) -> dict:
+        """Taxa de acerto deste processo e números acumulados do arquivo."""
+        consultas = self.acertos + self.faltas
+        with self._trava:
+            entradas, acertos_acumulados = self._conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(acertos), 0) FROM extracoes"
+            ).fetchone()
+        return {
+            "acertos": self.acertos,
+            "faltas": self.faltas,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            "entradas": entradas,
+            "acertos_acumulados": acertos_acumulados,
+        }
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+
+_cache_padrao: Optional[CacheExtracao] = None
+
+def obter_cache_extracao() -> Optional[CacheExtracao]:
+    """Cache compartilhado do processo, aberto no primeiro uso (None se desativado com CACHE_EXTRACAO=0)."""
+    global _cache_padrao
+    if _cache_padrao is None and CACHE_EXTRACAO_ATIVO:
+        _cache_padrao = CacheExtracao()
+    return _cache_padrao
@@ -0,0 +1,96 @@
+# src/agent/cliente_busca.py
+import os
+import threading
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# URL do endpoint de busca; pode apontar para outro host com a variável MCP_SERVER_URL
+SERVER_URL = os.getenv("MCP_SERVER_URL", "http://127.0.0.1:8000/api/v1/automoveis/buscar")
+TIMEOUT_CONEXAO = float(os.getenv("MCP_TIMEOUT_CONEXAO", "3.05"))  # Segundos para abrir a conexão TCP
+TIMEOUT_LEITURA = float(os.getenv("MCP_TIMEOUT_LEITURA", "15"))    # Segundos de espera pela resposta
+TENTATIVAS = int(os.getenv("MCP_TENTATIVAS", "3"))
+
+# Erros transitórios do servidor (ou do proxy na frente dele) que vale repetir
+STATUS_REPETIVEIS = (429, 502, 503, 504)
+
+
+class ClienteBuscaAutomoveis:
+    """
+    Cliente HTTP do servidor MCP. Mantém uma requests.Session por thread, de
+    modo que as buscas reaproveitam conexões keep-alive do pool em vez de abrir
+    uma conexão TCP por chamada, e aplica timeouts e novas tentativas com backoff
+    exponencial. A busca é só leitura, então repetir o POST é seguro.
+    A requests.Session não é thread-safe, e o modo assíncrono faz buscas em
+    paralelo via asyncio.to_thread: cada thread ganha sua sessão (e seu pool).
+    """
+
+    def __init__(
+        self,
+        url_busca: str = SERVER_URL,
+        timeout_conexao: float = TIMEOUT_CONEXAO,
+        timeout_leitura: float = TIMEOUT_LEITURA,
+        tentativas: int = TENTATIVAS,
+        fator_backoff: float = 0.3,
+        tamanho_pool: int = 10,
+    ):
+        self.url_busca = url_busca
+        self.timeout = (timeout_conexao, timeout_leitura)
+        self.tamanho_pool = tamanho_pool
+        self.retry = Retry(
+            total=tentativas,
+            backoff_factor=fator_backoff,  # Espera 0.3s, 0.6s, 1.2s... entre as tentativas
+            status_forcelist=STATUS_REPETIVEIS,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,  # Esgotadas as tentativas, devolve a última resposta para o raise_for_status
+        )
+        self._local = threading.local()
+        self._sessoes: List[requests.Session] = [] # Todas as sessões criadas, para o fechar()
+        self._trava = threading.Lock()
+
+    @property
+    def sessao(self) -> requests.Session:
+        """Sessão da thread atual, criada no primeiro uso."""
+        sessao = getattr(self._local, "sessao", None)
+        if sessao is None:
+            adaptador = HTTPAdapter(max_retries=self.retry, pool_connections=self.tamanho_pool, pool_maxsize=self.tamanho_pool)
+            sessao = requests.Session()
+            sessao.mount("http://", adaptador)
+            sessao.mount("https://", adaptador)
+            self._local.sessao = sessao
+            with self._trava:
+                self._sessoes.append(sessao)
+        return sessao
+
+    def buscar(self, payload: dict, **kwargs) -> requests.Response:
+        """Envia uma requisição MCP ao endpoint de busca; kwargs extras (headers, stream...) vão para o requests."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.sessao.post(self.url_busca, json=payload, **kwargs)
+
+    def fechar(self) -> None:
+        with self._trava:
+            sessoes, self._sessoes = self._sessoes, []
+        for sessao in sessoes:
+            sessao.close()
+        self._local = threading.local() # Um uso depois do fechar() abre sessões novas
+
+    def __enter__(self) -> "ClienteBuscaAutomoveis":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+
+_cliente_padrao: Optional[ClienteBuscaAutomoveis] = None
+_trava_cliente_padrao = threading.Lock()
+
+def obter_cliente_busca() -> ClienteBuscaAutomoveis:
+    """Cliente compartilhado do processo, criado na primeira busca (de qualquer thread)."""
+    global _cliente_padrao
+    if _cliente_padrao is None:
+        with _trava_cliente_padrao:
+            if _cliente_padrao is None: # Outra thread pode ter criado enquanto esperávamos a trava
+                _cliente_padrao = ClienteBuscaAutomoveis()
+    return _cliente_padrao
@@ -0,0 +1,215 @@
+# src/agent/extrator_regras.py
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from src.models.automovel_model import TipoCombustivelEnum
+from src.models.catalogo import CORES_COMUNS, MARCAS_COMUNS, MODELOS_POR_MARCA
+
+# Extrator determinístico: a maioria das frases só traz marca, modelo, ano,
+# combustível e preço ("quero um onix 2020 flex até 50 mil"), o que regexes
+# pré-compiladas e uma trie de marcas/modelos resolvem em microssegundos.
+# Ele só responde quando consegue explicar TODAS as palavras do texto, não há
+# ambiguidade e ao menos um filtro foi reconhecido; caso contrário devolve None
+# e o agente consulta o LLM.
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos ("Até 50 mil" -> "ate 50 mil")."""
+    decomposto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+def _tokens(texto: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", normalizar(texto))
+
+# --- Trie de termos conhecidos (sequências de palavras -> (campo, valor)) ---
+APELIDOS_MARCAS = {"vw": "Volkswagen", "volks": "Volkswagen", "chevy": "Chevrolet", "gm": "Chevrolet"}
+TERMOS_COMBUSTIVEL = {
+    "flex": TipoCombustivelEnum.FLEX, "gasolina": TipoCombustivelEnum.GASOLINA,
+    "etanol": TipoCombustivelEnum.ETANOL, "alcool": TipoCombustivelEnum.ETANOL,
+    "diesel": TipoCombustivelEnum.DIESEL, "eletrico": TipoCombustivelEnum.ELETRICO,
+    "hibrido": TipoCombustivelEnum.HIBRIDO,
+}
+# Vão para 'outras_caracteristicas', como o LLM faria
+TERMOS_CARACTERISTICAS = [cor.lower() for cor in CORES_COMUNS] + ["branca", "preta", "vermelha", "automatico", "manual"]
+
+_FIM = "$" # Chave que marca o fim de um termo na trie
+
+def _inserir(trie: dict, tokens: List[str], valor: Tuple[str, object]) -> None:
+    no = trie
+    for token in tokens:
+        no = no.setdefault(token, {})
+    no[_FIM] = valor
+
+def _construir_trie() -> dict:
+    trie: dict = {}
+    for marca in MARCAS_COMUNS:
+        _inserir(trie, _tokens(marca), ("marca", marca))
+    for apelido, marca in APELIDOS_MARCAS.items():
+        _inserir(trie, [apelido], ("marca", marca))
+    for marca, modelos in MODELOS_POR_MARCA.items():
+        for modelo in modelos:
+            tokens = _tokens(modelo)
+            _inserir(trie, tokens, ("modelo", (marca, modelo)))
+            if "-" in modelo: # "T-Cross" também escrito "tcross"
+                _inserir(trie, ["".join(tokens)], ("modelo", (marca, modelo)))
+    for termo, combustivel in TERMOS_COMBUSTIVEL.items():
+        _inserir(trie, [termo], ("tipo_combustivel", combustivel.value))
+    for termo in TERMOS_CARACTERISTICAS:
+        _inserir(trie, [termo], ("outras_caracteristicas", termo))
+    return trie
+
+TRIE_TERMOS = _construir_trie()
+
+# Palavras que não mudam o significado da busca; qualquer outra palavra não
+# explicada pelas regras manda o texto para o LLM
+PALAVRAS_NEUTRAS = frozenset("""
+    quero queria procuro procurando busco buscando buscar procurar gostaria preciso tem ter tenha ver mostre mostra
+    me eu um uma uns umas o a os as de do da dos das com e em no na por para pra que seja algum alguma
+    carro carros veiculo veiculos automovel automoveis opcao opcoes modelo ano anos preco valor reais r
+    ate entre partir desde acima abaixo maximo minimo menos mais apos depois antes custando custe
+""".split())
+
+# --- Números: anos e preços ---
+_NUMERO = r"(?:r\$\s*)?\d[\d.,]*(?:\s*(?:mil|k)\b)?"
+_QUALIFICADOR_MIN = r"a partir de|acima de|mais de|no minimo|minimo de|desde|depois de|apos"
+_QUALIFICADOR_MAX = r"ate|no maximo|maximo de|abaixo de|menos de|antes de"
+_RE_FAIXA = re.compile(rf"\b(?:entre|de)\s+({_NUMERO})\s+(?:e|a|ate)\s+({_NUMERO})")
+_RE_QUALIFICADO = re.compile(rf"\b({_QUALIFICADOR_MIN}|{_QUALIFICADOR_MAX})\s+({_NUMERO})")
+_RE_NUMERO = re.compile(rf"(?<![\w.,]){_NUMERO}") # O lookbehind evita pegar o "10" de "s10"
+_RE_PORTAS = re.compile(r"\b([245])\s+portas\b")
+_RE_VALOR = re.compile(r"(r\$\s*)?(\d[\d.,]*?)[.,]?\s*(mil|k)?")
+_RE_QUALIFICADOR_MIN = re.compile(rf"(?:{_QUALIFICADOR_MIN})$")
+
+ANO_MINIMO, ANO_MAXIMO = 1950, 2049
+
+def _numero_br(texto: str) -> Optional[float]:
+    """Converte "50.000", "50.000,00", "1,5" ou "45000" em float."""
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?", texto):
+        return float(texto.replace(".", "").replace(",", "."))
+    if re.fullmatch(r"\d+(?:[.,]\d{1,2})?", texto):
+        return float(texto.replace(",", "."))
+    return None
+
+def interpretar_valor(texto: str) -> Optional[Tuple[str, float]]:
+    """("ano", 2020.0), ("preco", 50000.0) ou None quando o número é ambíguo (ex.: "1.0" de motorização)."""
+    partes = _RE_VALOR.fullmatch(texto.strip())
+    if not partes:
+        return None
+    moeda, digitos, multiplicador = partes.groups()
+    valor = _numero_br(digitos)
+    if valor is None:
+        return None
+    if multiplicador:
+        return "preco", valor * 1000
+    if moeda:
+        return "preco", valor
+    if digitos.isdigit() and len(digitos) == 4 and ANO_MINIMO <= valor <= ANO_MAXIMO:
+        return "ano", valor
+    if valor >= 1000:
+        return "preco", valor
+    return None
+
+
+class _Extracao:
+    """Campos encontrados até agora; qualquer conflito torna a extração inválida."""
+
+    def __init__(self):
+        self.campos: Dict[str, object] = {}
+        self.outras: List[str] = []
+        self.valida = True
+
+    def definir(self, campo: str, valor) -> None:
+        if self.campos.get(campo, valor) != valor:
+            self.valida = False # Ex.: duas marcas diferentes na mesma frase
+        self.campos[campo] = valor
+
+
+def extrair_por_regras(texto: str, slots_atuais: Optional[dict] = None) -> Optional[dict]:
+    """
+    Devolve os campos de ExtracaoFiltrosCarro extraídos de 'texto', ou None
+    quando as regras não explicam o texto todo, há ambiguidade ou nenhum filtro
+    foi reconhecido (ex.: "quero ver").
+    """
+    normalizado = normalizar(texto)
+    explicado = [False] * len(normalizado)
+    extracao = _Extracao()
+
+    def marcar(inicio: int, fim: int) -> bool:
+        """Marca o trecho como explicado; False se ele já tinha sido usado por outra regra."""
+        if any(explicado[inicio:fim]):
+            return False
+        explicado[inicio:fim] = [True] * (fim - inicio)
+        return True
+
+    # 1. Termos do catálogo, pelo casamento mais longo na trie ("corolla cross" antes de "corolla")
+    palavras = list(re.finditer(r"[a-z0-9]+", normalizado))
+    i = 0
+    while i < len(palavras):
+        no, encontrado = TRIE_TERMOS, None
+        for j in range(i, len(palavras)):
+            no = no.get(palavras[j].group())
+            if no is None:
+                break
+            if _FIM in no:
+                encontrado = (j, no[_FIM])
+        if encontrado is None:
+            i += 1
+            continue
+        j, (campo, valor) = encontrado
+        marcar(palavras[i].start(), palavras[j].end())
+        if campo == "modelo":
+            marca, modelo = valor
+            extracao.definir("marca", marca)
+            extracao.definir("modelo", modelo)
+        elif campo == "outras_caracteristicas":
+            extracao.outras.append(valor)
+        else:
+            extracao.definir(campo, valor)
+        i = j + 1
+
+    for m in _RE_PORTAS.finditer(normalizado):
+        if marcar(m.start(), m.end()):
+            extracao.outras.append(f"{m.group(1)} portas")
+
+    # 2. Faixas ("entre 2018 e 2020", "de 40 mil a 60 mil"): os dois lados precisam ser do mesmo tipo
+    for m in _RE_FAIXA.finditer(normalizado):
+        inicio, fim = interpretar_valor(m.group(1)), interpretar_valor(m.group(2))
+        if inicio is None and re.search(r"(?:mil|k)$", m.group(2)): # "entre 40 e 60 mil"
+            inicio = interpretar_valor(f"{m.group(1)} mil")
+        if inicio and fim and inicio[0] == fim[0] and inicio[1] <= fim[1] and marcar(m.start(), m.end()):
+            tipo = inicio[0]
+            extracao.definir(f"{tipo}_min", int(inicio[1]) if tipo == "ano" else inicio[1])
+            extracao.definir(f"{tipo}_max", int(fim[1]) if tipo == "ano" else fim[1])
+
+    # 3. Valores com qualificador ("até 50 mil", "a partir de 2019")
+    for m in _RE_QUALIFICADO.finditer(normalizado):
+        valor = interpretar_valor(m.group(2))
+        if valor is None or not marcar(m.start(), m.end()):
+            continue
+        tipo, numero = valor
+        limite = "min" if _RE_QUALIFICADOR_MIN.fullmatch(m.group(1)) else "max"
+        extracao.definir(f"{tipo}_{limite}", int(numero) if tipo == "ano" else numero)
+
+    # 4. Números soltos: um ano sozinho vale como ano_min = ano_max; um preço sem
+    #    "até"/"a partir de" é ambíguo e fica para o LLM
+    for m in _RE_NUMERO.finditer(normalizado):
+        if any(explicado[m.start():m.end()]):
+            continue
+        valor = interpretar_valor(m.group())
+        if valor is None or valor[0] != "ano":
+            return None
+        marcar(m.start(), m.end())
+        extracao.definir("ano_min", int(valor[1]))
+        extracao.definir("ano_max", int(valor[1]))
+
+    # Toda palavra fora dos trechos reconhecidos precisa ser neutra
+    for palavra in palavras:
+        if not explicado[palavra.start()] and palavra.group() not in PALAVRAS_NEUTRAS:
+            return None
+    if not extracao.valida or not (extracao.campos or extracao.outras):
+        return None # Conflito, ou só palavras neutras: nada que as regras possam afirmar
+    slots_atuais = slots_atuais or {}
+    if ("marca" in extracao.campos and "modelo" not in extracao.campos and slots_atuais.get("modelo")
+            and slots_atuais.get("marca") != extracao.campos["marca"]):
+        return None # Trocou de marca: o modelo já coletado ainda vale? Fica para o LLM decidir
+    return {**extracao.campos, "outras_caracteristicas": extracao.outras}
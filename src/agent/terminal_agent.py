@@ -9,16 +9,30 @@ from dotenv import load_dotenv # Para carregar variáveis de ambiente
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field # Usar Pydantic v2 diretamente
-from langchain_core.output_parsers import PydanticOutputParser
-from typing import Optional, List
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
+from pydantic import ValidationError
+from typing import Callable, Optional, List, Tuple
 
 # Importações do nosso projeto
 from src.models.automovel_model import TipoCombustivelEnum
+from src.agent.cliente_busca import ClienteBuscaAutomoveis, obter_cliente_busca
+from src.agent.cache_extracao import CacheExtracao, obter_cache_extracao
+from src.agent.extrator_regras import extrair_por_regras
 
 # Carregar variáveis de ambiente do arquivo .env que deve estar na raiz do projeto
 load_dotenv()
 
-SERVER_URL = "http://127.0.0.1:8000/api/v1/automoveis/buscar"
+# Pedimos o formato colunar (uma lista por campo), mais compacto que a lista de
+# objetos; o requests já negocia gzip e descomprime a resposta
+TIPO_COLUNAR = "application/vnd.c2s.colunar+json"
+
+MODELO_LLM = "gemini-1.5-flash-latest"
+# Faz parte da chave do cache de extrações: incremente ao mudar o prompt ou o
+# esquema ExtracaoFiltrosCarro, para não reaproveitar respostas antigas
+PROMPT_VERSAO = "1"
+
+# Como cada turno foi resolvido: pelas regras locais, pelo cache ou pelo LLM
+ESTATISTICAS_EXTRACAO = {"regras": 0, "cache": 0, "llm": 0}
 
 # --- Definição do Esquema de Saída para o LLM com Pydantic V2 ---
 class ExtracaoFiltrosCarro(BaseModel):
@@ -35,25 +49,9 @@ class ExtracaoFiltrosCarro(BaseModel):
     preco_max: Optional[float] = Field(default=None, description="O preço máximo desejado em Reais, se mencionado. Ex: 50000.0.")
     outras_caracteristicas: Optional[List[str]] = Field(default_factory=list, description="Outras características ou palavras-chave relevantes mencionadas pelo usuário que não se encaixam nos campos acima. Ex: novo, usado, vermelho, 4 portas, econômico.")
 
-# --- Função de Extração de Entidades com LLM ---
-def extrair_entidades_com_llm(texto_usuario: str, slots_atuais: dict) -> dict:
-    """
-    Usa um LLM (Gemini via LangChain) para extrair entidades do texto do usuário
-    e atualizar os slots.
-    """
-    google_api_key = os.getenv("GOOGLE_API_KEY")
-    if not google_api_key:
-        print("\n⚠️  Chave de API do Google (GOOGLE_API_KEY) não encontrada no arquivo .env.")
-        print("    Por favor, crie um arquivo .env na raiz do projeto com sua chave.")
-        print("    Exemplo: GOOGLE_API_KEY=\"SUA_CHAVE_AQUI\"")
-        print("    Retornando aos slots atuais sem extração por LLM.\n")
-        return slots_atuais
-
-    llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash-latest", google_api_key=google_api_key, temperature=0.1)
-    parser = PydanticOutputParser(pydantic_object=ExtracaoFiltrosCarro)
-    lista_combustiveis_str = ", ".join([e.value for e in TipoCombustivelEnum])
-
-    prompt_template_str = """
+# --- Extrator de entidades com LLM ---
+# Prompt de extração. O texto é o mesmo a cada turno; só as variáveis mudam.
+PROMPT_EXTRACAO = """
     Sua tarefa é analisar a solicitação de um usuário que está procurando um carro e extrair os critérios de busca.
     Preencha os campos do JSON de saída com as informações extraídas.
     Se uma informação não for explicitamente mencionada pelo usuário, deixe o campo correspondente como nulo ou omita-o.
@@ -83,67 +81,165 @@ def extrair_entidades_com_llm(texto_usuario: str, slots_atuais: dict) -> dict:
     {format_instructions}
     """
 
-    prompt = ChatPromptTemplate.from_template(
-        template=prompt_template_str,
-        partial_variables={
-            "format_instructions": parser.get_format_instructions(),
-            "lista_combustiveis": lista_combustiveis_str
-        }
-    )
 
-    chain = prompt | llm | parser
+class ExtratorEntidadesLLM:
+    """
+    Monta uma única vez o cliente do LLM, o parser e a cadeia prompt | llm | parser
+    e os reaproveita em todos os turnos (o cliente mantém a conexão com a API).
+    Em testes, passe um modelo de chat local (ex.: FakeListChatModel) em 'llm'.
+    """
+
+    def __init__(self, llm=None, google_api_key: Optional[str] = None):
+        if llm is None:
+            llm = ChatGoogleGenerativeAI(model=MODELO_LLM, google_api_key=google_api_key, temperature=0.1)
+        self.llm = llm
+        self.parser = PydanticOutputParser(pydantic_object=ExtracaoFiltrosCarro)
+        self.prompt = ChatPromptTemplate.from_template(
+            template=PROMPT_EXTRACAO,
+            partial_variables={
+                "format_instructions": self.parser.get_format_instructions(),
+                "lista_combustiveis": ", ".join([e.value for e in TipoCombustivelEnum])
+            }
+        )
+        self.chain = self.prompt | self.llm | self.parser
+        self.chain_texto = self.prompt | self.llm | StrOutputParser() # Para o modo streaming
+
+    def extrair(self, texto_usuario: str, contexto_slots: dict) -> ExtracaoFiltrosCarro:
+        return self.chain.invoke({"texto_do_usuario": texto_usuario, **contexto_slots})
+
+    def extrair_em_stream(
+        self, texto_usuario: str, contexto_slots: dict, ao_completar_campos: Callable[[dict], None]
+    ) -> ExtracaoFiltrosCarro:
+        """
+        Como extrair, mas lendo a resposta do LLM token a token: a cada campo do
+        JSON que fica completo, chama ao_completar_campos com todos os campos
+        completos até ali. No fim, a resposta inteira passa pelo parser normal.
+        """
+        resposta, completos = "", {}
+        for pedaco in self.chain_texto.stream({"texto_do_usuario": texto_usuario, **contexto_slots}):
+            resposta += pedaco
+            campos = campos_completos(resposta)
+            if campos != completos and completos.keys() <= campos.keys():
+                completos = campos
+                ao_completar_campos(dict(campos))
+        return self.parser.parse(resposta)
+
+
+def campos_completos(resposta_parcial: str) -> dict:
+    """
+    Campos do JSON (ainda incompleto) que o LLM já terminou de escrever. Um campo
+    só conta depois da vírgula que o separa do próximo, ou do fecha-chaves: antes
+    disso o valor pode estar pela metade ("Fi" de "Fiat", 300 de 30000).
+    """
+    inicio = resposta_parcial.find("{")
+    if inicio < 0:
+        return {}
+    profundidade, em_string, escapado, ultima_virgula = 0, False, False, None
+    for posicao in range(inicio, len(resposta_parcial)):
+        caractere = resposta_parcial[posicao]
+        if em_string:
+            if escapado:
+                escapado = False
+            elif caractere == "\\":
+                escapado = True
+            elif caractere == '"':
+                em_string = False
+        elif caractere == '"':
+            em_string = True
+        elif caractere in "{[":
+            profundidade += 1
+        elif caractere in "}]":
+            profundidade -= 1
+            if profundidade == 0: # Objeto fechado (o que vem depois, como a cerca ```, é ignorado)
+                return _objeto_json(resposta_parcial[inicio:posicao + 1])
+        elif caractere == "," and profundidade == 1:
+            ultima_virgula = posicao
+    if ultima_virgula is None:
+        return {}
+    return _objeto_json(resposta_parcial[inicio:ultima_virgula] + "}")
+
+def _objeto_json(texto: str) -> dict:
+    try:
+        objeto = json.loads(texto)
+    except json.JSONDecodeError:
+        return {}
+    return objeto if isinstance(objeto, dict) else {}
+
+
+_extrator_padrao: Optional[ExtratorEntidadesLLM] = None
+
+def obter_extrator_llm() -> Optional[ExtratorEntidadesLLM]:
+    """Extrator compartilhado do processo, criado no primeiro uso; None enquanto não houver GOOGLE_API_KEY."""
+    global _extrator_padrao
+    if _extrator_padrao is None:
+        google_api_key = os.getenv("GOOGLE_API_KEY")
+        if google_api_key:
+            _extrator_padrao = ExtratorEntidadesLLM(google_api_key=google_api_key)
+    return _extrator_padrao
+
+# --- Função de Extração de Entidades com LLM ---
+def extrair_entidades_com_llm(
+    texto_usuario: str,
+    slots_atuais: dict,
+    cache: Optional[CacheExtracao] = None,
+    extrator: Optional[ExtratorEntidadesLLM] = None,
+    usar_regras: bool = True,
+    ao_atualizar: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Usa um LLM (Gemini via LangChain) para extrair entidades do texto do usuário
+    e atualizar os slots. Antes, tenta o extrator por regras (frases simples com
+    marca, modelo, ano, combustível e preço); depois, o cache de extrações
+    (mesmo texto normalizado, mesmos filtros e mesma versão do prompt).
+    Com 'ao_atualizar', a resposta do LLM é lida em streaming e a função recebe
+    uma prévia dos slots a cada campo que o LLM termina de escrever.
+    """
+    extracao_regras = extrair_por_regras(texto_usuario, slots_atuais) if usar_regras else None
+    if extracao_regras is not None:
+        ESTATISTICAS_EXTRACAO["regras"] += 1
+        return aplicar_extracao(ExtracaoFiltrosCarro.model_validate(extracao_regras), slots_atuais)
+
+    contexto_slots = {
+        "marca_atual": slots_atuais.get("marca") or "não definido",
+        "modelo_atual": slots_atuais.get("modelo") or "não definido",
+        "ano_min_atual": slots_atuais.get("ano_min") or "não definido",
+        "ano_max_atual": slots_atuais.get("ano_max") or "não definido",
+        "tipo_combustivel_atual": slots_atuais.get("tipo_combustivel") or "não definido",
+        "preco_min_atual": slots_atuais.get("preco_min") or "não definido",
+        "preco_max_atual": slots_atuais.get("preco_max") or "não definido",
+    }
+    cache = cache or obter_cache_extracao()
+    chave_cache = cache.chave(texto_usuario, contexto_slots, f"{PROMPT_VERSAO}|{MODELO_LLM}") if cache else None
+    extracao_em_cache = cache.obter(chave_cache) if cache else None
+    if extracao_em_cache is not None:
+        print("\n⚡ Já vi essa solicitação antes, reaproveitando a interpretação.")
+        ESTATISTICAS_EXTRACAO["cache"] += 1
+        return aplicar_extracao(ExtracaoFiltrosCarro.model_validate(extracao_em_cache), slots_atuais)
+
+    extrator = extrator or obter_extrator_llm()
+    if extrator is None:
+        print("\n⚠️  Chave de API do Google (GOOGLE_API_KEY) não encontrada no arquivo .env.")
+        print("    Por favor, crie um arquivo .env na raiz do projeto com sua chave.")
+        print("    Exemplo: GOOGLE_API_KEY=\"SUA_CHAVE_AQUI\"")
+        print("    Retornando aos slots atuais sem extração por LLM.\n")
+        return slots_atuais
 
     print("\n🤖 Consultando o Gemini para entender sua solicitação...")
     try:
-        contexto_slots = {
-            "marca_atual": slots_atuais.get("marca") or "não definido",
-            "modelo_atual": slots_atuais.get("modelo") or "não definido",
-            "ano_min_atual": slots_atuais.get("ano_min") or "não definido",
-            "ano_max_atual": slots_atuais.get("ano_max") or "não definido",
-            "tipo_combustivel_atual": slots_atuais.get("tipo_combustivel") or "não definido",
-            "preco_min_atual": slots_atuais.get("preco_min") or "não definido",
-            "preco_max_atual": slots_atuais.get("preco_max") or "não definido",
-        }
-
-        input_data_for_llm = {
-            "texto_do_usuario": texto_usuario,
-            **contexto_slots
-        }
-
-        resultado_llm: ExtracaoFiltrosCarro = chain.invoke(input_data_for_llm)
-        novos_slots = slots_atuais.copy()
-
-        # Lógica de Pós-Processamento para o campo 'modelo'
-        if resultado_llm.modelo and resultado_llm.modelo.isdigit() and len(resultado_llm.modelo) == 4:
-            is_year_min = resultado_llm.ano_min and int(resultado_llm.modelo) == resultado_llm.ano_min
-            is_year_max = resultado_llm.ano_max and int(resultado_llm.modelo) == resultado_llm.ano_max
-            if is_year_min or is_year_max:
-                print(f"   ℹ️ Corrigindo: LLM colocou o ano '{resultado_llm.modelo}' como modelo. Removendo do modelo.")
-                resultado_llm.modelo = None
-
-        for campo, valor_llm in resultado_llm.model_dump().items():
-            if valor_llm is not None:
-                if campo == "outras_caracteristicas" and not valor_llm:
-                    continue
-                if campo in novos_slots:
-                    if novos_slots[campo] is None or (novos_slots[campo] != valor_llm and campo != "outras_caracteristicas"):
-                        if campo == "tipo_combustivel":
-                            try:
-                                valor_llm_str = str(valor_llm)
-                                if not any(v == valor_llm_str for v in TipoCombustivelEnum._value2member_map_):
-                                    valor_llm_str = valor_llm_str.capitalize()
-                                enum_val = TipoCombustivelEnum(valor_llm_str)
-                                novos_slots[campo] = enum_val.value
-                                print(f"   LLM atualizou/preencheu '{campo}': {enum_val.value}")
-                            except ValueError:
-                                print(f"   ⚠️ LLM sugeriu um tipo de combustível inválido ou não normalizado: '{valor_llm}'. Slot não atualizado.")
-                        else:
-                            novos_slots[campo] = valor_llm
-                            print(f"   LLM atualizou/preencheu '{campo}': {valor_llm}")
-                    elif campo == "outras_caracteristicas" and valor_llm and novos_slots[campo] != valor_llm :
-                        novos_slots[campo] = valor_llm # Substitui lista de outras características
-                        print(f"   LLM atualizou/preencheu '{campo}': {valor_llm}")
-        return novos_slots
+        if ao_atualizar:
+            def previa_slots(campos: dict):
+                try:
+                    previa = ExtracaoFiltrosCarro.model_validate(campos)
+                except ValidationError:
+                    return # Valor fora do esquema: o parser final decide o que fazer com ele
+                ao_atualizar(aplicar_extracao(previa, slots_atuais, anunciar=False))
+            resultado_llm = extrator.extrair_em_stream(texto_usuario, contexto_slots, previa_slots)
+        else:
+            resultado_llm = extrator.extrair(texto_usuario, contexto_slots)
+        ESTATISTICAS_EXTRACAO["llm"] += 1
+        if cache:
+            cache.guardar(chave_cache, resultado_llm.model_dump())
+        return aplicar_extracao(resultado_llm, slots_atuais)
     except Exception as e:
         print(f"❌ Erro crítico ao interagir com o LLM: {e}")
         import traceback
@@ -151,6 +247,42 @@ def extrair_entidades_com_llm(texto_usuario: str, slots_atuais: dict) -> dict:
         print("Retornando aos slots atuais.")
         return slots_atuais
 
+def aplicar_extracao(resultado_llm: ExtracaoFiltrosCarro, slots_atuais: dict, anunciar: bool = True) -> dict:
+    """Combina o que o LLM extraiu com os slots já preenchidos e devolve os slots novos."""
+    novos_slots = slots_atuais.copy()
+
+    # Lógica de Pós-Processamento para o campo 'modelo'
+    if resultado_llm.modelo and resultado_llm.modelo.isdigit() and len(resultado_llm.modelo) == 4:
+        is_year_min = resultado_llm.ano_min and int(resultado_llm.modelo) == resultado_llm.ano_min
+        is_year_max = resultado_llm.ano_max and int(resultado_llm.modelo) == resultado_llm.ano_max
+        if is_year_min or is_year_max:
+            if anunciar: print(f"   ℹ️ Corrigindo: LLM colocou o ano '{resultado_llm.modelo}' como modelo. Removendo do modelo.")
+            resultado_llm.modelo = None
+
+    for campo, valor_llm in resultado_llm.model_dump().items():
+        if valor_llm is not None:
+            if campo == "outras_caracteristicas" and not valor_llm:
+                continue
+            if campo in novos_slots:
+                if novos_slots[campo] is None or (novos_slots[campo] != valor_llm and campo != "outras_caracteristicas"):
+                    if campo == "tipo_combustivel":
+                        try:
+                            valor_llm_str = str(valor_llm)
+                            if not any(v == valor_llm_str for v in TipoCombustivelEnum._value2member_map_):
+                                valor_llm_str = valor_llm_str.capitalize()
+                            enum_val = TipoCombustivelEnum(valor_llm_str)
+                            novos_slots[campo] = enum_val.value
+                            if anunciar: print(f"   Atualizado/preenchido '{campo}': {enum_val.value}")
+                        except ValueError:
+                            if anunciar: print(f"   ⚠️ LLM sugeriu um tipo de combustível inválido ou não normalizado: '{valor_llm}'. Slot não atualizado.")
+                    else:
+                        novos_slots[campo] = valor_llm
+                        if anunciar: print(f"   Atualizado/preenchido '{campo}': {valor_llm}")
+                elif campo == "outras_caracteristicas" and valor_llm and novos_slots[campo] != valor_llm :
+                    novos_slots[campo] = valor_llm # Substitui lista de outras características
+                    if anunciar: print(f"   Atualizado/preenchido '{campo}': {valor_llm}")
+    return novos_slots
+
 def apresentar_resultados(automoveis: list):
     if not automoveis:
         print("\n😕 Puxa, não encontrei nenhum carro com esses critérios.")
@@ -170,77 +302,159 @@ def apresentar_resultados(automoveis: list):
         print(f"  Preço: R$ {carro.get('preco', 0.0):,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
     print("-" * 20)
 
-def interagir_com_servidor(slots_coletados: dict) -> list:
+def automoveis_da_resposta(automoveis) -> list:
+    """Converte o formato colunar ({"marca": [...], ...}) de volta em uma lista de carros (dicionários)."""
+    if isinstance(automoveis, dict):
+        return [dict(zip(automoveis, valores)) for valores in zip(*automoveis.values())]
+    return automoveis # Servidor respondeu no formato JSON padrão
+
+CAMPOS_FILTRO_SERVIDOR = ["marca", "modelo", "ano_min", "ano_max", "tipo_combustivel", "preco_max", "preco_min"]
+
+def filtros_para_servidor(slots_coletados: dict) -> dict:
     payload_filtros = {}
-    campos_permitidos_servidor = ["marca", "modelo", "ano_min", "ano_max", "tipo_combustivel", "preco_max", "preco_min"]
     for campo, valor in slots_coletados.items():
-        if valor is not None and campo in campos_permitidos_servidor:
+        if valor is not None and campo in CAMPOS_FILTRO_SERVIDOR:
             # Para campos de lista como 'outras_caracteristicas', não incluímos diretamente
             # a menos que o servidor tenha um campo específico para eles.
             if not isinstance(valor, list):
                  payload_filtros[campo] = valor
+    return payload_filtros
 
+def buscar_pagina(
+    slots_coletados: dict,
+    cursor: Optional[str] = None,
+    cliente: Optional[ClienteBuscaAutomoveis] = None,
+    anunciar: bool = True,
+) -> Tuple[list, Optional[str]]:
+    """Busca uma página de resultados (a primeira, ou a seguinte ao 'cursor'); devolve os carros e o próximo cursor."""
+    payload_filtros = filtros_para_servidor(slots_coletados)
     payload_mcp = {
         "filtros": payload_filtros if payload_filtros else None,
-        "paginacao": {"pagina": 1, "itens_por_pagina": 5}
+        # O agente não mostra o total, então dispensa a contagem
+        "paginacao": {"pagina": 1, "itens_por_pagina": 5, "contagem": "nenhuma", "cursor": cursor}
     }
-    print(f"\n🕵️ Buscando com os seguintes filtros: {payload_filtros if payload_filtros else 'todos os carros'}...")
+    if anunciar:
+        print(f"\n🕵️ Buscando com os seguintes filtros: {payload_filtros if payload_filtros else 'todos os carros'}...")
     try:
-        response = requests.post(SERVER_URL, json=payload_mcp)
+        cliente = cliente or obter_cliente_busca() # Sessão compartilhada: reaproveita a conexão entre buscas
+        response = cliente.buscar(payload_mcp, headers={"Accept": f"{TIPO_COLUNAR}, application/json;q=0.5"})
         response.raise_for_status()
         response_data = response.json()
         if response_data.get("sucesso") and response_data.get("dados"):
-            return response_data["dados"].get("automoveis", [])
+            dados = response_data["dados"]
+            return automoveis_da_resposta(dados.get("automoveis", [])), dados.get("proximo_cursor")
         else:
             print(f"❌ Erro do servidor: {response_data.get('mensagem', 'Não foi possível obter os dados.')}")
             if response_data.get("erros"): print(f"   Detalhes: {response_data['erros']}")
-            return []
+            return [], None
     except requests.exceptions.RequestException as e:
         print(f"🔌 Ops! Não consegui me conectar ao servidor de busca: {e}")
-        return []
+        return [], None
     except json.JSONDecodeError:
         print("📋 Erro ao processar a resposta do servidor (não era JSON válido). Resposta:")
         print(response.text if 'response' in locals() else "N/A")
-        return []
+        return [], None
 
-def iniciar_conversa():
-    print("👋 Olá! Sou seu agente virtual de busca de carros (com Gemini!).")
-    print("Como posso te ajudar a encontrar um veículo hoje? (Ex: 'quero um Fiat Uno até 30000', 'Chevrolet Onix 2019 flex')")
-    slots = {
+def interagir_com_servidor(slots_coletados: dict, cliente: Optional[ClienteBuscaAutomoveis] = None) -> list:
+    automoveis, _ = buscar_pagina(slots_coletados, cliente=cliente)
+    return automoveis
+
+def reportar_estatisticas_extracao():
+    turnos = sum(ESTATISTICAS_EXTRACAO.values())
+    if turnos:
+        sem_llm = ESTATISTICAS_EXTRACAO["regras"] + ESTATISTICAS_EXTRACAO["cache"]
+        print(f"📊 Turnos resolvidos sem o LLM: {sem_llm} de {turnos} ({sem_llm / turnos:.0%}; "
+              f"{ESTATISTICAS_EXTRACAO['regras']} pelas regras, {ESTATISTICAS_EXTRACAO['cache']} pelo cache).")
+    cache = obter_cache_extracao()
+    if cache and cache.acertos + cache.faltas:
+        estatisticas = cache.estatisticas()
+        print(f"📊 Cache de extrações: {estatisticas['acertos']} acerto(s) em {estatisticas['acertos'] + estatisticas['faltas']} "
+              f"consulta(s) ({estatisticas['taxa_acerto']:.0%}); {estatisticas['entradas']} frase(s) guardada(s).")
+
+# --- Etapas do diálogo (compartilhadas com o modo assíncrono) ---
+PALAVRAS_SAIR = ["sair", "exit", "fim", "tchau", "quit", "parar"]
+PALAVRAS_BUSCAR = ["buscar", "procurar"]
+
+def slots_vazios() -> dict:
+    return {
         "marca": None, "modelo": None, "ano_min": None, "ano_max": None,
         "tipo_combustivel": None, "preco_min": None, "preco_max": None,
         "outras_caracteristicas": []
     }
+
+def tem_filtros(slots: dict) -> bool:
+    return any(value for key, value in slots.items() if key != "outras_caracteristicas" and value is not None)
+
+def mostrar_entendimento(slots: dict, entrada_usuario: str):
+    feedback_slots = {k: v for k, v in slots.items() if v is not None and (not isinstance(v, list) or v)}
+    if feedback_slots:
+        feedback_str = ", ".join([f"{k.replace('_', ' ').capitalize()}: {v}" for k,v in feedback_slots.items()])
+        print(f"ℹ️ Entendi até agora: {feedback_str}")
+    elif entrada_usuario : # Se houve entrada mas o LLM não pegou nada útil
+        print("ℹ️ Humm, não consegui extrair filtros específicos dessa vez. Pode tentar de novo ou ser mais detalhado?")
+
+class PreviaEntendimento:
+    """
+    Callback do modo streaming: mostra o "Entendi até agora" a cada prévia nova
+    dos slots, enquanto o LLM ainda escreve, e lembra a última exibida.
+    """
+
+    def __init__(self, entrada_usuario: str):
+        self.entrada_usuario = entrada_usuario
+        self.ultima: Optional[dict] = None
+
+    def __call__(self, slots: dict):
+        if slots != self.ultima and any(v is not None and (not isinstance(v, list) or v) for v in slots.values()):
+            self.ultima = slots
+            mostrar_entendimento(slots, self.entrada_usuario)
+
+def extrair_e_mostrar(entrada_usuario: str, slots: dict, streaming: bool = False) -> dict:
+    """Extrai os filtros da fala e mostra o que foi entendido (aos poucos, em streaming)."""
+    previa = PreviaEntendimento(entrada_usuario) if streaming else None
+    novos_slots = extrair_entidades_com_llm(entrada_usuario, slots, ao_atualizar=previa)
+    if previa is None or novos_slots != previa.ultima: # Em streaming, a última prévia pode já ser o resultado final
+        mostrar_entendimento(novos_slots, entrada_usuario)
+    return novos_slots
+
+def deve_extrair(slots: dict, entrada_usuario: str) -> bool:
+    """Só manda a fala para a extração se ela puder trazer filtros ("buscar" não traz)."""
+    if entrada_usuario.lower() in PALAVRAS_BUSCAR:
+        return False
+    return bool(entrada_usuario) or not tem_filtros(slots)
+
+def pediu_busca(slots: dict, entrada_usuario: str) -> bool:
+    return entrada_usuario.lower() in PALAVRAS_BUSCAR or (not entrada_usuario and tem_filtros(slots))
+
+def responder_sem_busca(slots: dict, entrada_usuario: str):
+    if not tem_filtros(slots) and entrada_usuario:
+        print("Agente: Humm, não entendi bem. Pode tentar descrever de outra forma o carro que você busca?")
+    elif entrada_usuario:
+        print("Agente: Ok. Adicione mais detalhes se quiser, ou digite 'buscar' para ver os resultados.")
+
+def iniciar_conversa(streaming: bool = False):
+    print("👋 Olá! Sou seu agente virtual de busca de carros (com Gemini!).")
+    print("Como posso te ajudar a encontrar um veículo hoje? (Ex: 'quero um Fiat Uno até 30000', 'Chevrolet Onix 2019 flex')")
+    slots = slots_vazios()
     while True:
         entrada_usuario = input("\nVocê: ").strip()
-        if not entrada_usuario and not any(value for key, value in slots.items() if key != "outras_caracteristicas" and value is not None): # Se entrada vazia E nenhum filtro real preenchido
+        if not entrada_usuario and not tem_filtros(slots): # Se entrada vazia E nenhum filtro real preenchido
             print("Por favor, me diga o que você procura ou forneça alguns detalhes.")
             continue
 
-        if entrada_usuario.lower() in ["sair", "exit", "fim", "tchau", "quit", "parar"]:
+        if entrada_usuario.lower() in PALAVRAS_SAIR:
             print("Até logo! 👋")
+            reportar_estatisticas_extracao()
             break
 
-        if entrada_usuario or not any(value for key, value in slots.items() if key != "outras_caracteristicas" and value is not None): # Processa se houver entrada ou se nenhum filtro útil
-            slots = extrair_entidades_com_llm(entrada_usuario, slots)
-
-        feedback_slots = {k: v for k, v in slots.items() if v is not None and (not isinstance(v, list) or v)}
-        if feedback_slots:
-            feedback_str = ", ".join([f"{k.replace('_', ' ').capitalize()}: {v}" for k,v in feedback_slots.items()])
-            print(f"ℹ️ Entendi até agora: {feedback_str}")
-        elif entrada_usuario : # Se houve entrada mas o LLM não pegou nada útil
-            print("ℹ️ Humm, não consegui extrair filtros específicos dessa vez. Pode tentar de novo ou ser mais detalhado?")
-
-
-        filtros_reais_preenchidos_count = sum(1 for k, val in slots.items() if k != "outras_caracteristicas" and val is not None and (not isinstance(val, list) or val) )
+        if deve_extrair(slots, entrada_usuario): # Processa se houver entrada ou se nenhum filtro útil
+            slots = extrair_e_mostrar(entrada_usuario, slots, streaming)
+        else:
+            mostrar_entendimento(slots, entrada_usuario)
 
-        if entrada_usuario.lower() in ["buscar", "procurar"] or (not entrada_usuario and filtros_reais_preenchidos_count > 0):
+        if pediu_busca(slots, entrada_usuario):
             automoveis = interagir_com_servidor(slots)
             apresentar_resultados(automoveis)
             print("\nO que mais posso fazer por você? (Forneça mais detalhes, 'buscar' novamente, ou 'sair')")
             continue
 
-        if filtros_reais_preenchidos_count == 0 and entrada_usuario:
-            print("Agente: Humm, não entendi bem. Pode tentar descrever de outra forma o carro que você busca?")
-        elif entrada_usuario:
-            print("Agente: Ok. Adicione mais detalhes se quiser, ou digite 'buscar' para ver os resultados.")
\ No newline at end of file
+        responder_sem_busca(slots, entrada_usuario)
\ No newline at end of file
@@ -1,3 +1,3 @@
 # src/core/__init__.py
-from .database import SessionLocal, engine, create_db_and_tables, AutomovelDB
-__all__ = ["SessionLocal", "engine", "create_db_and_tables", "AutomovelDB"]
\ No newline at end of file
+from .database import SessionLocal, engine, AsyncSessionLocal, async_engine, create_db_and_tables, AutomovelDB
+__all__ = ["SessionLocal", "engine", "AsyncSessionLocal", "async_engine", "create_db_and_tables", "AutomovelDB"]
\ No newline at end of file
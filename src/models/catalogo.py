@@ -0,0 +1,19 @@
+# src/models/catalogo.py
+
+# Catálogo de marcas, modelos e cores conhecidos. Usado pelo gerador de dados
+# fictícios e pelo extrator por regras do agente (que reconhece esses nomes no
+# texto do usuário sem precisar do LLM).
+MARCAS_COMUNS = ["Fiat", "Volkswagen", "Chevrolet", "Ford", "Hyundai", "Toyota", "Renault", "Honda", "Jeep", "Nissan"]
+MODELOS_POR_MARCA = {
+    "Fiat": ["Uno", "Mobi", "Argo", "Cronos", "Toro", "Strada", "Pulse"],
+    "Volkswagen": ["Gol", "Polo", "Virtus", "Nivus", "T-Cross", "Taos", "Amarok", "Saveiro"],
+    "Chevrolet": ["Onix", "Onix Plus", "Tracker", "S10", "Spin", "Montana"],
+    "Ford": ["Ka", "Ranger", "Territory", "Bronco"], # Ka saiu de linha, mas pode ter usados
+    "Hyundai": ["HB20", "HB20S", "Creta"],
+    "Toyota": ["Corolla", "Corolla Cross", "Hilux", "Yaris"],
+    "Renault": ["Kwid", "Sandero", "Logan", "Duster", "Oroch"],
+    "Honda": ["Fit", "City", "HR-V", "Civic"], # Civic nacional saiu de linha, mas pode ter usados
+    "Jeep": ["Renegade", "Compass", "Commander"],
+    "Nissan": ["Versa", "Kicks", "Frontier"]
+}
+CORES_COMUNS = ["Branco", "Preto", "Prata", "Cinza", "Vermelho", "Azul", "Marrom"]
@@ -0,0 +1,191 @@
+# src/scripts/gerador_vetorizado.py
+import argparse
+import uuid
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+import numpy as np
+from faker import Faker
+
+from src.core.database import engine, create_db_and_tables, normalizar_texto
+from src.models.automovel_model import TipoCombustivelEnum, TipoTransmissaoEnum
+from src.models.catalogo import MARCAS_COMUNS, MODELOS_POR_MARCA, CORES_COMUNS
+from src.scripts.populate_db import ANO_REFERENCIA, DATA_BASE_CADASTRO, inserir_lotes
+
+# Gerador colunar: as mesmas regras de gerar_dados_automovel_ficticio, mas
+# aplicadas a um lote inteiro de uma vez com arrays do NumPy (sorteios e
+# condições viram máscaras booleanas). Serve para gerar dezenas de milhões de
+# linhas em testes de carga, onde o gerador escalar (uma chamada por veículo)
+# domina o tempo.
+
+# Catálogo achatado: um código por (marca, modelo)
+_PARES_MARCA_MODELO = [(marca, modelo) for marca in MARCAS_COMUNS for modelo in MODELOS_POR_MARCA[marca]]
+# Início e tamanho do bloco de modelos de cada marca dentro de _PARES_MARCA_MODELO
+_QTD_MODELOS = np.array([len(MODELOS_POR_MARCA[marca]) for marca in MARCAS_COMUNS])
+_INICIO_MODELOS = np.concatenate(([0], np.cumsum(_QTD_MODELOS)[:-1]))
+_NORMALIZADOS_PARES = [(normalizar_texto(marca), normalizar_texto(modelo)) for marca, modelo in _PARES_MARCA_MODELO]
+
+def _codigos_pares(condicao) -> np.ndarray:
+    return np.array([i for i, par in enumerate(_PARES_MARCA_MODELO) if condicao(*par)])
+
+_PARES_MOTOR_GRANDE = _codigos_pares(lambda marca, modelo: marca in ["Jeep", "Ford"] and modelo in ["Ranger", "S10", "Amarok", "Hilux", "Commander", "Frontier"])
+_PARES_COROLLA = _codigos_pares(lambda marca, modelo: marca == "Toyota" and modelo == "Corolla")
+_MARCAS_DIESEL = np.array([MARCAS_COMUNS.index(m) for m in ["Ford", "Chevrolet", "Toyota", "Volkswagen", "Nissan", "Jeep"]])
+
+COMBUSTIVEIS = list(TipoCombustivelEnum)
+TRANSMISSOES = list(TipoTransmissaoEnum)
+_COD = {valor: i for i, valor in enumerate(COMBUSTIVEIS)}
+_COD_TRANSMISSAO = {valor: i for i, valor in enumerate(TRANSMISSOES)}
+
+MOTORES_COMUNS = np.array([1.0, 1.3, 1.4, 1.5, 1.6, 1.8, 2.0])
+MOTORES_GRANDES = np.array([2.0, 2.5, 2.8, 3.0, 3.2])
+MOTORES_ELETRICOS = np.array([1.0, 1.5, 2.0])
+QTD_FRASES_OBSERVACOES = 2000 # Frases do Faker sorteadas para 'observacoes' (gerar uma por linha custaria caro)
+
+def gerar_colunas(quantidade: int, rng: np.random.Generator, ano_atual: int = None) -> Dict[str, np.ndarray]:
+    """
+    Gera 'quantidade' veículos como colunas. Campos categóricos saem como códigos
+    inteiros: 'par_marca_modelo' indexa _PARES_MARCA_MODELO, 'tipo_combustivel' indexa
+    COMBUSTIVEIS, 'transmissao' indexa TRANSMISSOES e 'cor' indexa CORES_COMUNS.
+    """
+    ano_atual = ano_atual or datetime.now().year
+    n = quantidade
+
+    marca = rng.integers(0, len(MARCAS_COMUNS), n)
+    par = _INICIO_MODELOS[marca] + (rng.random(n) * _QTD_MODELOS[marca]).astype(np.int64)
+
+    ano_fabricacao = rng.integers(2015, ano_atual + 1, n)
+    ano_modelo = np.minimum(ano_fabricacao + rng.integers(0, 2, n), ano_atual + 1)
+
+    anos_de_uso = ano_atual - ano_fabricacao
+    quilometragem = np.maximum(0, anos_de_uso * rng.integers(8000, 20001, n) + rng.integers(-5000, 5001, n))
+    quilometragem = np.where(anos_de_uso == 0, rng.integers(0, 1001, n), quilometragem)
+
+    motorizacao = rng.choice(MOTORES_COMUNS, n)
+    motor_grande = np.isin(par, _PARES_MOTOR_GRANDE)
+    motorizacao = np.where(motor_grande, rng.choice(MOTORES_GRANDES, n), motorizacao)
+    corolla_novo = np.isin(par, _PARES_COROLLA) & (ano_fabricacao > 2019)
+    motorizacao = np.where(~motor_grande & corolla_novo, 1.8, motorizacao)
+
+    preco = (ano_fabricacao - 2010) * 3000 + 25000 + marca * 500 + rng.uniform(-5000, 5000, n)
+    preco = np.round(np.maximum(15000, preco), 2)
+
+    combustivel = rng.integers(0, len(COMBUSTIVEIS), n)
+    pode_ser_flex = ~np.isin(combustivel, [_COD[TipoCombustivelEnum.DIESEL], _COD[TipoCombustivelEnum.ELETRICO], _COD[TipoCombustivelEnum.HIBRIDO]])
+    combustivel = np.where((ano_fabricacao > 2010) & pode_ser_flex & (rng.random(n) > 0.2), _COD[TipoCombustivelEnum.FLEX], combustivel)
+    pickup_diesel = (motorizacao > 2.0) & np.isin(marca, _MARCAS_DIESEL) & (rng.random(n) > 0.4)
+    combustivel = np.where(pickup_diesel, _COD[TipoCombustivelEnum.DIESEL], combustivel)
+    combustivel = np.where(corolla_novo & (motorizacao == 1.8), _COD[TipoCombustivelEnum.HIBRIDO], combustivel)
+
+    eletrico = rng.random(n) < 0.02
+    combustivel = np.where(eletrico, _COD[TipoCombustivelEnum.ELETRICO], combustivel)
+    motorizacao = np.where(eletrico, rng.choice(MOTORES_ELETRICOS, n), motorizacao)
+    preco = np.where(eletrico, preco * 1.8, preco)
+
+    transmissao = rng.integers(0, len(TRANSMISSOES), n)
+    vira_automatico = ((ano_fabricacao > 2018) | (preco > 70000)) & (transmissao == _COD_TRANSMISSAO[TipoTransmissaoEnum.MANUAL])
+    automaticos = np.array([_COD_TRANSMISSAO[t] for t in (TipoTransmissaoEnum.AUTOMATICO, TipoTransmissaoEnum.CVT, TipoTransmissaoEnum.AUTOMATIZADO)])
+    transmissao = np.where(vira_automatico, rng.choice(automaticos, n), transmissao)
+
+    return {
+        "par_marca_modelo": par,
+        "ano_fabricacao": ano_fabricacao,
+        "ano_modelo": ano_modelo,
+        "cor": rng.integers(0, len(CORES_COMUNS), n),
+        "motorizacao": np.round(motorizacao, 1),
+        "tipo_combustivel": combustivel,
+        "quilometragem": quilometragem,
+        "numero_portas": rng.choice(np.array([2, 4]), n),
+        "transmissao": transmissao,
+        "preco": preco,
+        # -1 = sem observação
+        "observacao": np.where(rng.random(n) > 0.5, rng.integers(0, QTD_FRASES_OBSERVACOES, n), -1),
+        "id_veiculo": rng.integers(0, 2**64, (n, 2), dtype=np.uint64),
+        "segundos_cadastro": rng.integers(0, 365 * 24 * 3600, n),
+    }
+
+def gerar_lotes_vetorizados(num_veiculos: int, tamanho_lote: int, semente: int) -> Iterator[Dict[str, np.ndarray]]:
+    """Lotes de colunas reprodutíveis: cada lote usa a semente (semente, índice do lote)."""
+    for indice, inicio in enumerate(range(0, num_veiculos, tamanho_lote)):
+        rng = np.random.default_rng([semente, indice])
+        yield gerar_colunas(min(tamanho_lote, num_veiculos - inicio), rng, ano_atual=ANO_REFERENCIA)
+
+def frases_observacoes(semente: int) -> List[str]:
+    faker = Faker('pt_BR')
+    faker.seed_instance(semente)
+    return [faker.sentence(nb_words=10) for _ in range(QTD_FRASES_OBSERVACOES)]
+
+def colunas_para_tabela(colunas: Dict[str, np.ndarray], frases: List[str]) -> Dict[str, list]:
+    """
+    Converte um lote colunar no lote {coluna da tabela: valores} aceito por
+    inserir_lotes: decodifica os códigos e calcula id, data de cadastro e as
+    colunas normalizadas, sem passar por um dicionário por linha.
+    """
+    pares = colunas["par_marca_modelo"].tolist()
+    id_alto, id_baixo = colunas["id_veiculo"][:, 0].tolist(), colunas["id_veiculo"][:, 1].tolist()
+    datas = np.datetime64(DATA_BASE_CADASTRO, "us") + colunas["segundos_cadastro"].astype("timedelta64[s]")
+    return {
+        "id_veiculo": [uuid.UUID(int=(alto << 64) | baixo, version=4) for alto, baixo in zip(id_alto, id_baixo)],
+        "marca": [_PARES_MARCA_MODELO[par][0] for par in pares],
+        "modelo": [_PARES_MARCA_MODELO[par][1] for par in pares],
+        "marca_normalizada": [_NORMALIZADOS_PARES[par][0] for par in pares],
+        "modelo_normalizado": [_NORMALIZADOS_PARES[par][1] for par in pares],
+        "ano_fabricacao": colunas["ano_fabricacao"].tolist(),
+        "ano_modelo": colunas["ano_modelo"].tolist(),
+        "cor": [CORES_COMUNS[cor] for cor in colunas["cor"].tolist()],
+        "motorizacao": colunas["motorizacao"].tolist(),
+        "tipo_combustivel": [COMBUSTIVEIS[comb] for comb in colunas["tipo_combustivel"].tolist()],
+        "quilometragem": colunas["quilometragem"].tolist(),
+        "numero_portas": colunas["numero_portas"].tolist(),
+        "transmissao": [TRANSMISSOES[transm] for transm in colunas["transmissao"].tolist()],
+        "preco": colunas["preco"].tolist(),
+        "data_cadastro": datas.tolist(), # datetime64[us] -> datetime
+        "observacoes": [frases[obs] if obs >= 0 else None for obs in colunas["observacao"].tolist()],
+    }
+
+def _gravar_array(arquivo: zipfile.ZipFile, nome: str, valores: np.ndarray) -> None:
+    with arquivo.open(f"{nome}.npy", "w", force_zip64=True) as destino:
+        np.lib.format.write_array(destino, np.asanyarray(valores), allow_pickle=False)
+
+def salvar_npz(lotes: Iterator[Dict[str, np.ndarray]], caminho: str) -> int:
+    """
+    Grava os lotes, à medida que são gerados, em um .npz comprimido: as colunas
+    do i-ésimo lote ficam em 'lote_{i:06d}/<coluna>', seguidas dos dicionários de
+    códigos. Só um lote fica em memória por vez. Lê-se com np.load(caminho).
+    """
+    total = 0
+    with zipfile.ZipFile(caminho, "w", compression=zipfile.ZIP_DEFLATED) as arquivo:
+        for indice, lote in enumerate(lotes):
+            for nome, valores in lote.items():
+                _gravar_array(arquivo, f"lote_{indice:06d}/{nome}", valores)
+            total += len(lote["preco"])
+        _gravar_array(arquivo, "dicionario_marca_modelo", np.array(_PARES_MARCA_MODELO))
+        _gravar_array(arquivo, "dicionario_combustivel", np.array([c.value for c in COMBUSTIVEIS]))
+        _gravar_array(arquivo, "dicionario_transmissao", np.array([t.value for t in TRANSMISSOES]))
+        _gravar_array(arquivo, "dicionario_cor", np.array(CORES_COMUNS))
+    return total
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Gera veículos fictícios em lotes colunares (NumPy).")
+    parser.add_argument("--quantidade", type=int, default=1_000_000)
+    parser.add_argument("--tamanho-lote", type=int, default=100_000)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default=None, help="Arquivo .npz de saída. Sem ele, os dados vão direto para o banco.")
+    parser.add_argument("--adiar-indices", action="store_true", help="Ao gravar no banco, recria os índices só no final.")
+    args = parser.parse_args(argv)
+
+    lotes = gerar_lotes_vetorizados(args.quantidade, args.tamanho_lote, args.semente)
+    if args.saida:
+        total = salvar_npz(lotes, args.saida)
+        print(f"{total} veículos gravados em {args.saida}.")
+        return
+
+    create_db_and_tables()
+    frases = frases_observacoes(args.semente)
+    total = inserir_lotes(engine, (colunas_para_tabela(lote, frases) for lote in lotes), adiar_indices=args.adiar_indices)
+    print(f"Concluído! {total} veículos inseridos no banco de dados.")
+
+
+if __name__ == "__main__":
+    main()
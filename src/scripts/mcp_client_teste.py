@@ -2,8 +2,11 @@
 import requests # Biblioteca para fazer requisições HTTP
 import json
 
-# URL do servidor FastAPI (certifique-se de que o servidor esteja rodando)
-SERVER_URL = "http://127.0.0.1:8000/api/v1/automoveis/buscar"
+from src.agent.cliente_busca import ClienteBuscaAutomoveis
+
+# Um único cliente para todos os testes: as requisições reaproveitam a mesma
+# conexão keep-alive. A URL vem de MCP_SERVER_URL (padrão: servidor local)
+cliente = ClienteBuscaAutomoveis()
 
 def testar_busca_sem_filtros():
     print("\n--- Testando busca sem filtros (primeira página) ---")
@@ -12,7 +15,7 @@ def testar_busca_sem_filtros():
         "paginacao": {"pagina": 1, "itens_por_pagina": 5}
     }
     try:
-        response = requests.post(SERVER_URL, json=payload)
+        response = cliente.buscar(payload)
         response.raise_for_status() # Levanta um erro para respostas 4xx/5xx
         
         print("Status da Resposta:", response.status_code)
@@ -41,7 +44,7 @@ def testar_busca_com_filtros():
         "paginacao": {"pagina": 1, "itens_por_pagina": 3}
     }
     try:
-        response = requests.post(SERVER_URL, json=payload)
+        response = cliente.buscar(payload)
         response.raise_for_status()
         
         print("Status da Resposta:", response.status_code)
@@ -69,7 +72,7 @@ def testar_busca_filtros_sem_resultado():
         # Usa paginação padrão se não especificada
     }
     try:
-        response = requests.post(SERVER_URL, json=payload)
+        response = cliente.buscar(payload)
         response.raise_for_status()
         
         print("Status da Resposta:", response.status_code)
@@ -79,6 +82,21 @@ def testar_busca_filtros_sem_resultado():
     except requests.exceptions.RequestException as e:
         print(f"Erro na requisição: {e}")
 
+def testar_formatos_compactos():
+    print("\n--- Comparando os formatos de resposta (JSON, colunar, MessagePack) ---")
+    payload = {"filtros": {}, "paginacao": {"pagina": 1, "itens_por_pagina": 100}}
+    formatos = ["application/json", "application/vnd.c2s.colunar+json", "application/msgpack"]
+    try:
+        for formato in formatos:
+            # stream=True: lemos o corpo ainda comprimido para medir o que trafegou na rede
+            response = cliente.buscar(payload, headers={"Accept": formato, "Accept-Encoding": "gzip"}, stream=True)
+            response.raise_for_status()
+            comprimido = response.raw.read(decode_content=False)
+            print(f"{formato}: recebido como {response.headers.get('content-type')}, "
+                  f"{len(comprimido)} bytes ({response.headers.get('content-encoding', 'sem compressão')})")
+    except requests.exceptions.RequestException as e:
+        print(f"Erro na requisição: {e}")
+
 if __name__ == "__main__":
     # Primeiro, garanta que o servidor FastAPI esteja rodando em outro terminal:
     # poetry run uvicorn src.services.mcp_server:app --reload
@@ -87,4 +105,6 @@ if __name__ == "__main__":
     testar_busca_sem_filtros()
     testar_busca_com_filtros()
     testar_busca_filtros_sem_resultado()
+    testar_formatos_compactos()
+    cliente.fechar()
     print("\nTestes do cliente MCP finalizados.")
\ No newline at end of file
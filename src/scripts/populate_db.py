@@ -1,9 +1,23 @@
 # src/scripts/populate_db.py
+import argparse
 import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
 from faker import Faker
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
-from src.core.database import SessionLocal, engine, create_db_and_tables, AutomovelDB
+from src.core.database import (
+    SessionLocal, engine, create_db_and_tables, AutomovelDB, normalizar_texto, incrementar_versao_catalogo, somar_ao_resumo,
+    agregar_valores, somar_grupos_ao_resumo,
+)
 from src.models.automovel_model import TipoCombustivelEnum, TipoTransmissaoEnum, Automovel as AutomovelPydantic
+from src.models.catalogo import MARCAS_COMUNS, MODELOS_POR_MARCA, CORES_COMUNS
+import uuid
 from uuid import uuid4
 from datetime import datetime, timedelta
 
@@ -11,99 +25,98 @@ from datetime import datetime, timedelta
 # Usar 'pt_BR' para dados mais localizados (marcas de carros ainda serão genéricas)
 fake = Faker('pt_BR')
 
-# Listas de exemplo para dados mais realistas de carros
-MARCAS_COMUNS = ["Fiat", "Volkswagen", "Chevrolet", "Ford", "Hyundai", "Toyota", "Renault", "Honda", "Jeep", "Nissan"]
-MODELOS_POR_MARCA = {
-    "Fiat": ["Uno", "Mobi", "Argo", "Cronos", "Toro", "Strada", "Pulse"],
-    "Volkswagen": ["Gol", "Polo", "Virtus", "Nivus", "T-Cross", "Taos", "Amarok", "Saveiro"],
-    "Chevrolet": ["Onix", "Onix Plus", "Tracker", "S10", "Spin", "Montana"],
-    "Ford": ["Ka", "Ranger", "Territory", "Bronco"], # Ka saiu de linha, mas pode ter usados
-    "Hyundai": ["HB20", "HB20S", "Creta"],
-    "Toyota": ["Corolla", "Corolla Cross", "Hilux", "Yaris"],
-    "Renault": ["Kwid", "Sandero", "Logan", "Duster", "Oroch"],
-    "Honda": ["Fit", "City", "HR-V", "Civic"], # Civic nacional saiu de linha, mas pode ter usados
-    "Jeep": ["Renegade", "Compass", "Commander"],
-    "Nissan": ["Versa", "Kicks", "Frontier"]
-}
-CORES_COMUNS = ["Branco", "Preto", "Prata", "Cinza", "Vermelho", "Azul", "Marrom"]
 
-def gerar_automovel_ficticio() -> AutomovelDB:
-    """Gera uma instância de AutomovelDB com dados fictícios."""
-    marca = random.choice(MARCAS_COMUNS)
-    modelo = random.choice(MODELOS_POR_MARCA[marca])
+def gerar_dados_automovel_ficticio(rng: random.Random = random, faker: Faker = fake, ano_atual: int = None) -> dict:
+    """
+    Gera os valores de colunas de um automóvel fictício, sem validação.
+    'rng' e 'faker' podem ser instâncias com semente própria para gerar dados reprodutíveis;
+    nesse caso 'ano_atual' também deve ser fixo (por padrão é o ano do relógio).
+    """
+    ano_atual = ano_atual or datetime.now().year
+    marca = rng.choice(MARCAS_COMUNS)
+    modelo = rng.choice(MODELOS_POR_MARCA[marca])
     
-    ano_fabricacao = random.randint(2015, datetime.now().year)
+    ano_fabricacao = rng.randint(2015, ano_atual)
     # Ano modelo pode ser o mesmo ou um ano a mais
-    ano_modelo = random.choice([ano_fabricacao, ano_fabricacao + 1])
+    ano_modelo = rng.choice([ano_fabricacao, ano_fabricacao + 1])
     # Limitar ano_modelo ao próximo ano para não ser muito futurista
-    ano_modelo = min(ano_modelo, datetime.now().year + 1)
+    ano_modelo = min(ano_modelo, ano_atual + 1)
 
     # Ajuste para quilometragem ser mais realista com base no ano
-    anos_de_uso = datetime.now().year - ano_fabricacao
-    quilometragem_anual_media = random.randint(8000, 20000)
-    quilometragem = max(0, anos_de_uso * quilometragem_anual_media + random.randint(-5000, 5000))
+    anos_de_uso = ano_atual - ano_fabricacao
+    quilometragem_anual_media = rng.randint(8000, 20000)
+    quilometragem = max(0, anos_de_uso * quilometragem_anual_media + rng.randint(-5000, 5000))
     if anos_de_uso == 0 : # Carro do ano
-        quilometragem = random.randint(0,1000)
+        quilometragem = rng.randint(0,1000)
 
 
     # Motorização mais comum
-    motorizacao = random.choice([1.0, 1.3, 1.4, 1.5, 1.6, 1.8, 2.0])
+    motorizacao = rng.choice([1.0, 1.3, 1.4, 1.5, 1.6, 1.8, 2.0])
     if marca in ["Jeep", "Ford"] and modelo in ["Ranger", "S10", "Amarok", "Hilux", "Commander", "Frontier"]: # Pickups/SUVs maiores
-        motorizacao = random.choice([2.0, 2.5, 2.8, 3.0, 3.2])
+        motorizacao = rng.choice([2.0, 2.5, 2.8, 3.0, 3.2])
     elif marca == "Toyota" and modelo == "Corolla" and ano_fabricacao > 2019: # Híbrido
          motorizacao = 1.8
 
     # Preço um pouco mais realista com base no ano e marca (muito simplificado)
     preco_base_ano = (ano_fabricacao - 2010) * 3000 + 25000 # Base
     fator_marca = MARCAS_COMUNS.index(marca) * 500 # Marcas "melhores" um pouco mais caras
-    preco = preco_base_ano + fator_marca + random.uniform(-5000, 5000)
+    preco = preco_base_ano + fator_marca + rng.uniform(-5000, 5000)
     preco = round(max(15000, preco), 2) # Preço mínimo de 15k
 
     # Escolha de combustível e transmissão
-    tipo_combustivel = random.choice(list(TipoCombustivelEnum))
+    tipo_combustivel = rng.choice(list(TipoCombustivelEnum))
     # Carros mais novos tem maior chance de serem Flex no Brasil
     if ano_fabricacao > 2010 and tipo_combustivel not in [TipoCombustivelEnum.DIESEL, TipoCombustivelEnum.ELETRICO, TipoCombustivelEnum.HIBRIDO]:
-        tipo_combustivel = TipoCombustivelEnum.FLEX if random.random() > 0.2 else tipo_combustivel
+        tipo_combustivel = TipoCombustivelEnum.FLEX if rng.random() > 0.2 else tipo_combustivel
     
     # Se for pickup grande, maior chance de ser Diesel
     if motorizacao > 2.0 and marca in ["Ford", "Chevrolet", "Toyota", "Volkswagen", "Nissan", "Jeep"]:
-        if random.random() > 0.4: # 60% de chance de ser Diesel
+        if rng.random() > 0.4: # 60% de chance de ser Diesel
              tipo_combustivel = TipoCombustivelEnum.DIESEL
     
     if marca == "Toyota" and modelo == "Corolla" and motorizacao == 1.8 and ano_fabricacao > 2019:
         tipo_combustivel = TipoCombustivelEnum.HIBRIDO
 
     # Lógica simples para elétricos (ainda raros)
-    if random.random() < 0.02: # 2% de chance de ser elétrico
+    if rng.random() < 0.02: # 2% de chance de ser elétrico
         tipo_combustivel = TipoCombustivelEnum.ELETRICO
-        motorizacao = random.choice([50, 70, 100, 150]) # Potência em kW para elétricos (apenas para variar)
+        # O modelo Automovel exige motorizacao < 10, então não usamos a potência em kW
+        # aqui: valores como 100 faziam o registro ser descartado pela validação.
+        motorizacao = rng.choice([1.0, 1.5, 2.0])
         preco *= 1.8 # Elétricos são mais caros
 
-    transmissao = random.choice(list(TipoTransmissaoEnum))
+    transmissao = rng.choice(list(TipoTransmissaoEnum))
     # Carros mais novos e/ou mais caros têm mais chance de ser automáticos/CVT
     if (ano_fabricacao > 2018 or preco > 70000) and transmissao == TipoTransmissaoEnum.MANUAL:
-        transmissao = random.choice([TipoTransmissaoEnum.AUTOMATICO, TipoTransmissaoEnum.CVT, TipoTransmissaoEnum.AUTOMATIZADO])
+        transmissao = rng.choice([TipoTransmissaoEnum.AUTOMATICO, TipoTransmissaoEnum.CVT, TipoTransmissaoEnum.AUTOMATIZADO])
+
 
+    return {
+        "marca": marca,
+        "modelo": modelo,
+        "ano_fabricacao": ano_fabricacao,
+        "ano_modelo": ano_modelo,
+        "cor": rng.choice(CORES_COMUNS),
+        "motorizacao": round(motorizacao, 1),
+        "tipo_combustivel": tipo_combustivel,
+        "quilometragem": quilometragem,
+        "numero_portas": rng.choice([2, 4]) if modelo not in ["Toro", "Strada", "Saveiro", "S10", "Amarok", "Hilux", "Ranger", "Montana", "Oroch", "Frontier"] else rng.choice([2,4]), # Pickups podem ter 2 ou 4
+        "transmissao": transmissao,
+        "preco": preco,
+        "observacoes": faker.sentence(nb_words=10) if rng.random() > 0.5 else None,
+    }
+
+
+def gerar_automovel_ficticio() -> AutomovelDB:
+    """Gera uma instância de AutomovelDB com dados fictícios."""
+    dados = gerar_dados_automovel_ficticio()
 
     # Tentativa de criar um objeto Pydantic primeiro para validar os dados gerados
     # Isso é uma boa prática para garantir que os dados fakes estão conforme o esperado
     try:
-        automovel_pydantic = AutomovelPydantic(
-            # id_veiculo é gerado pelo SQLAlchemy ou pode ser gerado aqui se preferir
-            marca=marca,
-            modelo=modelo,
-            ano_fabricacao=ano_fabricacao,
-            ano_modelo=ano_modelo,
-            cor=random.choice(CORES_COMUNS),
-            motorizacao=round(motorizacao,1),
-            tipo_combustivel=tipo_combustivel,
-            quilometragem=quilometragem,
-            numero_portas=random.choice([2, 4]) if modelo not in ["Toro", "Strada", "Saveiro", "S10", "Amarok", "Hilux", "Ranger", "Montana", "Oroch", "Frontier"] else random.choice([2,4]), # Pickups podem ter 2 ou 4
-            transmissao=transmissao,
-            preco=preco,
-            observacoes=fake.sentence(nb_words=10) if random.random() > 0.5 else None
-            # data_cadastro será definida pelo default no modelo SQLAlchemy
-        )
+        # id_veiculo é gerado pelo SQLAlchemy ou pode ser gerado aqui se preferir
+        # data_cadastro será definida pelo default no modelo SQLAlchemy
+        automovel_pydantic = AutomovelPydantic(**dados)
         # Converte o modelo Pydantic validado para o modelo SQLAlchemy
         return AutomovelDB(**automovel_pydantic.model_dump(exclude_none=True))
 
@@ -137,14 +150,214 @@ def popular_banco(db: Session, num_veiculos: int = 100):
     print(f"Concluído! {veiculos_inseridos} veículos inseridos no banco de dados.")
 
 
-if __name__ == "__main__":
-    print("Criando tabelas (se não existirem)...")
-    create_db_and_tables() # Garante que a tabela e a pasta 'data' existam
-    
-    # Obtém uma sessão do banco de dados
-    db = SessionLocal()
+# --- Carga em lote ---
+# Para bancos de benchmark (milhões de linhas) o caminho acima é lento demais:
+# um objeto do ORM e uma validação Pydantic por veículo e um commit a cada 20.
+# Aqui as linhas são dicionários simples, inseridas com insert() do Core em
+# executemany, com uma transação por lote grande.
+
+_normalizar = lru_cache(maxsize=None)(normalizar_texto) # Poucas marcas/modelos distintos
+
+def completar_linha(dados: dict, id_veiculo: uuid.UUID = None, data_cadastro: datetime = None) -> dict:
+    """Preenche as colunas que o ORM calcularia (id, data de cadastro, colunas normalizadas)."""
+    dados["id_veiculo"] = id_veiculo or uuid4()
+    dados["data_cadastro"] = data_cadastro or datetime.now()
+    dados["marca_normalizada"] = _normalizar(dados["marca"])
+    dados["modelo_normalizado"] = _normalizar(dados["modelo"])
+    return dados
+
+def gerar_lotes(num_veiculos: int, tamanho_lote: int) -> Iterator[List[dict]]:
+    """Gera os veículos fictícios em listas de até 'tamanho_lote' linhas."""
+    ano_atual = datetime.now().year # Lido uma vez: uma carga longa não muda de ano no meio
+    for inicio in range(0, num_veiculos, tamanho_lote):
+        quantidade = min(tamanho_lote, num_veiculos - inicio)
+        yield [completar_linha(gerar_dados_automovel_ficticio(ano_atual=ano_atual)) for _ in range(quantidade)]
+
+# --- Geração paralela e reprodutível ---
+# A geração (Faker + regras em Python) é limitada por CPU. Os lotes são gerados
+# em processos separados e voltam, em ordem, para o processo principal, que é o
+# único a escrever no SQLite. Cada lote usa uma semente derivada de
+# (semente, índice do lote): a mesma semente gera sempre o mesmo banco, com
+# qualquer número de processos.
+
+# Data de referência das gerações com semente: os cadastros caem no ano que
+# começa nela e os anos de fabricação/uso são contados a partir do seu ano, de
+# modo que a mesma semente gere o mesmo banco em qualquer data
+DATA_BASE_CADASTRO = datetime(2024, 1, 1)
+ANO_REFERENCIA = DATA_BASE_CADASTRO.year
+_faker_do_processo = None # Um Faker por processo de trabalho; criá-lo é caro
+
+def gerar_lote_com_semente(semente: int, indice_lote: int, quantidade: int) -> List[dict]:
+    global _faker_do_processo
+    if _faker_do_processo is None:
+        _faker_do_processo = Faker('pt_BR')
+    rng = random.Random(f"{semente}:{indice_lote}")
+    _faker_do_processo.seed_instance(rng.getrandbits(64))
+    return [
+        completar_linha(
+            gerar_dados_automovel_ficticio(rng, _faker_do_processo, ano_atual=ANO_REFERENCIA),
+            id_veiculo=uuid.UUID(int=rng.getrandbits(128), version=4),
+            data_cadastro=DATA_BASE_CADASTRO + timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+        )
+        for _ in range(quantidade)
+    ]
+
+def gerar_lotes_paralelos(num_veiculos: int, tamanho_lote: int, processos: int, semente: int) -> Iterator[List[dict]]:
+    """
+    Gera os lotes em 'processos' processos e os entrega na ordem dos índices.
+    No máximo 2 lotes por processo ficam em andamento, para a memória não crescer
+    quando a escrita for mais lenta que a geração.
+    """
+    tarefas = [
+        (semente, indice, min(tamanho_lote, num_veiculos - inicio))
+        for indice, inicio in enumerate(range(0, num_veiculos, tamanho_lote))
+    ]
+    if processos <= 1:
+        for tarefa in tarefas:
+            yield gerar_lote_com_semente(*tarefa)
+        return
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        pendentes = deque()
+        for tarefa in tarefas:
+            pendentes.append(executor.submit(gerar_lote_com_semente, *tarefa))
+            if len(pendentes) >= processos * 2:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+@contextmanager
+def pragmas_carga_rapida(conn: Connection):
+    """
+    Durante a carga, troca o journal do SQLite para memória e desliga o fsync
+    (synchronous=OFF), restaurando os valores anteriores ao final. Uma queda no
+    meio da carga pode corromper o banco, o que é aceitável para bancos de
+    benchmark gerados do zero.
+    Bancos em modo WAL continuam em WAL: trocar o journal exigiria acesso
+    exclusivo e impediria o servidor de seguir respondendo buscas durante a carga.
+    """
+    if conn.dialect.name != "sqlite":
+        yield
+        return
+    anteriores = {
+        "journal_mode": conn.exec_driver_sql("PRAGMA journal_mode").scalar(),
+        "synchronous": conn.exec_driver_sql("PRAGMA synchronous").scalar(),
+    }
+    if anteriores["journal_mode"] == "wal":
+        del anteriores["journal_mode"]
+    else:
+        conn.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+    conn.exec_driver_sql("PRAGMA synchronous=OFF")
+    conn.commit()
     try:
-        popular_banco(db, num_veiculos=100) # Popula com 100 veículos
+        yield
     finally:
-        db.close() # Fecha a sessão
-    print("Script de população finalizado.")
\ No newline at end of file
+        conn.rollback() # Encerra qualquer transação pendente antes de mexer no journal
+        for pragma, valor in anteriores.items():
+            conn.exec_driver_sql(f"PRAGMA {pragma}={valor}")
+        conn.commit()
+
+def inserir_colunas(conn: Connection, colunas: Dict[str, Sequence]) -> int:
+    """
+    Insere um lote colunar ({coluna: valores}, com todas as colunas da tabela)
+    com um executemany de tuplas direto no driver, sem montar um dicionário por
+    linha. Os valores passam pelos mesmos conversores de tipo que o Core usaria
+    (UUID, Enum, DateTime); os defaults das colunas não são aplicados.
+    """
+    tabela = AutomovelDB.__table__
+    valores = []
+    for nome, coluna in colunas.items():
+        converter = tabela.c[nome].type.dialect_impl(conn.dialect).bind_processor(conn.dialect)
+        valores.append([converter(valor) for valor in coluna] if converter else coluna)
+    marcador = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+    preparador = conn.dialect.identifier_preparer
+    comando = (f"INSERT INTO {preparador.format_table(tabela)} ({', '.join(preparador.quote(nome) for nome in colunas)}) "
+               f"VALUES ({', '.join([marcador] * len(colunas))})")
+    linhas = list(zip(*valores))
+    conn.exec_driver_sql(comando, linhas)
+    somar_grupos_ao_resumo(conn, agregar_valores(zip(colunas["marca"], colunas["modelo"], colunas["tipo_combustivel"], colunas["preco"])))
+    return len(linhas)
+
+def inserir_lotes(engine_destino: Engine, lotes: Iterable[Union[List[dict], Dict[str, Sequence]]], adiar_indices: bool = False) -> int:
+    """
+    Insere os lotes com executemany, uma transação por lote, e retorna o total inserido.
+    Cada lote é uma lista de linhas (dicionários) ou um lote colunar (ver inserir_colunas).
+    Com 'adiar_indices', os índices secundários são removidos antes da carga e
+    recriados no final, o que é bem mais rápido que mantê-los linha a linha.
+    """
+    tabela = AutomovelDB.__table__
+    comando_insert = insert(tabela)
+    total = 0
+    inicio = time.perf_counter()
+    with engine_destino.connect() as conn, pragmas_carga_rapida(conn):
+        if adiar_indices:
+            for indice in tabela.indexes:
+                indice.drop(conn, checkfirst=True)
+            conn.commit()
+        try:
+            for lote in lotes:
+                with conn.begin():
+                    if isinstance(lote, dict):
+                        quantidade = inserir_colunas(conn, lote)
+                    else:
+                        conn.execute(comando_insert, lote)
+                        somar_ao_resumo(conn, lote)
+                        quantidade = len(lote)
+                    incrementar_versao_catalogo(conn)
+                total += quantidade
+                print(f"{total} veículos inseridos ({total / (time.perf_counter() - inicio):,.0f} linhas/s).")
+        finally:
+            if adiar_indices:
+                print("Recriando índices...")
+                for indice in tabela.indexes:
+                    indice.create(conn, checkfirst=True)
+                conn.commit()
+    return total
+
+def popular_banco_em_lote(engine_destino: Engine, num_veiculos: int, tamanho_lote: int = 50_000, adiar_indices: bool = False,
+                          processos: int = 1, semente: int = None) -> int:
+    """
+    Carga em lote. Com 'semente' (ou mais de um processo) usa a geração paralela
+    e reprodutível; sem ela, gera no próprio processo com o 'random' global.
+    """
+    print(f"Iniciando a carga em lote de {num_veiculos} veículos fictícios (lotes de {tamanho_lote})...")
+    if semente is not None or processos > 1:
+        semente = semente if semente is not None else random.randrange(2**32)
+        print(f"Gerando com {processos} processo(s), semente {semente}.")
+        lotes = gerar_lotes_paralelos(num_veiculos, tamanho_lote, processos, semente)
+    else:
+        lotes = gerar_lotes(num_veiculos, tamanho_lote)
+    total = inserir_lotes(engine_destino, lotes, adiar_indices=adiar_indices)
+    print(f"Concluído! {total} veículos inseridos no banco de dados.")
+    return total
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Popula o banco de dados com veículos fictícios.")
+    parser.add_argument("--quantidade", type=int, default=100, help="Número de veículos a inserir (padrão: 100).")
+    parser.add_argument("--modo", choices=["orm", "lote"], default="orm",
+                        help="'orm' valida cada veículo com o Pydantic; 'lote' usa insert() em massa para grandes volumes.")
+    parser.add_argument("--tamanho-lote", type=int, default=50_000, help="Linhas por transação no modo 'lote'.")
+    parser.add_argument("--adiar-indices", action="store_true", help="No modo 'lote', recria os índices só no final da carga.")
+    parser.add_argument("--processos", type=int, default=1, help="No modo 'lote', processos usados para gerar os dados.")
+    parser.add_argument("--semente", type=int, default=None, help="No modo 'lote', semente para gerar sempre o mesmo conjunto de dados.")
+    args = parser.parse_args(argv)
+
+    print("Criando tabelas (se não existirem)...")
+    create_db_and_tables() # Garante que a tabela e a pasta 'data' existam
+
+    if args.modo == "lote":
+        popular_banco_em_lote(engine, args.quantidade, tamanho_lote=args.tamanho_lote, adiar_indices=args.adiar_indices,
+                              processos=args.processos, semente=args.semente)
+    else:
+        # Obtém uma sessão do banco de dados
+        db = SessionLocal()
+        try:
+            popular_banco(db, num_veiculos=args.quantidade)
+        finally:
+            db.close() # Fecha a sessão
+    print("Script de população finalizado.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
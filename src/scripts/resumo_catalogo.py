@@ -0,0 +1,35 @@
+# src/scripts/resumo_catalogo.py
+import argparse
+import sys
+from typing import List
+
+from src.core.database import engine, create_db_and_tables, reconstruir_resumo, verificar_resumo
+
+# Manutenção da tabela resumo_catalogo (agregados por marca/modelo/combustível).
+# Ela é atualizada a cada escrita; este script confere o resumo contra a tabela
+# 'automoveis' e, se pedido, o reconstrói do zero.
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verifica ou reconstrói o resumo do catálogo.")
+    parser.add_argument("--reconstruir", action="store_true", help="Reconstrói o resumo a partir de 'automoveis' antes de verificar.")
+    args = parser.parse_args(argv)
+
+    create_db_and_tables()
+    with engine.begin() as conn:
+        if args.reconstruir:
+            print("Reconstruindo o resumo do catálogo...")
+            reconstruir_resumo(conn)
+        divergencias = verificar_resumo(conn)
+
+    if not divergencias:
+        print("Resumo do catálogo confere com a tabela 'automoveis'.")
+        return 0
+    print(f"{len(divergencias)} grupo(s) divergente(s) (chave: resumo -> esperado):")
+    for chave, atual, esperado in divergencias[:20]:
+        print(f"  {chave}: {atual} -> {esperado}")
+    print("Rode com --reconstruir para corrigir.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# src/services/compressao.py
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Brotli é opcional (extra 'compressao' do pyproject): sem ele, só gzip
+try:
+    import brotli
+except ImportError: # pragma: no cover - depende do ambiente
+    brotli = None
+
+# Compressão negociada pelo Accept-Encoding. As respostas de busca repetem os
+# mesmos nomes de campos e valores de enum para cada carro e comprimem muito
+# bem. Brotli (quando instalado e aceito pelo cliente) é preferido ao gzip;
+# respostas menores que 'tamanho_minimo' seguem sem compressão.
+# O responder é nosso (e não o do Starlette, cuja API interna muda entre
+# versões); ele segue as mesmas regras do GZipMiddleware.
+
+TIPOS_NAO_COMPRIMIDOS = ("text/event-stream",)
+CODIFICACOES = ("gzip", "br")
+
+# Uma ETag forte identifica bytes exatos, e o corpo comprimido tem outros bytes:
+# a representação gzip/br recebe a ETag com o sufixo da codificação
+# ('"v-hash"' -> '"v-hash-gzip"'), como faz o mod_deflate do Apache.
+
+def etag_codificada(etag: str, codificacao: str) -> str:
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag # ETags fracas já admitem codificações diferentes
+    return f'{etag[:-1]}-{codificacao}"'
+
+def etag_sem_codificacao(etag: str) -> str:
+    """Inverso de etag_codificada, para comparar com a ETag calculada pela aplicação."""
+    for codificacao in CODIFICACOES:
+        sufixo = f'-{codificacao}"'
+        if etag.endswith(sufixo):
+            return etag[:-len(sufixo)] + '"'
+    return etag
+
+class CompressorGzip:
+    def __init__(self, nivel: int) -> None:
+        self._zlib = zlib.compressobj(nivel, zlib.DEFLATED, 31) # wbits=31: formato gzip
+
+    def comprimir(self, dados: bytes, fim: bool) -> bytes:
+        return self._zlib.compress(dados) + self._zlib.flush(zlib.Z_FINISH if fim else zlib.Z_SYNC_FLUSH)
+
+class CompressorBrotli:
+    def __init__(self, qualidade: int) -> None:
+        self._brotli = brotli.Compressor(quality=qualidade)
+
+    def comprimir(self, dados: bytes, fim: bool) -> bytes:
+        return self._brotli.process(dados) + (self._brotli.finish() if fim else self._brotli.flush())
+
+class ResponderCompressao:
+    """
+    Envolve uma resposta ASGI e comprime o corpo com 'compressor' (None = sem
+    compressão, só o cabeçalho Vary). Respostas em streaming saem comprimidas
+    pedaço a pedaço, assim que cada um chega.
+    """
+    def __init__(self, app: ASGIApp, tamanho_minimo: int, codificacao: Optional[str] = None, compressor=None) -> None:
+        self.app = app
+        self.tamanho_minimo = tamanho_minimo
+        self.codificacao = codificacao
+        self.compressor = compressor
+        self.send: Optional[Send] = None
+        self.if_none_match = ""
+        self.mensagem_inicial: Message = {}
+        self.iniciada = False
+        self.repassar = False # Já codificada ou de um tipo que não se comprime
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        self.if_none_match = Headers(scope=scope).get("If-None-Match", "")
+        await self.app(scope, receive, self.enviar)
+
+    def _comprimir(self, corpo: bytes, fim: bool) -> bytes:
+        return self.compressor.comprimir(corpo, fim) if self.compressor is not None else corpo
+
+    async def enviar(self, mensagem: Message) -> None:
+        if mensagem["type"] == "http.response.start":
+            # O início só é enviado quando soubermos se o corpo será comprimido
+            self.mensagem_inicial = mensagem
+            cabecalhos = Headers(raw=mensagem["headers"])
+            self.repassar = "content-encoding" in cabecalhos or cabecalhos.get("content-type", "").startswith(TIPOS_NAO_COMPRIMIDOS)
+            if mensagem["status"] == 304 and self.compressor is not None and "etag" in cabecalhos:
+                # O 304 repete a ETag que o cliente tem: a da versão comprimida, se foi ela que ele recebeu
+                etag = etag_codificada(cabecalhos["etag"], self.codificacao)
+                if etag in self.if_none_match:
+                    MutableHeaders(raw=mensagem["headers"])["ETag"] = etag
+            return
+        if mensagem["type"] != "http.response.body":
+            await self.send(mensagem)
+            return
+
+        corpo = mensagem.get("body", b"")
+        mais_corpo = mensagem.get("more_body", False)
+        if self.iniciada:
+            # Demais pedaços de uma resposta em streaming
+            if not self.repassar:
+                mensagem["body"] = self._comprimir(corpo, fim=not mais_corpo)
+            await self.send(mensagem)
+            return
+
+        self.iniciada = True
+        if not self.repassar and (mais_corpo or len(corpo) >= self.tamanho_minimo):
+            comprimido = self._comprimir(corpo, fim=not mais_corpo)
+            cabecalhos = MutableHeaders(raw=self.mensagem_inicial["headers"])
+            cabecalhos.add_vary_header("Accept-Encoding")
+            if self.compressor is not None:
+                cabecalhos["Content-Encoding"] = self.codificacao
+                if "etag" in cabecalhos:
+                    cabecalhos["ETag"] = etag_codificada(cabecalhos["etag"], self.codificacao)
+                if mais_corpo:
+                    del cabecalhos["Content-Length"]
+                else:
+                    cabecalhos["Content-Length"] = str(len(comprimido))
+                mensagem["body"] = comprimido
+        await self.send(self.mensagem_inicial)
+        await self.send(mensagem)
+
+class CompressaoMiddleware:
+    def __init__(self, app: ASGIApp, tamanho_minimo: int = 1000, nivel_gzip: int = 6, qualidade_brotli: int = 4) -> None:
+        self.app = app
+        self.tamanho_minimo = tamanho_minimo
+        self.nivel_gzip = nivel_gzip # 9 (padrão do Starlette) custa bem mais CPU para ganhar pouco
+        self.qualidade_brotli = qualidade_brotli # 4 é próximo do gzip em velocidade e comprime mais
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codificacoes = {item.split(";")[0].strip().lower() for item in Headers(scope=scope).get("Accept-Encoding", "").split(",")}
+        if brotli is not None and "br" in codificacoes:
+            responder = ResponderCompressao(self.app, self.tamanho_minimo, "br", CompressorBrotli(self.qualidade_brotli))
+        elif "gzip" in codificacoes:
+            responder = ResponderCompressao(self.app, self.tamanho_minimo, "gzip", CompressorGzip(self.nivel_gzip))
+        else:
+            responder = ResponderCompressao(self.app, self.tamanho_minimo)
+        await responder(scope, receive, send)
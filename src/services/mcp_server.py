@@ -1,29 +1,70 @@
 # src/services/mcp_server.py
 
-from fastapi import FastAPI, HTTPException, Body, Depends
+from fastapi import FastAPI, HTTPException, Body, Depends, Response, Query, Header
+from fastapi.responses import StreamingResponse
 # Removido: from fastapi.responses import JSONResponse (não estava sendo usado diretamente)
 from pydantic import BaseModel, Field, field_validator, ConfigDict # Adicionado ConfigDict
 from typing import List, Optional, Dict, AsyncGenerator # Adicionado AsyncGenerator
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, or_, literal, cast, Integer
 from contextlib import asynccontextmanager # Para lifespan
+import base64
+import csv
+import hashlib
+import io
+import json
+import orjson
+import os
+import time
+import uuid
+from collections import OrderedDict
 
 from datetime import datetime # Já estava importado, mas garantindo
+from enum import Enum
 
 # Nossos modelos e configuração de banco
 from src.models.automovel_model import Automovel as AutomovelPydanticModel, TipoCombustivelEnum, TipoTransmissaoEnum
-from src.core.database import SessionLocal, AutomovelDB, engine, create_db_and_tables # SessionLocal é de database.py
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from src.core.database import AsyncSessionLocal, AutomovelDB, CatalogoVersaoDB, ResumoCatalogoDB, create_db_and_tables, normalizar_texto # AsyncSessionLocal é de database.py
+from src.services.motor_memoria import MotorBuscaMemoria
+from src.services.compressao import CompressaoMiddleware, etag_sem_codificacao
+
+# MessagePack é opcional (extra 'compressao' do pyproject)
+try:
+    import msgpack
+except ImportError: # pragma: no cover - depende do ambiente
+    msgpack = None
 
 from pydantic import ValidationInfo
-from typing import Any, Generator
+from typing import Any
+
+# --- Cursor de paginação (keyset) ---
+# O cursor carrega a chave de ordenação do último item entregue
+# (marca, modelo, ano_fabricacao, id_veiculo). A próxima página começa logo
+# depois dessa chave, sem OFFSET: o banco não precisa percorrer e descartar
+# todas as linhas das páginas anteriores.
+
+def codificar_cursor(marca: str, modelo: str, ano_fabricacao: int, id_veiculo: uuid.UUID) -> str:
+    chave = json.dumps([marca, modelo, ano_fabricacao, id_veiculo.hex], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(chave.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decodificar_cursor(cursor: str) -> tuple:
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        marca, modelo, ano_fabricacao, id_hex = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+        if not isinstance(marca, str) or not isinstance(modelo, str) or not isinstance(ano_fabricacao, int):
+            raise ValueError
+        return marca, modelo, ano_fabricacao, uuid.UUID(hex=id_hex)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError('Cursor de paginação inválido.')
 
 # --- Modelos Pydantic para Requisição e Resposta da API ---
 
 class FiltrosAutomovel(BaseModel):
     model_config = ConfigDict(extra='forbid') # Proibir campos extras na requisição de filtros
 
-    marca: Optional[str] = Field(default=None, min_length=2, max_length=50)
-    modelo: Optional[str] = Field(default=None, min_length=1, max_length=50)
+    marca: Optional[str] = Field(default=None, min_length=2, max_length=50, description="Início do nome da marca, sem diferenciar maiúsculas e acentos.")
+    modelo: Optional[str] = Field(default=None, min_length=1, max_length=50, description="Início do nome do modelo, sem diferenciar maiúsculas e acentos.")
     ano_min: Optional[int] = Field(default=None, gt=1900)
     ano_max: Optional[int] = Field(default=None, lt=datetime.now().year + 3)
     tipo_combustivel: Optional[TipoCombustivelEnum] = Field(default=None)
@@ -46,25 +87,46 @@ class FiltrosAutomovel(BaseModel):
         return v
 
 
+class ModoContagemEnum(str, Enum):
+    EXATA = "exata"       # count(*) completo com os mesmos filtros
+    LIMITADA = "limitada" # conta no máximo 'limite_contagem' itens ("mais de N")
+    NENHUMA = "nenhuma"   # não conta; útil para quem só olha a primeira página
+
 class Paginacao(BaseModel):
     model_config = ConfigDict(extra='forbid')
     pagina: int = Field(1, gt=0)
     itens_por_pagina: int = Field(10, gt=0, le=100)
+    cursor: Optional[str] = Field(default=None, description="Cursor opaco retornado em 'proximo_cursor'. Quando informado, 'pagina' é ignorada e a busca continua logo após o último item da página anterior.")
+    contagem: ModoContagemEnum = Field(ModoContagemEnum.EXATA, description="Como calcular 'total_encontrado'.")
+    limite_contagem: int = Field(1000, gt=0, le=100000, description="Teto da contagem no modo 'limitada'.")
+
+    @field_validator('cursor')
+    @classmethod
+    def validar_cursor(cls, v: Optional[str]) -> Optional[str]:
+        if v is not None:
+            decodificar_cursor(v) # Levanta ValueError (-> 422) se o cursor estiver corrompido
+        return v
 
 class MCPRequest(BaseModel):
     model_config = ConfigDict(extra='forbid')
     filtros: Optional[FiltrosAutomovel] = Field(default_factory=FiltrosAutomovel) # Default para filtros vazios
     paginacao: Optional[Paginacao] = Field(default_factory=Paginacao)
 
+class MCPLoteRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    requisicoes: List[MCPRequest] = Field(..., min_length=1, max_length=100, description="Buscas executadas em uma única chamada; as respostas saem na mesma ordem.")
+
 class AutomovelRespostaParaAPI(AutomovelPydanticModel): # Herda do nosso modelo Pydantic principal
     # model_config já é herdado de AutomovelPydanticModel, que tem from_attributes=True
     pass
 
 class MCPDadosResposta(BaseModel):
     automoveis: List[AutomovelRespostaParaAPI]
-    total_encontrado: int
-    pagina_atual: int
-    total_paginas: int
+    total_encontrado: Optional[int] # None quando a contagem foi dispensada (contagem='nenhuma')
+    pagina_atual: Optional[int] # None na paginação por cursor, em que a posição não é conhecida
+    total_paginas: Optional[int] # None quando o total não é conhecido com exatidão
+    total_excede_limite: bool = False # True se a contagem 'limitada' parou no teto (há mais de 'total_encontrado')
+    proximo_cursor: Optional[str] = None # Presente quando há mais resultados após esta página
 
 class MCPResponse(BaseModel):
     sucesso: bool
@@ -72,6 +134,262 @@ class MCPResponse(BaseModel):
     dados: Optional[MCPDadosResposta] = None
     erros: Optional[Dict[str, Any]] = None # Permitir qualquer tipo de valor para erros detalhados
 
+class MCPLoteResponse(BaseModel):
+    sucesso: bool
+    mensagem: str
+    resultados: List[MCPResponse] # Um MCPResponse por requisição, na ordem recebida
+
+class MCPFacetasRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    filtros: Optional[FiltrosAutomovel] = Field(default_factory=FiltrosAutomovel)
+    largura_faixa_preco: float = Field(10000.0, gt=0, description="Largura (R$) de cada faixa do histograma de preços.")
+    largura_faixa_ano: int = Field(1, gt=0, le=50, description="Largura (anos) de cada faixa do histograma de ano de fabricação.")
+
+class ContagemFaceta(BaseModel):
+    valor: str
+    quantidade: int
+
+class FaixaHistograma(BaseModel):
+    inicio: float # Inclusivo
+    fim: float    # Exclusivo
+    quantidade: int
+
+class MCPFacetas(BaseModel):
+    total_encontrado: int
+    # Valores em ordem decrescente de quantidade
+    marca: List[ContagemFaceta]
+    modelo: List[ContagemFaceta]
+    tipo_combustivel: List[ContagemFaceta]
+    transmissao: List[ContagemFaceta]
+    # Faixas não vazias, em ordem crescente
+    preco: List[FaixaHistograma]
+    ano_fabricacao: List[FaixaHistograma]
+
+class MCPFacetasResponse(BaseModel):
+    sucesso: bool
+    mensagem: str
+    dados: Optional[MCPFacetas] = None
+    erros: Optional[Dict[str, Any]] = None
+
+class ResumoModelo(BaseModel):
+    marca: str
+    modelo: str
+    quantidade: int
+    preco_min: float
+    preco_max: float
+    preco_medio: float
+
+class MCPResumoCatalogo(BaseModel):
+    total: int
+    por_marca: List[ContagemFaceta]
+    por_combustivel: List[ContagemFaceta]
+    por_modelo: List[ResumoModelo] # Ordenado por marca e modelo
+
+class MCPResumoResponse(BaseModel):
+    sucesso: bool
+    mensagem: str
+    dados: Optional[MCPResumoCatalogo] = None
+    erros: Optional[Dict[str, Any]] = None
+
+# --- Serialização rápida das respostas ---
+# A busca seleciona só as colunas que a resposta expõe, na ordem dos campos de
+# AutomovelRespostaParaAPI, e o JSON é gerado de uma vez pelo orjson a partir de
+# dicionários simples. Evita validar cada linha com o Pydantic e a segunda
+# validação + serialização que o FastAPI faria com o response_model; os dados vêm
+# do nosso próprio banco, já validados na escrita. O JSON produzido é idêntico ao
+# de MCPResponse.model_dump_json(by_alias=True).
+CAMPOS_AUTOMOVEL = tuple(campo.alias or nome for nome, campo in AutomovelRespostaParaAPI.model_fields.items())
+COLUNAS_AUTOMOVEL = tuple(getattr(AutomovelDB, nome) for nome in AutomovelRespostaParaAPI.model_fields)
+CAMPO_ID = AutomovelRespostaParaAPI.model_fields["id_veiculo"].alias # "_id"
+
+def serializar_resposta(resposta: Dict[str, Any]) -> bytes:
+    return orjson.dumps(resposta)
+
+# --- Representações compactas ---
+# Negociadas pelo cabeçalho Accept da busca:
+# - application/json (padrão): MCPResponse, uma lista de objetos em 'automoveis'
+# - application/vnd.c2s.colunar+json: o mesmo MCPResponse, mas 'automoveis' é um
+#   objeto com uma lista por campo ({"_id": [...], "marca": [...], ...}), sem
+#   repetir os nomes dos campos a cada carro
+# - application/msgpack: o formato colunar codificado em MessagePack
+TIPO_JSON = "application/json"
+TIPO_COLUNAR = "application/vnd.c2s.colunar+json"
+TIPO_MSGPACK = "application/msgpack"
+
+def representacoes_disponiveis() -> tuple:
+    return (TIPO_JSON, TIPO_COLUNAR, TIPO_MSGPACK) if msgpack is not None else (TIPO_JSON, TIPO_COLUNAR)
+
+def escolher_representacao(accept: Optional[str]) -> str:
+    """Tipo de mídia da resposta conforme o Accept (maior 'q' primeiro); JSON quando nada conhecido é pedido."""
+    pedidos = []
+    for posicao, item in enumerate((accept or "").split(",")):
+        tipo, *parametros = [parte.strip() for parte in item.split(";")]
+        q = 1.0
+        for parametro in parametros:
+            if parametro.startswith("q="):
+                try:
+                    q = float(parametro[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            pedidos.append((-q, posicao, tipo.lower()))
+    disponiveis = representacoes_disponiveis()
+    for _, _, tipo in sorted(pedidos):
+        if tipo in disponiveis:
+            return tipo
+    return TIPO_JSON
+
+def codificar_resposta(resposta: Dict[str, Any], representacao: str) -> bytes:
+    if representacao == TIPO_JSON:
+        return serializar_resposta(resposta)
+    dados = resposta["dados"]
+    automoveis = dados["automoveis"]
+    colunar = {**resposta, "dados": {**dados, "automoveis": {campo: [carro[campo] for carro in automoveis] for campo in CAMPOS_AUTOMOVEL}}}
+    conteudo = serializar_resposta(colunar)
+    if representacao == TIPO_MSGPACK:
+        # Ida e volta pelo orjson: UUIDs, datas e enums ficam com a mesma forma textual do JSON
+        return msgpack.packb(orjson.loads(conteudo))
+    return conteudo
+
+# --- Cache de respostas ---
+# Os clientes (agente de terminal, front-ends) repetem muito as mesmas buscas.
+# Guardamos o JSON já serializado da resposta, indexado pela requisição canônica
+# e marcado com a versão do catálogo em que foi calculado: qualquer escrita em
+# 'automoveis' muda a versão e torna as entradas antigas inválidas.
+
+class MonitorVersaoCatalogo:
+    """
+    Lê a versão do catálogo no banco, no máximo uma vez a cada 'intervalo_segundos'.
+    O intervalo limita por quanto tempo uma escrita feita por outro processo
+    pode passar despercebida (0 = consultar sempre).
+    """
+    def __init__(self, intervalo_segundos: float = 1.0):
+        self.intervalo_segundos = intervalo_segundos
+        self._versao: Optional[int] = None
+        self._lida_em = 0.0
+
+    async def versao_atual(self, db: AsyncSession) -> int:
+        agora = time.monotonic()
+        if self._versao is None or agora - self._lida_em >= self.intervalo_segundos:
+            self._versao = await db.scalar(select(CatalogoVersaoDB.versao).where(CatalogoVersaoDB.id == 1)) or 0
+            self._lida_em = agora
+        return self._versao
+
+    def invalidar(self) -> None:
+        """Força a releitura na próxima consulta (usar após escritas feitas por este processo)."""
+        self._versao = None
+
+class CacheRespostas:
+    """Cache LRU com expiração (TTL) de respostas serializadas."""
+    def __init__(self, max_itens: int = 1024, ttl_segundos: float = 60.0):
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self._itens: "OrderedDict[str, tuple]" = OrderedDict() # chave -> (versao, expira_em, conteudo)
+        self.acertos = 0
+        self.falhas = 0
+        self.evicoes = 0     # removidas por falta de espaço (LRU)
+        self.expiracoes = 0  # removidas por TTL ou por mudança de versão do catálogo
+
+    def obter(self, chave: str, versao: int) -> Optional[bytes]:
+        item = self._itens.get(chave)
+        if item is not None:
+            versao_item, expira_em, conteudo = item
+            if versao_item == versao and time.monotonic() < expira_em:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return conteudo
+            del self._itens[chave]
+            self.expiracoes += 1
+        self.falhas += 1
+        return None
+
+    def guardar(self, chave: str, versao: int, conteudo: bytes) -> None:
+        self._itens[chave] = (versao, time.monotonic() + self.ttl_segundos, conteudo)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+            self.evicoes += 1
+
+    def limpar(self) -> None:
+        self._itens.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        consultas = self.acertos + self.falhas
+        return {
+            "itens": len(self._itens),
+            "max_itens": self.max_itens,
+            "ttl_segundos": self.ttl_segundos,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "evicoes": self.evicoes,
+            "expiracoes": self.expiracoes,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+        }
+
+def chave_filtros(filtros: Optional[FiltrosAutomovel]) -> str:
+    """Forma canônica dos filtros: filtros ausentes e vazios geram a mesma chave."""
+    return (filtros or FiltrosAutomovel()).model_dump_json()
+
+def chave_cache(mcp_request: MCPRequest) -> str:
+    """Forma canônica da requisição (filtros + paginação)."""
+    paginacao = mcp_request.paginacao or Paginacao()
+    return chave_filtros(mcp_request.filtros) + "|" + paginacao.model_dump_json()
+
+# --- Requisições condicionais (ETag) ---
+# A resposta de uma busca só muda quando o catálogo muda. A ETag combina a versão
+# do catálogo com um hash da requisição canônica: um cliente que repete a mesma
+# busca com If-None-Match recebe 304 sem corpo, e, dentro do intervalo do
+# monitor de versão, sem nenhuma consulta ao banco.
+
+def calcular_etag(versao: int, chave: str) -> str:
+    # 'chave' deve identificar também a representação (JSON, colunar...), que muda os bytes
+    resumo = hashlib.blake2b(chave.encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{versao}-{resumo}"'
+
+def etag_confere(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Avalia o cabeçalho If-None-Match (lista de ETags, fracas ou fortes, ou '*').
+    As ETags das versões comprimidas (sufixo -gzip/-br, ver compressao.py) valem
+    para a mesma resposta: a comparação é fraca.
+    """
+    if not if_none_match:
+        return False
+    candidatas = {etag_sem_codificacao(candidata.strip().removeprefix("W/")) for candidata in if_none_match.split(",")}
+    return "*" in candidatas or etag in candidatas
+
+def resposta_json(conteudo: bytes, etag: str, media_type: str = TIPO_JSON, vary_accept: bool = False) -> Response:
+    # no-cache: o cliente pode guardar a resposta, mas deve revalidá-la (If-None-Match) a cada uso
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if vary_accept:
+        headers["Vary"] = "Accept" # O formato depende do Accept (a compressão acrescenta Accept-Encoding)
+    return Response(content=conteudo, media_type=media_type, headers=headers)
+
+def resposta_nao_modificada(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+monitor_versao = MonitorVersaoCatalogo(
+    intervalo_segundos=float(os.getenv("CATALOGO_VERSAO_INTERVALO_SEGUNDOS", "1.0"))
+)
+cache_buscas = CacheRespostas(
+    max_itens=int(os.getenv("CACHE_BUSCA_MAX_ITENS", "1024")),
+    ttl_segundos=float(os.getenv("CACHE_BUSCA_TTL_SEGUNDOS", "60")),
+)
+# Facetas mudam só com o catálogo; o mesmo esquema de invalidação por versão vale
+# para elas. Como a versão já invalida as entradas, o TTL pode ser mais longo que o das buscas.
+cache_facetas = CacheRespostas(
+    max_itens=int(os.getenv("CACHE_FACETAS_MAX_ITENS", "256")),
+    ttl_segundos=float(os.getenv("CACHE_FACETAS_TTL_SEGUNDOS", "300")),
+)
+
+# --- Motor de busca ---
+# MOTOR_BUSCA=sql (padrão) consulta o banco a cada busca; MOTOR_BUSCA=memoria
+# carrega o catálogo em colunas do NumPy na inicialização e filtra em memória
+# (ver src/services/motor_memoria.py). As respostas são as mesmas nos dois modos.
+MOTOR_BUSCA = os.getenv("MOTOR_BUSCA", "sql")
+if MOTOR_BUSCA not in ("sql", "memoria"):
+    raise ValueError(f"MOTOR_BUSCA inválido: '{MOTOR_BUSCA}'. Use 'sql' ou 'memoria'.")
+motor_memoria: Optional[MotorBuscaMemoria] = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields) if MOTOR_BUSCA == "memoria" else None
+
 # --- Gerenciador de Lifespan para eventos de inicialização ---
 @asynccontextmanager
 async def lifespan(app_lifespan: FastAPI) -> AsyncGenerator[None, None]:
@@ -79,6 +397,11 @@ async def lifespan(app_lifespan: FastAPI) -> AsyncGenerator[None, None]:
     print("Verificando e criando tabelas do banco de dados, se necessário...")
     create_db_and_tables() # Garante que as tabelas existam
     print("Tabelas verificadas/criadas.")
+    if motor_memoria is not None:
+        print("Carregando o catálogo no motor de busca em memória...")
+        async with AsyncSessionLocal() as db:
+            await motor_memoria.sincronizar(db, await monitor_versao.versao_atual(db))
+        print(f"{motor_memoria.total} automóveis carregados em memória.")
     print("Servidor pronto para aceitar requisições.")
     yield
     print("Servidor FastAPI encerrando...")
@@ -90,35 +413,38 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan # Novo gerenciador de lifespan
 )
+app.add_middleware(CompressaoMiddleware, tamanho_minimo=int(os.getenv("COMPRESSAO_TAMANHO_MINIMO", "1000")))
 
 # --- Dependência para obter a sessão do banco de dados ---
-def get_db() -> Generator[Session, None, None]: # Corrigido o tipo de retorno
-    db = SessionLocal()
-    try:
+# A sessão é assíncrona: cada consulta é aguardada com 'await', liberando o
+# event loop para atender outras requisições enquanto o SQLite trabalha.
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# Fábrica de sessões para quem precisa abrir a própria sessão: uma resposta em
+# streaming continua lendo do banco depois que o endpoint retorna, quando a
+# sessão de get_db já foi fechada.
+def get_fabrica_sessoes() -> async_sessionmaker:
+    return AsyncSessionLocal
 
 # Removido o evento de startup antigo
 # @app.on_event("startup")
 # def on_startup(): ...
 
-# --- Endpoint da API ---
-@app.post("/api/v1/automoveis/buscar", response_model=MCPResponse, tags=["Automóveis"])
-async def buscar_automoveis(
-    mcp_request: MCPRequest = Body(default_factory=MCPRequest), # Garante default se corpo vazio
-    db: Session = Depends(get_db)
-):
-    query_base = select(AutomovelDB)
-    condicoes = []
+# --- Construção da consulta ---
+# Ordenação estável dos resultados; id_veiculo desempata carros com a mesma
+# marca/modelo/ano, o que é necessário para o cursor nunca pular nem repetir itens.
+ORDEM_RESULTADOS = (AutomovelDB.marca, AutomovelDB.modelo, AutomovelDB.ano_fabricacao.desc(), AutomovelDB.id_veiculo)
 
-    # Usar mcp_request.filtros que agora tem default_factory
-    filtros = mcp_request.filtros
+def construir_condicoes(filtros: Optional[FiltrosAutomovel]) -> list:
+    """Traduz os filtros da requisição em condições WHERE sobre AutomovelDB."""
+    condicoes = []
     if filtros: # filtros será uma instância de FiltrosAutomovel
         if filtros.marca:
-            condicoes.append(AutomovelDB.marca.ilike(f"%{filtros.marca}%"))
+            condicoes.extend(condicao_prefixo(AutomovelDB.marca_normalizada, filtros.marca))
         if filtros.modelo:
-            condicoes.append(AutomovelDB.modelo.ilike(f"%{filtros.modelo}%"))
+            condicoes.extend(condicao_prefixo(AutomovelDB.modelo_normalizado, filtros.modelo))
         if filtros.ano_min:
             condicoes.append(AutomovelDB.ano_fabricacao >= filtros.ano_min)
         if filtros.ano_max:
@@ -129,24 +455,373 @@ async def buscar_automoveis(
             condicoes.append(AutomovelDB.preco >= filtros.preco_min)
         if filtros.preco_max:
             condicoes.append(AutomovelDB.preco <= filtros.preco_max)
+    return condicoes
+
+def condicao_prefixo(coluna_normalizada, valor: str) -> list:
+    """
+    Busca por prefixo, sem diferenciar maiúsculas nem acentos ("volks" encontra
+    "Volkswagen"). Expressa como intervalo [prefixo, prefixo') sobre a coluna
+    normalizada, o que o banco resolve com um range scan no índice.
+    """
+    prefixo = normalizar_texto(valor)
+    if not prefixo:
+        return []
+    limite_superior = prefixo[:-1] + chr(ord(prefixo[-1]) + 1)
+    return [coluna_normalizada >= prefixo, coluna_normalizada < limite_superior]
+
+def condicao_apos_cursor(chave: tuple):
+    """Condição que seleciona as linhas posteriores à chave do cursor na ORDEM_RESULTADOS."""
+    marca, modelo, ano_fabricacao, id_veiculo = chave
+    return and_(
+        # Condição redundante, mas permite ao banco posicionar-se direto no índice por marca
+        AutomovelDB.marca >= marca,
+        or_(
+            AutomovelDB.marca > marca,
+            and_(AutomovelDB.marca == marca, AutomovelDB.modelo > modelo),
+            and_(AutomovelDB.marca == marca, AutomovelDB.modelo == modelo, AutomovelDB.ano_fabricacao < ano_fabricacao),
+            and_(AutomovelDB.marca == marca, AutomovelDB.modelo == modelo, AutomovelDB.ano_fabricacao == ano_fabricacao, AutomovelDB.id_veiculo > id_veiculo),
+        )
+    )
+
+# --- Endpoints da API ---
+@app.post("/api/v1/automoveis/buscar", response_model=MCPResponse, tags=["Automóveis"])
+async def buscar_automoveis(
+    mcp_request: MCPRequest = Body(default_factory=MCPRequest), # Garante default se corpo vazio
+    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(default=None),
+    accept: Optional[str] = Header(default=None)
+):
+    """
+    Busca automóveis. A resposta traz uma ETag; repetir a mesma busca com
+    'If-None-Match: <etag>' devolve 304 (sem corpo) enquanto o catálogo não mudar.
+    Com 'Accept: application/vnd.c2s.colunar+json' (ou 'application/msgpack'), a
+    lista de automóveis vem no formato colunar, bem mais compacto.
+    """
+    representacao = escolher_representacao(accept)
+    chave = chave_cache(mcp_request)
+    versao = await monitor_versao.versao_atual(db)
+    etag = calcular_etag(versao, chave + "|" + representacao)
+    if etag_confere(if_none_match, etag):
+        return resposta_nao_modificada(etag)
+    conteudo = await buscar_com_cache(db, mcp_request, versao, chave=chave, representacao=representacao)
+    return resposta_json(conteudo, etag, media_type=representacao, vary_accept=True)
+
+@app.post("/api/v1/automoveis/buscar/lote", response_model=MCPLoteResponse, tags=["Automóveis"])
+async def buscar_automoveis_em_lote(
+    lote: MCPLoteRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Várias buscas em uma só chamada (ex: todas as buscas salvas de um usuário).
+    Todas usam a mesma sessão e a mesma versão do catálogo; requisições repetidas
+    são executadas uma vez e buscas com os mesmos filtros compartilham a contagem,
+    venha ela do banco ou de uma resposta do cache.
+    """
+    versao = await monitor_versao.versao_atual(db)
+    conteudos: Dict[str, bytes] = {} # chave_cache -> resposta serializada
+    contagens: Dict[tuple, int] = {}
+    for mcp_request in lote.requisicoes:
+        chave = chave_cache(mcp_request)
+        if chave not in conteudos:
+            conteudos[chave] = await buscar_com_cache(db, mcp_request, versao, chave=chave, contagens=contagens)
+    # As respostas individuais já estão serializadas (e possivelmente vieram do
+    # cache): o corpo do lote é montado concatenando os bytes
+    resultados = b",".join(conteudos[chave_cache(mcp_request)] for mcp_request in lote.requisicoes)
+    cabecalho = serializar_resposta({"sucesso": True, "mensagem": f"{len(lote.requisicoes)} buscas realizadas com sucesso."})
+    conteudo = cabecalho[:-1] + b',"resultados":[' + resultados + b"]}"
+    return Response(content=conteudo, media_type="application/json")
+
+async def buscar_com_cache(db: AsyncSession, mcp_request: MCPRequest, versao: int, chave: Optional[str] = None,
+                           contagens: Optional[Dict[tuple, int]] = None, representacao: str = TIPO_JSON) -> bytes:
+    """Resposta serializada da busca, do cache de respostas ou executando-a na 'versao' do catálogo."""
+    chave_representacao = (chave or chave_cache(mcp_request)) + "|" + representacao
+    conteudo = cache_buscas.obter(chave_representacao, versao)
+    if conteudo is None:
+        if motor_memoria is not None:
+            await motor_memoria.sincronizar(db, versao)
+        # Serializamos uma única vez; os mesmos bytes são devolvidos nos acertos do cache
+        conteudo = codificar_resposta(await executar_busca(db, mcp_request, motor=motor_memoria, contagens=contagens), representacao)
+        cache_buscas.guardar(chave_representacao, versao, conteudo)
+    elif contagens is not None and representacao == TIPO_JSON:
+        # Acerto do cache em um lote: o total da resposta guardada (da mesma versão
+        # do catálogo) vale para as próximas buscas do lote com os mesmos filtros
+        lembrar_contagem(contagens, mcp_request, orjson.loads(conteudo)["dados"])
+    return conteudo
+
+@app.post("/api/v1/automoveis/facetas", response_model=MCPFacetasResponse, tags=["Automóveis"])
+async def facetas_automoveis(
+    requisicao: MCPFacetasRequest = Body(default_factory=MCPFacetasRequest),
+    db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Header(default=None)
+):
+    """
+    Contagens por marca, modelo, combustível e transmissão e histogramas de preço
+    e ano dos automóveis que atendem aos filtros (ex: "Fiat (123), Volkswagen (98)").
+    """
+    chave = "facetas|" + requisicao.model_dump_json()
+    versao = await monitor_versao.versao_atual(db)
+    etag = calcular_etag(versao, chave)
+    if etag_confere(if_none_match, etag):
+        return resposta_nao_modificada(etag)
+    conteudo = cache_facetas.obter(chave, versao)
+    if conteudo is None:
+        if motor_memoria is not None:
+            await motor_memoria.sincronizar(db, versao)
+        conteudo = serializar_resposta(await calcular_facetas(db, requisicao, motor=motor_memoria))
+        cache_facetas.guardar(chave, versao, conteudo)
+    return resposta_json(conteudo, etag)
+
+def expressao_faixa_preco(dialeto: str, largura: float):
+    """
+    Índice da faixa de preço (floor(preco / largura)). O SQLite só tem FLOOR quando
+    compilado com as funções matemáticas; como os preços não são negativos, truncar
+    com CAST dá o mesmo resultado. No PostgreSQL o CAST arredonda, então lá usamos FLOOR.
+    """
+    if dialeto == "postgresql":
+        return func.floor(AutomovelDB.preco / largura)
+    return cast(AutomovelDB.preco / largura, Integer)
+
+async def calcular_facetas(db: AsyncSession, requisicao: MCPFacetasRequest, motor: Optional[MotorBuscaMemoria] = None) -> Dict[str, Any]:
+    """
+    Uma única agregação sobre as linhas filtradas, por (marca, modelo, combustível,
+    transmissão, faixa de ano, faixa de preço): as quatro facetas categóricas e os
+    dois histogramas saem da soma dos grupos, com uma só passada pela tabela.
+    """
+    largura_preco, largura_ano = requisicao.largura_faixa_preco, requisicao.largura_faixa_ano
+    if motor is not None:
+        grupos = motor.agrupar(motor.mascara(requisicao.filtros), largura_preco, largura_ano)
+    else:
+        condicoes = construir_condicoes(requisicao.filtros)
+        faixa_ano = AutomovelDB.ano_fabricacao // largura_ano
+        faixa_preco = expressao_faixa_preco(db.get_bind().dialect.name, largura_preco)
+        colunas_grupo = (AutomovelDB.marca, AutomovelDB.modelo, AutomovelDB.tipo_combustivel, AutomovelDB.transmissao, faixa_ano, faixa_preco)
+        grupos = (await db.execute(select(*colunas_grupo, func.count()).where(*condicoes).group_by(*colunas_grupo))).all()
+
+    facetas = {campo: {} for campo in ("marca", "modelo", "tipo_combustivel", "transmissao")}
+    histograma_ano: Dict[int, int] = {}
+    histograma_preco: Dict[int, int] = {}
+    for *valores, faixa_ano, faixa_preco, quantidade in grupos:
+        for campo, valor in zip(facetas, valores):
+            valor = valor.value if isinstance(valor, Enum) else valor
+            facetas[campo][valor] = facetas[campo].get(valor, 0) + quantidade
+        histograma_ano[int(faixa_ano)] = histograma_ano.get(int(faixa_ano), 0) + quantidade
+        histograma_preco[int(faixa_preco)] = histograma_preco.get(int(faixa_preco), 0) + quantidade
+
+    def contagens(por_valor: Dict[str, int]) -> list:
+        ordenados = sorted(por_valor.items(), key=lambda item: (-item[1], item[0]))
+        return [{"valor": valor, "quantidade": quantidade} for valor, quantidade in ordenados]
+
+    def histograma(por_faixa: Dict[int, int], largura: float) -> list:
+        return [{"inicio": faixa * largura, "fim": (faixa + 1) * largura, "quantidade": quantidade} for faixa, quantidade in sorted(por_faixa.items())]
+
+    # Mesma estrutura (e ordem de campos) de MCPFacetasResponse
+    return {
+        "sucesso": True,
+        "mensagem": "Facetas calculadas com sucesso.",
+        "dados": {
+            "total_encontrado": sum(histograma_ano.values()),
+            **{campo: contagens(por_valor) for campo, por_valor in facetas.items()},
+            "preco": histograma(histograma_preco, float(largura_preco)),
+            "ano_fabricacao": histograma(histograma_ano, float(largura_ano)),
+        },
+        "erros": None,
+    }
+
+@app.get("/api/v1/automoveis/resumo", response_model=MCPResumoResponse, tags=["Automóveis"])
+async def resumo_catalogo(db: AsyncSession = Depends(get_db), if_none_match: Optional[str] = Header(default=None)):
+    """
+    Visão geral do catálogo inteiro para painéis: contagens por marca e combustível
+    e preços por modelo. Lida da tabela 'resumo_catalogo', sem varrer 'automoveis'.
+    """
+    versao = await monitor_versao.versao_atual(db)
+    etag = calcular_etag(versao, "resumo")
+    if etag_confere(if_none_match, etag):
+        return resposta_nao_modificada(etag)
+    conteudo = cache_facetas.obter("resumo", versao)
+    if conteudo is None:
+        conteudo = serializar_resposta(await montar_resumo_catalogo(db))
+        cache_facetas.guardar("resumo", versao, conteudo)
+    return resposta_json(conteudo, etag)
+
+async def montar_resumo_catalogo(db: AsyncSession) -> Dict[str, Any]:
+    grupos = (await db.execute(select(ResumoCatalogoDB).order_by(ResumoCatalogoDB.marca, ResumoCatalogoDB.modelo))).scalars().all()
+    por_marca: Dict[str, int] = {}
+    por_combustivel: Dict[str, int] = {}
+    por_modelo: Dict[tuple, list] = {} # (marca, modelo) -> [quantidade, min, max, soma]
+    for grupo in grupos:
+        por_marca[grupo.marca] = por_marca.get(grupo.marca, 0) + grupo.quantidade
+        por_combustivel[grupo.tipo_combustivel.value] = por_combustivel.get(grupo.tipo_combustivel.value, 0) + grupo.quantidade
+        atual = por_modelo.setdefault((grupo.marca, grupo.modelo), [0, grupo.preco_min, grupo.preco_max, 0.0])
+        atual[0] += grupo.quantidade
+        atual[1] = min(atual[1], grupo.preco_min)
+        atual[2] = max(atual[2], grupo.preco_max)
+        atual[3] += grupo.preco_soma
+
+    def contagens(por_valor: Dict[str, int]) -> list:
+        return [{"valor": valor, "quantidade": quantidade} for valor, quantidade in sorted(por_valor.items(), key=lambda item: (-item[1], item[0]))]
+
+    return {
+        "sucesso": True,
+        "mensagem": "Resumo do catálogo.",
+        "dados": {
+            "total": sum(por_marca.values()),
+            "por_marca": contagens(por_marca),
+            "por_combustivel": contagens(por_combustivel),
+            "por_modelo": [
+                {"marca": marca, "modelo": modelo, "quantidade": quantidade, "preco_min": minimo, "preco_max": maximo, "preco_medio": round(soma / quantidade, 2)}
+                for (marca, modelo), (quantidade, minimo, maximo, soma) in por_modelo.items()
+            ],
+        },
+        "erros": None,
+    }
+
+class FormatoExportacaoEnum(str, Enum):
+    NDJSON = "ndjson" # Um objeto JSON por linha, nos mesmos campos da busca
+    CSV = "csv"
+
+# Linhas lidas do banco por vez na exportação (o restante fica no cursor do banco)
+TAMANHO_LOTE_EXPORTACAO = int(os.getenv("TAMANHO_LOTE_EXPORTACAO", "1000"))
+
+@app.post("/api/v1/automoveis/exportar", tags=["Automóveis"])
+async def exportar_automoveis(
+    filtros: Optional[FiltrosAutomovel] = Body(default=None),
+    formato: FormatoExportacaoEnum = Query(FormatoExportacaoEnum.NDJSON),
+    fabrica_sessoes: async_sessionmaker = Depends(get_fabrica_sessoes)
+):
+    """
+    Exporta todos os automóveis que atendem aos filtros, sem paginação, na ordem
+    da busca. As linhas são lidas do banco e enviadas em lotes, então a memória
+    usada não cresce com o tamanho do resultado.
+    """
+    if formato == FormatoExportacaoEnum.CSV:
+        return StreamingResponse(
+            gerar_exportacao(fabrica_sessoes, filtros, formato),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="automoveis.csv"'},
+        )
+    return StreamingResponse(gerar_exportacao(fabrica_sessoes, filtros, formato), media_type="application/x-ndjson")
+
+async def gerar_exportacao(fabrica_sessoes: async_sessionmaker, filtros: Optional[FiltrosAutomovel], formato: FormatoExportacaoEnum) -> AsyncGenerator[bytes, None]:
+    consulta = (
+        select(*COLUNAS_AUTOMOVEL)
+        .where(*construir_condicoes(filtros))
+        .order_by(*ORDEM_RESULTADOS)
+        .execution_options(yield_per=TAMANHO_LOTE_EXPORTACAO)
+    )
+    if formato == FormatoExportacaoEnum.CSV:
+        yield formatar_csv([CAMPOS_AUTOMOVEL])
+    async with fabrica_sessoes() as db:
+        resultado = await db.stream(consulta)
+        async for lote in resultado.partitions():
+            if formato == FormatoExportacaoEnum.CSV:
+                yield formatar_csv([valor_csv(valor) for valor in linha] for linha in lote)
+            else:
+                yield b"".join(orjson.dumps(dict(zip(CAMPOS_AUTOMOVEL, linha))) + b"\n" for linha in lote)
+
+def formatar_csv(linhas) -> bytes:
+    saida = io.StringIO()
+    csv.writer(saida, lineterminator="\n").writerows(linhas)
+    return saida.getvalue().encode("utf-8")
+
+def valor_csv(valor: Any) -> Any:
+    # Mesmas representações do JSON: valor do Enum e datas em ISO 8601
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    return valor
+
+@app.get("/api/v1/diagnostico/cache", tags=["Diagnóstico"])
+async def estatisticas_cache():
+    """Contadores do cache de buscas (acertos, falhas, evicções), para dimensioná-lo."""
+    return cache_buscas.estatisticas()
+
+@app.get("/api/v1/diagnostico/motor", tags=["Diagnóstico"])
+async def estatisticas_motor():
+    """Motor de busca em uso e, no modo 'memoria', o estado das colunas carregadas."""
+    return {"motor": MOTOR_BUSCA, "memoria": motor_memoria.estatisticas() if motor_memoria is not None else None}
+
+async def executar_busca(db: AsyncSession, mcp_request: MCPRequest, motor: Optional[MotorBuscaMemoria] = None, contagens: Optional[Dict[tuple, int]] = None) -> Dict[str, Any]:
+    """
+    Executa a busca e monta a resposta, sem passar pelo cache.
+    Com 'motor' (já sincronizado), filtra as colunas em memória em vez de consultar o banco.
+    'contagens' guarda os totais já calculados (filtros + modo de contagem), para que
+    buscas de um mesmo lote que só diferem na paginação contem uma única vez.
+    Retorna o MCPResponse já como dicionário pronto para serializar_resposta().
+    """
+    paginacao = mcp_request.paginacao # Já tem default_factory
+    chave_cursor = decodificar_cursor(paginacao.cursor) if paginacao.cursor else None
+    # Sem cursor, a página é posicionada por OFFSET
+    deslocamento = 0 if chave_cursor else (paginacao.pagina - 1) * paginacao.itens_por_pagina
+    # Buscamos um item a mais apenas para saber se existe uma próxima página
+    limite = paginacao.itens_por_pagina + 1
+
+    chave_contagem = chave_da_contagem(mcp_request)
+    contagem_conhecida = contagens is not None and chave_contagem in contagens
+    contar = paginacao.contagem != ModoContagemEnum.NENHUMA and not contagem_conhecida
+
+    if motor is not None:
+        mascara = motor.mascara(mcp_request.filtros)
+        total_encontrado = motor.contar(mascara) if contar else None
+        resultados_db = motor.pagina(mascara, chave_cursor, deslocamento, limite)
+    else:
+        total_encontrado, resultados_db = await consultar_banco(db, mcp_request.filtros, paginacao, chave_cursor, deslocamento, limite, contar=contar)
+
+    if contagem_conhecida:
+        total_encontrado = contagens[chave_contagem]
+    elif contar and contagens is not None:
+        contagens[chave_contagem] = total_encontrado
+
+    total_excede_limite = False
+    if paginacao.contagem == ModoContagemEnum.LIMITADA and total_encontrado > paginacao.limite_contagem:
+        total_encontrado = paginacao.limite_contagem
+        total_excede_limite = True
+
+    return montar_resposta(resultados_db, paginacao, total_encontrado, total_excede_limite)
+
+def chave_da_contagem(mcp_request: MCPRequest) -> tuple:
+    """Chave de 'contagens': buscas com os mesmos filtros e o mesmo modo de contagem têm o mesmo total."""
+    paginacao = mcp_request.paginacao
+    limite_contagem = paginacao.limite_contagem if paginacao.contagem == ModoContagemEnum.LIMITADA else None
+    return chave_filtros(mcp_request.filtros), paginacao.contagem, limite_contagem
+
+def lembrar_contagem(contagens: Dict[tuple, int], mcp_request: MCPRequest, dados: Dict[str, Any]) -> None:
+    """Guarda em 'contagens' o total de uma resposta já pronta (ex: vinda do cache)."""
+    if mcp_request.paginacao.contagem == ModoContagemEnum.NENHUMA:
+        return
+    total = dados["total_encontrado"]
+    # Na contagem 'limitada' o banco conta até limite + 1 linhas; a resposta mostra o teto
+    contagens.setdefault(chave_da_contagem(mcp_request), total + 1 if dados["total_excede_limite"] else total)
+
+async def consultar_banco(db: AsyncSession, filtros: Optional[FiltrosAutomovel], paginacao: Paginacao, chave_cursor: Optional[tuple], deslocamento: int, limite: int, contar: bool = True) -> tuple:
+    """Contagem (conforme paginacao.contagem, se 'contar') e linhas da página, direto do banco."""
+    query_base = select(*COLUNAS_AUTOMOVEL)
+    condicoes = construir_condicoes(filtros)
 
     if condicoes:
         query_base = query_base.where(and_(*condicoes))
 
     try:
-        # Contagem total
-        count_query = select(func.count()).select_from(query_base.order_by(None).alias("subquery_for_count"))
-        total_encontrado = db.scalar(count_query) or 0 # Garante 0 se for None
-
-        # Paginação
-        paginacao = mcp_request.paginacao # Já tem default_factory
-        offset = (paginacao.pagina - 1) * paginacao.itens_por_pagina
-        
-        # Ordenação (pode ser parametrizada no futuro)
-        query_final = query_base.order_by(AutomovelDB.marca, AutomovelDB.modelo, AutomovelDB.ano_fabricacao.desc())
-        query_final = query_final.offset(offset).limit(paginacao.itens_por_pagina)
-        
-        resultados_db = db.execute(query_final).scalars().all()
+        # Contagem total, conforme o modo pedido
+        total_encontrado = None
+        if contar and paginacao.contagem == ModoContagemEnum.EXATA:
+            count_query = select(func.count()).select_from(AutomovelDB).where(*condicoes)
+            total_encontrado = await db.scalar(count_query) or 0 # Garante 0 se for None
+        elif contar and paginacao.contagem == ModoContagemEnum.LIMITADA:
+            # Conta no máximo limite+1 linhas: o banco para assim que passa do teto
+            amostra = select(literal(1)).select_from(AutomovelDB).where(*condicoes).limit(paginacao.limite_contagem + 1)
+            total_encontrado = await db.scalar(select(func.count()).select_from(amostra.subquery())) or 0
+
+        # Paginação: por cursor (keyset) quando informado, senão por OFFSET
+        query_final = query_base.order_by(*ORDEM_RESULTADOS)
+        if chave_cursor:
+            query_final = query_final.where(condicao_apos_cursor(chave_cursor))
+        else:
+            query_final = query_final.offset(deslocamento)
+        query_final = query_final.limit(limite)
+
+        # Tuplas simples de colunas: sem montar objetos do ORM nem revalidar cada linha
+        resultados_db = (await db.execute(query_final)).all()
 
     except Exception as e:
         print(f"Erro ao consultar o banco: {e}")
@@ -161,19 +836,36 @@ async def buscar_automoveis(
         # Mas deixar o FastAPI tratar como 500 com o traceback no log do servidor é bom para debug.
         raise # Re-levanta a exceção para FastAPI tratar como 500
 
-    automoveis_resposta = [AutomovelRespostaParaAPI.model_validate(auto_db) for auto_db in resultados_db]
-    
-    total_paginas = (total_encontrado + paginacao.itens_por_pagina - 1) // paginacao.itens_por_pagina if total_encontrado > 0 else 0
+    return total_encontrado, resultados_db
 
-    dados_resposta = MCPDadosResposta(
-        automoveis=automoveis_resposta,
-        total_encontrado=total_encontrado,
-        pagina_atual=paginacao.pagina,
-        total_paginas=max(0, total_paginas) # Garante que total_paginas não seja negativo
-    )
+def montar_resposta(resultados_db: list, paginacao: Paginacao, total_encontrado: Optional[int], total_excede_limite: bool) -> Dict[str, Any]:
+    """Monta o dicionário do MCPResponse a partir das linhas (até itens_por_pagina + 1) da página."""
+    ha_proxima_pagina = len(resultados_db) > paginacao.itens_por_pagina
+    automoveis_resposta = [dict(zip(CAMPOS_AUTOMOVEL, linha)) for linha in resultados_db[:paginacao.itens_por_pagina]]
+
+    proximo_cursor = None
+    if ha_proxima_pagina:
+        ultimo = automoveis_resposta[-1]
+        proximo_cursor = codificar_cursor(ultimo["marca"], ultimo["modelo"], ultimo["ano_fabricacao"], ultimo[CAMPO_ID])
+
+    total_paginas = None
+    if total_encontrado is not None and not total_excede_limite:
+        total_paginas = (total_encontrado + paginacao.itens_por_pagina - 1) // paginacao.itens_por_pagina if total_encontrado > 0 else 0
+        total_paginas = max(0, total_paginas) # Garante que total_paginas não seja negativo
+
+    # Mesma estrutura (e ordem de campos) de MCPDadosResposta / MCPResponse
+    dados_resposta = {
+        "automoveis": automoveis_resposta,
+        "total_encontrado": total_encontrado,
+        "pagina_atual": paginacao.pagina if paginacao.cursor is None else None,
+        "total_paginas": total_paginas,
+        "total_excede_limite": total_excede_limite,
+        "proximo_cursor": proximo_cursor,
+    }
 
-    return MCPResponse(
-        sucesso=True,
-        mensagem="Busca realizada com sucesso." if automoveis_resposta or total_encontrado == 0 else "Nenhum automóvel encontrado com os filtros fornecidos na página atual, mas existem resultados em outras páginas.",
-        dados=dados_resposta
-    )
\ No newline at end of file
+    return {
+        "sucesso": True,
+        "mensagem": "Busca realizada com sucesso." if automoveis_resposta or not total_encontrado else "Nenhum automóvel encontrado com os filtros fornecidos na página atual, mas existem resultados em outras páginas.",
+        "dados": dados_resposta,
+        "erros": None,
+    }
@@ -0,0 +1,294 @@
+# src/services/motor_memoria.py
+import asyncio
+import bisect
+import uuid
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import AutomovelDB, normalizar_texto
+
+# Motor de busca em memória (MOTOR_BUSCA=memoria no servidor).
+# O catálogo inteiro fica em arrays do NumPy, uma por coluna: os filtros viram
+# máscaras booleanas calculadas de uma vez sobre todas as linhas, e uma
+# permutação pré-ordenada (na mesma ordem de ORDEM_RESULTADOS) entrega as
+# páginas sem ordenar nada por requisição. O banco continua sendo a fonte da
+# verdade: o motor é recarregado de forma incremental quando a versão do
+# catálogo muda, a partir da maior data_cadastro já carregada (marca d'água).
+
+# Colunas guardadas como códigos inteiros + dicionário de valores
+COLUNAS_CATEGORICAS = ("marca", "modelo", "cor", "tipo_combustivel", "transmissao")
+# Colunas cuja busca é por prefixo normalizado (ver normalizar_texto)
+COLUNAS_PREFIXO = ("marca", "modelo")
+TIPOS_NUMERICOS = {
+    "ano_fabricacao": np.int32,
+    "ano_modelo": np.int32,
+    "quilometragem": np.int64,
+    "numero_portas": np.int8,
+    "motorizacao": np.float64,
+    "preco": np.float64,
+}
+_MASCARA_64_BITS = (1 << 64) - 1
+# Chave de ordenação de uma linha, comparada campo a campo (como a tupla de ORDEM_RESULTADOS)
+_TIPO_CHAVE = np.dtype([("marca", np.int32), ("modelo", np.int32), ("ano", np.int32), ("id_alto", np.uint64), ("id_baixo", np.uint64)])
+
+class DicionarioValores:
+    """Códigos inteiros (na ordem de chegada) para os valores de uma coluna categórica."""
+    def __init__(self, normalizar: bool = False):
+        self.valores: list = []
+        self.normalizados: List[str] = [] # Preenchido só quando normalizar=True
+        self.postos = np.empty(0, dtype=np.int32) # Posição de cada código na ordem crescente dos valores
+        self._codigos: dict = {}
+        self._normalizar = normalizar
+
+    def codificar(self, valores: Sequence) -> np.ndarray:
+        if not valores:
+            return np.empty(0, dtype=np.int32)
+        # O dicionário Python só é consultado uma vez por valor distinto
+        unicos, inversos = np.unique(np.array(valores, dtype=object), return_inverse=True)
+        novos = [valor for valor in unicos.tolist() if valor not in self._codigos]
+        for valor in novos:
+            self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+            if self._normalizar:
+                self.normalizados.append(normalizar_texto(valor))
+        if novos:
+            ordem = sorted(range(len(self.valores)), key=self.valores.__getitem__)
+            self.postos = np.empty(len(self.valores), dtype=np.int32)
+            self.postos[ordem] = np.arange(len(self.valores), dtype=np.int32)
+        mapa = np.array([self._codigos[valor] for valor in unicos.tolist()], dtype=np.int32)
+        return mapa[inversos.reshape(-1)]
+
+    def codigo(self, valor) -> Optional[int]:
+        return self._codigos.get(valor)
+
+    def codigos_com_prefixo(self, prefixo: str) -> np.ndarray:
+        return np.array([codigo for codigo, normalizado in enumerate(self.normalizados) if normalizado.startswith(prefixo)], dtype=np.int32)
+
+class MotorBuscaMemoria:
+    """
+    Responde às buscas do endpoint a partir de colunas em memória.
+
+    'campos' são os nomes das colunas de AutomovelDB, na ordem em que as linhas
+    devem ser devolvidas (a mesma de COLUNAS_AUTOMOVEL no servidor).
+    """
+    def __init__(self, campos: Sequence[str]):
+        self.campos = tuple(campos)
+        self.versao: Optional[int] = None # Versão do catálogo refletida nas colunas
+        self.total = 0
+        self.marca_dagua = None # Maior data_cadastro carregada
+        self.recargas_completas = 0
+        self.atualizacoes_incrementais = 0
+        self._ids_na_marca_dagua: set = set() # Ids já carregados com data_cadastro == marca_dagua
+        self._trava = asyncio.Lock()
+        self._limpar()
+
+    def _limpar(self) -> None:
+        self._dicionarios = {nome: DicionarioValores(normalizar=nome in COLUNAS_PREFIXO) for nome in COLUNAS_CATEGORICAS}
+        self._colunas: Dict[str, np.ndarray] = self._para_colunas([])
+        self._ordem = np.empty(0, dtype=np.int64)
+        self.total = 0
+        self.marca_dagua = None
+        self._ids_na_marca_dagua = set()
+
+    # --- Carga e atualização ---
+
+    async def sincronizar(self, db: AsyncSession, versao: int) -> None:
+        """Atualiza as colunas se 'versao' (a versão atual do catálogo) for diferente da carregada."""
+        if versao == self.versao:
+            return
+        async with self._trava:
+            if versao == self.versao: # Outra requisição já atualizou enquanto esperávamos
+                return
+            if self.versao is None:
+                await self._recarregar(db)
+            else:
+                await self._atualizar(db)
+            self.versao = versao
+
+    async def _atualizar(self, db: AsyncSession) -> None:
+        condicoes = [AutomovelDB.data_cadastro >= self.marca_dagua] if self.marca_dagua is not None else []
+        novas = [linha for linha in await self._ler(db, *condicoes) if linha.id_veiculo not in self._ids_na_marca_dagua]
+        total_banco = await db.scalar(select(func.count()).select_from(AutomovelDB))
+        # Só inserções com data_cadastro a partir da marca d'água explicam o novo total.
+        # Remoções, alterações ou cargas com datas antigas (ex: populate_db --semente)
+        # não aparecem na leitura incremental: nesses casos recarregamos tudo.
+        if novas and self.total + len(novas) == total_banco:
+            self._anexar(novas)
+            self.atualizacoes_incrementais += 1
+        else:
+            await self._recarregar(db)
+
+    async def _recarregar(self, db: AsyncSession) -> None:
+        linhas = await self._ler(db)
+        self._limpar()
+        self._anexar(linhas)
+        self.recargas_completas += 1
+
+    async def _ler(self, db: AsyncSession, *condicoes) -> list:
+        consulta = select(*(getattr(AutomovelDB, campo) for campo in self.campos)).where(*condicoes)
+        return (await db.execute(consulta)).all()
+
+    def _para_colunas(self, linhas: list) -> Dict[str, np.ndarray]:
+        brutas = dict(zip(self.campos, zip(*linhas))) if linhas else {campo: () for campo in self.campos}
+        colunas = {}
+        for campo, valores in brutas.items():
+            if campo in COLUNAS_CATEGORICAS:
+                colunas[campo] = self._dicionarios[campo].codificar(valores)
+            elif campo in TIPOS_NUMERICOS:
+                colunas[campo] = np.array(valores, dtype=TIPOS_NUMERICOS[campo])
+            elif campo == "id_veiculo":
+                # UUID em duas metades de 64 bits: comparar (alto, baixo) equivale a comparar os bytes
+                inteiros = [id_veiculo.int for id_veiculo in valores]
+                colunas["id_alto"] = np.array([i >> 64 for i in inteiros], dtype=np.uint64)
+                colunas["id_baixo"] = np.array([i & _MASCARA_64_BITS for i in inteiros], dtype=np.uint64)
+            elif campo == "data_cadastro":
+                colunas[campo] = np.array(valores, dtype="datetime64[us]")
+            else:
+                colunas[campo] = np.array(valores, dtype=object)
+        return colunas
+
+    def _anexar(self, linhas: list) -> None:
+        if not linhas:
+            return
+        inicio = self.total
+        novas = self._para_colunas(linhas)
+        self._colunas = {nome: np.concatenate((self._colunas[nome], novas[nome])) for nome in novas}
+        self.total += len(linhas)
+
+        datas = novas["data_cadastro"]
+        maior_data = datas.max().item()
+        ids_na_maior = {uuid.UUID(int=(alto << 64) | baixo) for alto, baixo in zip(
+            novas["id_alto"][datas == datas.max()].tolist(), novas["id_baixo"][datas == datas.max()].tolist())}
+        if self.marca_dagua is None or maior_data > self.marca_dagua:
+            self.marca_dagua, self._ids_na_marca_dagua = maior_data, ids_na_maior
+        elif maior_data == self.marca_dagua:
+            self._ids_na_marca_dagua |= ids_na_maior
+
+        # Só as linhas novas são ordenadas; depois são intercaladas na ordem já
+        # existente com uma busca binária. Valores novos nos dicionários mudam os
+        # postos, mas não a ordem relativa dos antigos, então _ordem continua válida.
+        indices_novos = np.arange(inicio, self.total)
+        chaves_novas = self._chaves(indices_novos)
+        ordem_novas = np.lexsort([chaves_novas[campo] for campo in reversed(_TIPO_CHAVE.names)])
+        indices_novos, chaves_novas = indices_novos[ordem_novas], chaves_novas[ordem_novas]
+        if len(self._ordem) == 0:
+            self._ordem = indices_novos
+        else:
+            posicoes = np.searchsorted(self._chaves(self._ordem), chaves_novas, side="right")
+            self._ordem = np.insert(self._ordem, posicoes, indices_novos)
+
+    def _chaves(self, indices: np.ndarray) -> np.ndarray:
+        colunas = self._colunas
+        chaves = np.empty(len(indices), dtype=_TIPO_CHAVE)
+        chaves["marca"] = self._dicionarios["marca"].postos[colunas["marca"][indices]]
+        chaves["modelo"] = self._dicionarios["modelo"].postos[colunas["modelo"][indices]]
+        chaves["ano"] = -colunas["ano_fabricacao"][indices]
+        chaves["id_alto"] = colunas["id_alto"][indices]
+        chaves["id_baixo"] = colunas["id_baixo"][indices]
+        return chaves
+
+    # --- Consulta ---
+
+    def mascara(self, filtros) -> Optional[np.ndarray]:
+        """Máscara das linhas que atendem 'filtros' (FiltrosAutomovel); None = todas."""
+        if not filtros:
+            return None
+        colunas = self._colunas
+        condicoes = []
+        for campo in COLUNAS_PREFIXO:
+            valor = getattr(filtros, campo)
+            prefixo = normalizar_texto(valor) if valor else ""
+            if prefixo: # Mesma regra de condicao_prefixo: prefixo vazio não filtra
+                condicoes.append(np.isin(colunas[campo], self._dicionarios[campo].codigos_com_prefixo(prefixo)))
+        if filtros.ano_min:
+            condicoes.append(colunas["ano_fabricacao"] >= filtros.ano_min)
+        if filtros.ano_max:
+            condicoes.append(colunas["ano_fabricacao"] <= filtros.ano_max)
+        if filtros.tipo_combustivel:
+            codigo = self._dicionarios["tipo_combustivel"].codigo(filtros.tipo_combustivel)
+            condicoes.append(colunas["tipo_combustivel"] == codigo if codigo is not None else np.zeros(self.total, dtype=bool))
+        if filtros.preco_min:
+            condicoes.append(colunas["preco"] >= filtros.preco_min)
+        if filtros.preco_max:
+            condicoes.append(colunas["preco"] <= filtros.preco_max)
+        if not condicoes:
+            return None
+        resultado = condicoes[0]
+        for condicao in condicoes[1:]:
+            resultado &= condicao
+        return resultado
+
+    def contar(self, mascara: Optional[np.ndarray]) -> int:
+        return self.total if mascara is None else int(np.count_nonzero(mascara))
+
+    def pagina(self, mascara: Optional[np.ndarray], apos_chave: Optional[tuple], deslocamento: int, limite: int) -> List[tuple]:
+        """
+        Linhas (tuplas na ordem de 'campos') da página pedida, na ordem de ORDEM_RESULTADOS.
+        'apos_chave' é a chave de um cursor (marca, modelo, ano_fabricacao, id_veiculo).
+        """
+        ordem = self._ordem
+        if apos_chave is not None:
+            ordem = ordem[self._posicao_apos(apos_chave):]
+        if mascara is not None:
+            ordem = ordem[mascara[ordem]]
+        return self._linhas(ordem[deslocamento:deslocamento + limite])
+
+    def agrupar(self, mascara: Optional[np.ndarray], largura_preco: float, largura_ano: int) -> list:
+        """
+        Contagens das linhas da máscara no formato da agregação SQL das facetas:
+        [(marca, modelo, tipo_combustivel, transmissao, faixa_ano, faixa_preco, quantidade)].
+        """
+        colunas = self._colunas
+        selecao = slice(None) if mascara is None else mascara
+        campos = ("marca", "modelo", "tipo_combustivel", "transmissao")
+        chaves = np.stack((
+            *(colunas[campo][selecao].astype(np.int64) for campo in campos),
+            colunas["ano_fabricacao"][selecao].astype(np.int64) // largura_ano,
+            np.floor(colunas["preco"][selecao] / largura_preco).astype(np.int64),
+        ))
+        unicos, quantidades = np.unique(chaves, axis=1, return_counts=True)
+        return [
+            (*(self._dicionarios[campo].valores[codigo] for campo, codigo in zip(campos, combinacao[:4])), *combinacao[4:], quantidade)
+            for *combinacao, quantidade in zip(*unicos.tolist(), quantidades.tolist())
+        ]
+
+    def _chave_ordenacao(self, indice) -> tuple:
+        colunas = self._colunas
+        return (
+            self._dicionarios["marca"].valores[colunas["marca"][indice]],
+            self._dicionarios["modelo"].valores[colunas["modelo"][indice]],
+            -int(colunas["ano_fabricacao"][indice]),
+            int(colunas["id_alto"][indice]),
+            int(colunas["id_baixo"][indice]),
+        )
+
+    def _posicao_apos(self, chave: tuple) -> int:
+        marca, modelo, ano_fabricacao, id_veiculo = chave
+        alvo = (marca, modelo, -ano_fabricacao, id_veiculo.int >> 64, id_veiculo.int & _MASCARA_64_BITS)
+        return bisect.bisect_right(self._ordem, alvo, key=self._chave_ordenacao)
+
+    def _linhas(self, indices: np.ndarray) -> List[tuple]:
+        colunas = []
+        for campo in self.campos:
+            if campo in COLUNAS_CATEGORICAS:
+                valores = self._dicionarios[campo].valores
+                colunas.append([valores[codigo] for codigo in self._colunas[campo][indices].tolist()])
+            elif campo == "id_veiculo":
+                colunas.append([uuid.UUID(int=(alto << 64) | baixo) for alto, baixo in zip(
+                    self._colunas["id_alto"][indices].tolist(), self._colunas["id_baixo"][indices].tolist())])
+            else:
+                # tolist() devolve tipos nativos (int, float, datetime), como as linhas do banco
+                colunas.append(self._colunas[campo][indices].tolist())
+        return list(zip(*colunas))
+
+    def estatisticas(self) -> Dict[str, object]:
+        return {
+            "linhas": self.total,
+            "versao": self.versao,
+            "marca_dagua": self.marca_dagua.isoformat() if self.marca_dagua else None,
+            "recargas_completas": self.recargas_completas,
+            "atualizacoes_incrementais": self.atualizacoes_incrementais,
+        }
@@ -0,0 +1,12 @@
+# tests/agent/conftest.py
+import pytest
+
+from src.agent.cache_extracao import CacheExtracao
+
+@pytest.fixture(autouse=True)
+def cache_extracao_temporario(tmp_path, monkeypatch):
+    """Cada teste usa um cache de extrações vazio, fora de ./data."""
+    cache = CacheExtracao(str(tmp_path / "cache_extracao.db"))
+    monkeypatch.setattr("src.agent.terminal_agent.obter_cache_extracao", lambda: cache)
+    yield cache
+    cache.fechar()
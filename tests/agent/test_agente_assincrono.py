@@ -0,0 +1,99 @@
+# tests/agent/test_agente_assincrono.py
+import asyncio
+import json
+import threading
+import time
+from unittest import mock
+
+import pytest
+import requests
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.agent.agente_assincrono import BuscasEspeculativas, iniciar_conversa_assincrona
+from src.agent.cliente_busca import ClienteBuscaAutomoveis
+from src.agent.terminal_agent import ExtratorEntidadesLLM
+
+def resposta_servidor(automoveis: list, proximo_cursor=None) -> mock.MagicMock:
+    dados = {"automoveis": automoveis, "proximo_cursor": proximo_cursor, "total_encontrado": None}
+    return mock.MagicMock(status_code=200, json=lambda: {"sucesso": True, "dados": dados})
+
+@pytest.fixture
+def cliente_paginado():
+    """Cliente cujo servidor falso tem duas páginas: a segunda só com o cursor 'c1'."""
+    cliente = ClienteBuscaAutomoveis(url_busca="http://servidor-teste/api/v1/automoveis/buscar")
+    def responder(url, json, **kwargs):
+        if json["paginacao"]["cursor"] == "c1":
+            return resposta_servidor([{"marca": "Fiat", "modelo": "Uno", "preco": 31000.0}])
+        return resposta_servidor([{"marca": "Fiat", "modelo": "Uno", "preco": 25000.0}], proximo_cursor="c1")
+    # As buscas rodam em threads, cada uma com sua sessão: o mock vale para todas
+    with mock.patch.object(requests.Session, "post", side_effect=responder) as mock_post:
+        yield cliente, mock_post
+
+def roteiro(*entradas: str):
+    """Substitui o input() do terminal por falas pré-definidas."""
+    falas = iter(entradas)
+    async def ler_entrada() -> str:
+        await asyncio.sleep(0.05) # Dá tempo às buscas adiantadas de terminar, como um usuário digitando
+        return next(falas)
+    return ler_entrada
+
+def test_conversa_assincrona_reaproveita_buscas_adiantadas(cliente_paginado, capsys):
+    cliente, mock_post = cliente_paginado
+    buscas = BuscasEspeculativas(cliente)
+    asyncio.run(iniciar_conversa_assincrona(roteiro("quero um fiat uno", "buscar", "mais", "mais", "sair"), buscas))
+
+    saida = capsys.readouterr().out
+    assert "Preço: R$ 25.000,00" in saida and "Preço: R$ 31.000,00" in saida
+    assert "Não há mais resultados" in saida
+    # Primeira página adiantada depois da frase, segunda enquanto o usuário lia a primeira: nenhuma busca extra
+    assert mock_post.call_count == 2
+    assert all(chamada.kwargs["json"]["filtros"] == {"marca": "Fiat", "modelo": "Uno"} for chamada in mock_post.call_args_list)
+    assert (buscas.iniciadas, buscas.reaproveitadas, buscas.canceladas) == (2, 2, 0)
+
+def test_busca_adiantada_roda_enquanto_o_llm_interpreta_a_frase(monkeypatch, capsys):
+    cliente = ClienteBuscaAutomoveis(url_busca="http://servidor-teste/api/v1/automoveis/buscar")
+    buscas = BuscasEspeculativas(cliente)
+
+    class ExtratorLento(ExtratorEntidadesLLM):
+        """LLM falso que demora a responder e anota quantas buscas já tinham saído antes de terminar."""
+        buscas_durante_extracao = None
+        def extrair(self, texto_usuario, contexto_slots):
+            time.sleep(0.2)
+            ExtratorLento.buscas_durante_extracao = mock_post.call_count
+            return super().extrair(texto_usuario, contexto_slots)
+
+    extrator = ExtratorLento(llm=FakeListChatModel(responses=[json.dumps({})]))
+    monkeypatch.setattr("src.agent.terminal_agent.obter_extrator_llm", lambda: extrator)
+    resposta = resposta_servidor([{"marca": "Fiat", "modelo": "Uno", "preco": 25000.0}])
+    with mock.patch.object(requests.Session, "post", return_value=resposta) as mock_post:
+        # A segunda frase não é explicada pelas regras e vai para o LLM (lento), sem mudar os filtros
+        asyncio.run(iniciar_conversa_assincrona(
+            roteiro("quero um fiat uno", "buscar", "algo econômico pra família", "buscar", "sair"), buscas))
+
+    # A busca com os filtros atuais saiu enquanto o LLM ainda respondia...
+    assert ExtratorLento.buscas_durante_extracao == 2
+    # ...e o "buscar" seguinte a reaproveitou, sem nova requisição
+    assert mock_post.call_count == 2
+    assert (buscas.iniciadas, buscas.reaproveitadas, buscas.canceladas) == (2, 2, 0)
+    assert capsys.readouterr().out.count("Preço: R$ 25.000,00") == 2
+
+def test_buscas_especulativas_cancelam_quando_os_filtros_mudam():
+    liberar = threading.Event()
+    def buscar_devagar(slots, cursor, cliente, anunciar):
+        liberar.wait(timeout=5)
+        return [{"marca": slots["marca"]}], None
+
+    async def cenario():
+        buscas = BuscasEspeculativas()
+        with mock.patch("src.agent.agente_assincrono.buscar_pagina", side_effect=buscar_devagar):
+            obsoleta = buscas.iniciar({"marca": "Fiat"})
+            await asyncio.sleep(0) # Deixa a tarefa começar
+            tarefa = buscas.iniciar({"marca": "Jeep"})
+            liberar.set()
+            automoveis, _ = await buscas.obter({"marca": "Jeep"})
+        return buscas, obsoleta, tarefa, automoveis
+
+    buscas, obsoleta, tarefa, automoveis = asyncio.run(cenario())
+    assert obsoleta.cancelled() and tarefa.done()
+    assert automoveis == [{"marca": "Jeep"}]
+    assert (buscas.iniciadas, buscas.reaproveitadas, buscas.canceladas) == (2, 1, 1)
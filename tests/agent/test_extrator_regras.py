@@ -0,0 +1,49 @@
+# tests/agent/test_extrator_regras.py
+import pytest
+
+from src.agent.extrator_regras import extrair_por_regras, interpretar_valor
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("Quero um Fiat Uno 2020 flex até 30000",
+     {"marca": "Fiat", "modelo": "Uno", "ano_min": 2020, "ano_max": 2020, "tipo_combustivel": "Flex", "preco_max": 30000.0}),
+    ("procuro um jeep compass 2021 a partir de 100 mil",
+     {"marca": "Jeep", "modelo": "Compass", "ano_min": 2021, "ano_max": 2021, "preco_min": 100000.0}),
+    ("tem volkswagen T-Cross flex até 120000?", {"marca": "Volkswagen", "modelo": "T-Cross", "tipo_combustivel": "Flex", "preco_max": 120000.0}),
+    ("onix plus entre 2018 e 2020 de 40 a 60 mil",
+     {"marca": "Chevrolet", "modelo": "Onix Plus", "ano_min": 2018, "ano_max": 2020, "preco_min": 40000.0, "preco_max": 60000.0}),
+    ("Corolla Cross híbrido até R$ 150.000,00", {"marca": "Toyota", "modelo": "Corolla Cross", "tipo_combustivel": "Híbrido", "preco_max": 150000.0}),
+    ("vw gol a partir de 2018 até 45 mil", {"marca": "Volkswagen", "modelo": "Gol", "ano_min": 2018, "preco_max": 45000.0}),
+    ("hrv", {"marca": "Honda", "modelo": "HR-V"}),
+    ("s10 diesel", {"marca": "Chevrolet", "modelo": "S10", "tipo_combustivel": "Diesel"}),
+])
+def test_extrair_por_regras_frases_simples(texto, esperado):
+    extracao = extrair_por_regras(texto)
+    assert extracao is not None
+    assert {campo: valor for campo, valor in extracao.items() if campo != "outras_caracteristicas"} == esperado
+
+def test_extrair_por_regras_caracteristicas():
+    assert extrair_por_regras("hb20s vermelho 4 portas automático")["outras_caracteristicas"] == ["vermelho", "automatico", "4 portas"]
+
+@pytest.mark.parametrize("texto", [
+    "oi, tudo bem?",                  # Palavras fora das regras
+    "fiat onix",                      # Modelo de outra marca
+    "uno 30 mil",                     # Preço sem "até"/"a partir de"
+    "chevrolet tracker 1.0 turbo",    # Número que não é ano nem preço
+    "gol 2019 2021",                  # Dois anos soltos
+    "na verdade quero um argo",
+    "quero ver",                      # Só palavras neutras: nenhum filtro reconhecido
+    "buscar",
+])
+def test_extrair_por_regras_deixa_para_o_llm(texto):
+    assert extrair_por_regras(texto) is None
+
+def test_extrair_por_regras_troca_de_marca_com_modelo_coletado():
+    assert extrair_por_regras("chevrolet", {"marca": "Fiat", "modelo": "Uno"}) is None
+    assert extrair_por_regras("chevrolet", {"marca": "Fiat", "modelo": None}) == {"marca": "Chevrolet", "outras_caracteristicas": []}
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("2020", ("ano", 2020.0)), ("50 mil", ("preco", 50000.0)), ("1,5 mil", ("preco", 1500.0)), ("80k", ("preco", 80000.0)),
+    ("r$ 45.900,90", ("preco", 45900.9)), ("45000", ("preco", 45000.0)), ("1.0", None), ("12", None),
+])
+def test_interpretar_valor(texto, esperado):
+    assert interpretar_valor(texto) == esperado
@@ -1,76 +1,43 @@
 # tests/agent/test_terminal_agent.py
+import json
+import threading
 import pytest
 from unittest import mock
 import requests # Para mockar requests.exceptions.RequestException
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
 
 from src.agent.terminal_agent import (
     extrair_entidades_com_llm,
     interagir_com_servidor,
     apresentar_resultados,
-    ExtracaoFiltrosCarro # O modelo Pydantic que o LLM deve retornar
+    obter_extrator_llm,
+    campos_completos,
+    extrair_e_mostrar,
+    deve_extrair,
+    ExtratorEntidadesLLM,
+    ESTATISTICAS_EXTRACAO,
 )
+from src.agent.cliente_busca import ClienteBuscaAutomoveis, obter_cliente_busca
+from src.agent.cache_extracao import CacheExtracao
 from src.models.automovel_model import TipoCombustivelEnum # Para construir mocks
 
-# --- Testes para extrair_entidades_com_llm (com Mock do LLM) ---
-
-@mock.patch('src.agent.terminal_agent.os.getenv')                 # 4. mock_getenv_func
-@mock.patch('src.agent.terminal_agent.ChatPromptTemplate')      # 3. mock_chat_prompt_template_class
-@mock.patch('src.agent.terminal_agent.ChatGoogleGenerativeAI')  # 2. mock_chat_google_class
-@mock.patch('src.agent.terminal_agent.PydanticOutputParser')    # 1. mock_pydantic_parser_class
-def test_extrair_entidades_com_llm_simples(
-    mock_pydantic_parser_class: mock.MagicMock,    # Argumento para o patch 1 (PydanticOutputParser)
-    mock_chat_google_class: mock.MagicMock,        # Argumento para o patch 2 (ChatGoogleGenerativeAI)
-    mock_chat_prompt_template_class: mock.MagicMock, # Argumento para o patch 3 (ChatPromptTemplate)
-    mock_getenv_func: mock.MagicMock               # Argumento para o patch 4 (os.getenv)
-    ):
-    """Testa a extração de entidades mockando o resultado final da cadeia LangChain."""
-
-    # 1. Simular que a chave de API existe
-    mock_getenv_func.return_value = "DUMMY_API_KEY"
-
-    # 2. Definir o objeto ExtracaoFiltrosCarro que esperamos que a cadeia retorne
-    mock_resposta_llm_parseada = ExtracaoFiltrosCarro(
-        marca="Fiat",
-        modelo="Uno",
-        ano_min=2020,
-        ano_max=2020,
-        preco_max=30000.0,
-        tipo_combustivel=TipoCombustivelEnum.FLEX.value,
-        outras_caracteristicas=[] # Importante definir todos os campos
+# --- Testes para extrair_entidades_com_llm (com um LLM falso local) ---
+
+def extrator_com_respostas(*respostas: str) -> ExtratorEntidadesLLM:
+    """Extrator com a cadeia real (prompt | llm | parser), mas com um modelo de chat local que devolve 'respostas'."""
+    return ExtratorEntidadesLLM(llm=FakeListChatModel(responses=list(respostas)))
+
+def test_extrair_entidades_com_llm_simples():
+    """Testa a extração de entidades com a cadeia LangChain real e um LLM falso."""
+    extrator = extrator_com_respostas(
+        json.dumps({
+            "marca": "Fiat", "modelo": "Uno", "ano_min": 2020, "ano_max": 2020,
+            "preco_max": 30000.0, "tipo_combustivel": TipoCombustivelEnum.FLEX.value, "outras_caracteristicas": []
+        }),
+        json.dumps({"modelo": "Mobi"}),
+        json.dumps({}),
     )
 
-    # 3. Configurar os mocks da cadeia LangChain:
-    # A cadeia é: chain = prompt | llm | parser
-    # O resultado final de chain.invoke() é o que parser.invoke(resultado_do_llm) retorna.
-
-    # Mock da instância do PydanticOutputParser e seu método invoke (ou parse)
-    # Este é o mock CRUCIAL, pois é o resultado final da cadeia.
-    mock_parser_instance = mock_pydantic_parser_class.return_value # PydanticOutputParser(...)
-    mock_parser_instance.invoke.return_value = mock_resposta_llm_parseada # parser.invoke(...)
-
-    # Mock da instância do ChatGoogleGenerativeAI e seu método invoke
-    mock_llm_instance = mock_chat_google_class.return_value # ChatGoogleGenerativeAI(...)
-    # O LLM retorna um objeto tipo BaseMessage. O parser.invoke o consome.
-    # Como parser.invoke já está mockado, o que o LLM retorna aqui não é usado para o resultado final,
-    # mas precisa ser um mock para a cadeia não quebrar.
-    mock_llm_instance.invoke.return_value = mock.MagicMock(content="Conteúdo JSON mockado que o parser (real) consumiria")
-
-    # Mock da instância do ChatPromptTemplate (retornado por from_template) e seu método invoke
-    mock_prompt_object = mock.MagicMock() # O objeto prompt retornado por from_template
-    mock_prompt_object.invoke.return_value = {"dummy_input_para_llm": "valor"} # O que o prompt.invoke() retorna para o LLM
-    mock_chat_prompt_template_class.from_template.return_value = mock_prompt_object
-
-    # Mock da cadeia completa para duplo encadeamento (prompt | llm | parser)
-    mock_chain = mock.MagicMock()
-    mock_chain.invoke.return_value = mock_resposta_llm_parseada
-
-    # O prompt | llm retorna um objeto intermediário, que ao receber | parser retorna mock_chain
-    mock_prompt_llm = mock.MagicMock()
-    mock_prompt_llm.__or__.return_value = mock_chain
-    # prompt | llm
-    mock_prompt_object.__or__.return_value = mock_prompt_llm
-    # mock_chat_prompt_template_class.from_template retorna mock_prompt_object (já feito acima)
-    
     # Slots iniciais para o teste
     slots_iniciais = {
         "marca": None, "modelo": None, "ano_min": None, "ano_max": None,
@@ -80,7 +47,7 @@ def test_extrair_entidades_com_llm_simples(
     texto_usuario_teste = "Quero um Fiat Uno 2020 flex até 30000"
     
     # Chamar a função a ser testada
-    slots_atualizados = extrair_entidades_com_llm(texto_usuario_teste, slots_iniciais.copy())
+    slots_atualizados = extrair_entidades_com_llm(texto_usuario_teste, slots_iniciais.copy(), extrator=extrator, usar_regras=False)
 
     # Asserções
     assert slots_atualizados.get("marca") == "Fiat", f"Esperado 'Fiat', mas obtido {slots_atualizados.get('marca')}"
@@ -91,10 +58,95 @@ def test_extrair_entidades_com_llm_simples(
     assert slots_atualizados.get("tipo_combustivel") == TipoCombustivelEnum.FLEX.value, f"Esperado {TipoCombustivelEnum.FLEX.value}, mas obtido {slots_atualizados.get('tipo_combustivel')}"
     assert slots_atualizados.get("preco_min") is None, f"Esperado None para preco_min, mas obtido {slots_atualizados.get('preco_min')}"
 
+    # A mesma frase (com outra caixa e espaços) e os mesmos slots vêm do cache, sem nova chamada ao LLM
+    slots_do_cache = extrair_entidades_com_llm("  quero um FIAT uno 2020 flex até 30000!", slots_iniciais.copy(), extrator=extrator, usar_regras=False)
+    assert slots_do_cache == slots_atualizados
+    assert extrator.llm.i == 1 # Índice da próxima resposta do LLM falso: só uma chamada até aqui
+    # Com outros slots já coletados, a chave muda e o LLM é consultado de novo
+    slots_com_marca = extrair_entidades_com_llm(texto_usuario_teste, {**slots_iniciais, "marca": "Fiat"}, extrator=extrator, usar_regras=False)
+    assert slots_com_marca["modelo"] == "Mobi"
+    assert extrator.llm.i == 2
+
+def test_extrair_entidades_resolve_frases_simples_sem_llm():
+    extrator = extrator_com_respostas(json.dumps({"marca": "Errada"}))
+    slots = {"marca": None, "modelo": None, "ano_min": None, "ano_max": None, "tipo_combustivel": None,
+             "preco_min": None, "preco_max": None, "outras_caracteristicas": []}
+    novos_slots = extrair_entidades_com_llm("Quero um Fiat Uno 2020 flex até 30 mil", slots, extrator=extrator)
+    assert (novos_slots["marca"], novos_slots["modelo"], novos_slots["ano_min"], novos_slots["preco_max"]) == ("Fiat", "Uno", 2020, 30000.0)
+    assert extrator.llm.i == 0
+    # Frase que as regras não explicam por inteiro vai para o LLM
+    assert extrair_entidades_com_llm("algo bem econômico pra família", slots, extrator=extrator)["marca"] == "Errada"
+
+def test_frase_so_com_palavras_neutras_vai_para_o_llm_e_nao_conta_como_regra(monkeypatch):
+    monkeypatch.setitem(ESTATISTICAS_EXTRACAO, "regras", 0)
+    monkeypatch.setitem(ESTATISTICAS_EXTRACAO, "llm", 0)
+    extrator = extrator_com_respostas(json.dumps({"marca": "Jeep"}))
+    slots = {"marca": None, "modelo": None, "ano_min": None, "ano_max": None, "tipo_combustivel": None,
+             "preco_min": None, "preco_max": None, "outras_caracteristicas": []}
+    assert extrair_entidades_com_llm("quero ver", slots, extrator=extrator)["marca"] == "Jeep"
+    assert (ESTATISTICAS_EXTRACAO["regras"], ESTATISTICAS_EXTRACAO["llm"]) == (0, 1)
+    # "buscar" só dispara a busca: não passa pela extração
+    assert not deve_extrair({**slots, "marca": "Jeep"}, "Buscar")
+    assert deve_extrair(slots, "quero ver")
+
+@pytest.mark.parametrize("resposta_parcial, esperado", [
+    ("", {}),
+    ('```json\n{"marca": "Fi', {}),
+    ('```json\n{"marca": "Fiat", "preco_max": 300', {"marca": "Fiat"}),
+    ('{"marca": "Fiat", "preco_max": 30000,', {"marca": "Fiat", "preco_max": 30000}),
+    ('{"marca": "Fiat", "outras_caracteristicas": ["verm', {"marca": "Fiat"}),
+    ('{"marca": "Fiat", "preco_max": 30000}\n```', {"marca": "Fiat", "preco_max": 30000}),
+])
+def test_campos_completos(resposta_parcial, esperado):
+    assert campos_completos(resposta_parcial) == esperado
+
+def test_extracao_em_streaming_mostra_os_campos_aos_poucos(capsys):
+    resposta = '```json\n' + json.dumps({"marca": "Jeep", "modelo": "Compass", "preco_max": 150000.0, "outras_caracteristicas": ["teto solar"]}) + '\n```'
+    extrator = extrator_com_respostas(resposta)
+    previas = []
+    slots = {"marca": None, "modelo": None, "preco_max": None, "outras_caracteristicas": []}
+    novos_slots = extrair_entidades_com_llm("um jeep compass com teto solar, no máximo 150 mil", slots, extrator=extrator,
+                                            usar_regras=False, ao_atualizar=previas.append)
+    # Uma prévia por campo concluído, na ordem em que o LLM os escreve; a última já é o resultado final
+    assert [previa["marca"] for previa in previas] == ["Jeep", "Jeep", "Jeep", "Jeep"]
+    assert [previa["modelo"] for previa in previas] == [None, "Compass", "Compass", "Compass"]
+    assert previas[-1] == novos_slots == {"marca": "Jeep", "modelo": "Compass", "preco_max": 150000.0, "outras_caracteristicas": ["teto solar"]}
+    assert "Atualizado/preenchido" in capsys.readouterr().out # Só o resultado final é anunciado campo a campo
+
+    # No agente, a última prévia igual ao resultado não é repetida
+    extrator = extrator_com_respostas(resposta)
+    with mock.patch("src.agent.terminal_agent.obter_extrator_llm", return_value=extrator):
+        extrair_e_mostrar("jeep compass de teto solar por até 150 mil", slots, streaming=True)
+    linhas = [linha for linha in capsys.readouterr().out.splitlines() if linha.startswith("ℹ️ Entendi até agora")]
+    assert len(linhas) == 4
+    assert linhas[0] == "ℹ️ Entendi até agora: Marca: Jeep"
+
+def test_extrator_monta_a_cadeia_uma_vez_e_trata_resposta_invalida():
+    extrator = extrator_com_respostas("isso não é JSON", json.dumps({"marca": "Jeep"}))
+    cadeia = extrator.chain
+    slots = {"marca": None, "modelo": None, "outras_caracteristicas": []}
+    assert extrair_entidades_com_llm("quero um jeep", slots, extrator=extrator, usar_regras=False) == slots # Falha do parser: slots intactos
+    assert extrair_entidades_com_llm("quero um jeep", slots, extrator=extrator, usar_regras=False)["marca"] == "Jeep"
+    assert extrator.chain is cadeia
+
+def test_obter_extrator_llm_sem_chave(monkeypatch, capsys):
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.setattr("src.agent.terminal_agent._extrator_padrao", None)
+    assert obter_extrator_llm() is None
+    slots = {"marca": None}
+    assert extrair_entidades_com_llm("quero um carro", slots, usar_regras=False) == slots
+    assert "GOOGLE_API_KEY" in capsys.readouterr().out
+
+
+# --- Testes para interagir_com_servidor (mockando a sessão HTTP do cliente) ---
+@pytest.fixture
+def cliente_mock():
+    cliente = ClienteBuscaAutomoveis(url_busca="http://servidor-teste/api/v1/automoveis/buscar")
+    with mock.patch.object(cliente.sessao, "post") as mock_post:
+        yield cliente, mock_post
 
-# --- Testes para interagir_com_servidor (mockando requests.post) ---
-@mock.patch('src.agent.terminal_agent.requests.post')
-def test_interagir_com_servidor_sucesso(mock_post: mock.MagicMock):
+def test_interagir_com_servidor_sucesso(cliente_mock):
+    cliente, mock_post = cliente_mock
     mock_resposta_servidor = {
         "sucesso": True,
         "dados": {
@@ -104,20 +156,42 @@ def test_interagir_com_servidor_sucesso(mock_post: mock.MagicMock):
     }
     mock_post.return_value = mock.MagicMock(status_code=200, json=lambda: mock_resposta_servidor)
     slots = {"marca": "Fiat", "modelo": "Uno"}
-    resultado = interagir_com_servidor(slots)
+    resultado = interagir_com_servidor(slots, cliente)
     mock_post.assert_called_once()
     args, kwargs = mock_post.call_args
+    assert args[0] == "http://servidor-teste/api/v1/automoveis/buscar"
+    assert kwargs['timeout'] == cliente.timeout
     assert kwargs['json']['filtros']['marca'] == "Fiat"
     assert kwargs['json']['filtros']['modelo'] == "Uno"
     assert len(resultado) == 1
     assert resultado[0]["marca"] == "Fiat"
 
-@mock.patch('src.agent.terminal_agent.requests.post')
-def test_interagir_com_servidor_falha_conexao(mock_post: mock.MagicMock):
+def test_interagir_com_servidor_formato_colunar(cliente_mock):
+    cliente, mock_post = cliente_mock
+    mock_resposta_servidor = {
+        "sucesso": True,
+        "dados": {
+            "automoveis": {"marca": ["Fiat", "Ford"], "modelo": ["Uno", "Ka"], "preco": [25000.0, 48000.0]},
+            "total_encontrado": 2, "pagina_atual": 1, "total_paginas": 1
+        }
+    }
+    mock_post.return_value = mock.MagicMock(status_code=200, json=lambda: mock_resposta_servidor)
+    resultado = interagir_com_servidor({"preco_max": 50000}, cliente)
+    _, kwargs = mock_post.call_args
+    assert kwargs['headers']['Accept'].startswith("application/vnd.c2s.colunar+json")
+    assert resultado == [
+        {"marca": "Fiat", "modelo": "Uno", "preco": 25000.0},
+        {"marca": "Ford", "modelo": "Ka", "preco": 48000.0},
+    ]
+
+def test_interagir_com_servidor_falha_conexao(cliente_mock, capsys: pytest.CaptureFixture[str]):
+    cliente, mock_post = cliente_mock
     mock_post.side_effect = requests.exceptions.RequestException("Falha de conexão mockada")
     slots = {"marca": "Qualquer"}
-    resultado = interagir_com_servidor(slots)
+    resultado = interagir_com_servidor(slots, cliente)
     assert resultado == []
+    captured = capsys.readouterr()
+    assert "Não consegui me conectar ao servidor de busca: Falha de conexão mockada" in captured.out
 
 # --- Testes para apresentar_resultados (capturando stdout) ---
 def test_apresentar_resultados_com_carros(capsys: pytest.CaptureFixture[str]):
@@ -136,4 +210,54 @@ def test_apresentar_resultados_com_carros(capsys: pytest.CaptureFixture[str]):
 def test_apresentar_resultados_sem_carros(capsys: pytest.CaptureFixture[str]):
     apresentar_resultados([])
     captured = capsys.readouterr()
-    assert "Puxa, não encontrei nenhum carro com esses critérios." in captured.out
\ No newline at end of file
+    assert "Puxa, não encontrei nenhum carro com esses critérios." in captured.out
+
+def test_cliente_busca_reaproveita_sessao_e_repete_erros_transitorios():
+    cliente = ClienteBuscaAutomoveis(tentativas=2, fator_backoff=0)
+    adaptador = cliente.sessao.get_adapter(cliente.url_busca)
+    assert adaptador.max_retries.total == 2
+    assert "POST" in adaptador.max_retries.allowed_methods
+    assert 503 in adaptador.max_retries.status_forcelist
+    assert obter_cliente_busca() is obter_cliente_busca()
+    cliente.fechar()
+
+def test_cliente_busca_usa_uma_sessao_por_thread_e_um_cliente_por_processo(monkeypatch):
+    monkeypatch.setattr("src.agent.cliente_busca._cliente_padrao", None)
+    cliente = ClienteBuscaAutomoveis()
+    sessoes, clientes = [], []
+    barreira = threading.Barrier(4)
+    def trabalhar():
+        barreira.wait()
+        clientes.append(obter_cliente_busca())
+        sessoes.append(cliente.sessao)
+    threads = [threading.Thread(target=trabalhar) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(s) for s in sessoes}) == 4
+    assert cliente.sessao is cliente.sessao # Na mesma thread, a sessão é reaproveitada
+    assert len({id(c) for c in clientes}) == 1
+    cliente.fechar()
+    assert cliente._sessoes == []
+
+def test_cache_extracao_expira_por_ttl_e_descarta_o_menos_usado(tmp_path):
+    agora = [1000.0]
+    cache = CacheExtracao(str(tmp_path / "cache.db"), ttl=60, max_entradas=2, relogio=lambda: agora[0])
+    chave_a, chave_b, chave_c = (CacheExtracao.chave(texto, {}, "1") for texto in ("a", "b", "c"))
+    cache.guardar(chave_a, {"marca": "A"})
+    agora[0] += 1
+    cache.guardar(chave_b, {"marca": "B"})
+    agora[0] += 1
+    assert cache.obter(chave_a) == {"marca": "A"} # 'a' passa a ser a usada mais recentemente
+    cache.guardar(chave_c, {"marca": "C"})         # Excede o limite: sai 'b'
+    assert cache.obter(chave_b) is None
+    assert cache.obter(chave_c) == {"marca": "C"}
+    agora[0] += 61
+    assert cache.obter(chave_a) is None            # Expirada
+    assert CacheExtracao.chave("Carro  FLEX até 50 mil.", {}, "1") == CacheExtracao.chave("carro flex até 50 mil", {}, "1")
+    assert CacheExtracao.chave("carro flex", {}, "1") != CacheExtracao.chave("carro flex", {}, "2")
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["acertos"], estatisticas["faltas"], estatisticas["entradas"]) == (2, 2, 1)
+    assert estatisticas["taxa_acerto"] == 0.5
+    cache.fechar()
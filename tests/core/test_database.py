@@ -0,0 +1,180 @@
+# tests/core/test_database.py
+import uuid
+import pytest
+from sqlalchemy import create_engine, event, inspect, select, func, text
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import Base, AutomovelDB, ResumoCatalogoDB, migrar_schema, normalizar_texto, url_com_driver, verificar_resumo, reconstruir_resumo
+from src.services.mcp_server import FiltrosAutomovel, construir_condicoes, condicao_apos_cursor, ORDEM_RESULTADOS
+from src.models.automovel_model import TipoCombustivelEnum
+
+@pytest.fixture()
+def engine_plano():
+    """Banco em memória só com o schema, para inspecionar planos de execução."""
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+def plano_de_execucao(engine, consulta) -> list:
+    """Executa a consulta prefixada com EXPLAIN QUERY PLAN e retorna as linhas de detalhe do plano."""
+    def prefixar(conn, cursor, statement, parameters, context, executemany):
+        return "EXPLAIN QUERY PLAN " + statement, parameters
+
+    event.listen(engine, "before_cursor_execute", prefixar, retval=True)
+    try:
+        with engine.connect() as conn:
+            return [linha[3] for linha in conn.execute(consulta).fetchall()]
+    finally:
+        event.remove(engine, "before_cursor_execute", prefixar)
+
+def consulta_pagina(filtros: FiltrosAutomovel, cursor: tuple = None):
+    """Mesma forma de consulta que buscar_automoveis monta para uma página."""
+    condicoes = construir_condicoes(filtros)
+    if cursor:
+        condicoes.append(condicao_apos_cursor(cursor))
+    return select(AutomovelDB).where(*condicoes).order_by(*ORDEM_RESULTADOS).limit(11)
+
+@pytest.mark.parametrize("filtros, cursor", [
+    (FiltrosAutomovel(), None),
+    (FiltrosAutomovel(tipo_combustivel=TipoCombustivelEnum.FLEX), None),
+    (FiltrosAutomovel(tipo_combustivel=TipoCombustivelEnum.FLEX, preco_max=50000.0), None),
+    (FiltrosAutomovel(preco_max=50000.0), None),
+    (FiltrosAutomovel(ano_min=2020, preco_max=50000.0), None),
+    (FiltrosAutomovel(), ("Fiat", "Uno", 2020, uuid.uuid4())),
+], ids=["sem_filtros", "combustivel", "combustivel_preco", "preco_max", "ano_min_preco_max", "cursor"])
+def test_pagina_usa_indice_sem_ordenacao_temporaria(engine_plano, filtros, cursor):
+    plano = plano_de_execucao(engine_plano, consulta_pagina(filtros, cursor))
+    assert any("USING INDEX" in passo for passo in plano), plano
+    assert not any("TEMP B-TREE" in passo for passo in plano), plano
+
+@pytest.mark.parametrize("filtros", [
+    FiltrosAutomovel(preco_min=30000.0, preco_max=50000.0),
+    FiltrosAutomovel(ano_min=2020),
+    FiltrosAutomovel(tipo_combustivel=TipoCombustivelEnum.DIESEL),
+], ids=["faixa_preco", "ano", "combustivel"])
+def test_contagem_usa_indice_cobrindo(engine_plano, filtros):
+    consulta = select(func.count()).select_from(AutomovelDB).where(*construir_condicoes(filtros))
+    plano = plano_de_execucao(engine_plano, consulta)
+    assert any("COVERING INDEX" in passo for passo in plano), plano
+
+@pytest.mark.parametrize("filtros", [
+    FiltrosAutomovel(preco_min=30000.0, preco_max=50000.0),
+    FiltrosAutomovel(ano_min=2020, ano_max=2022),
+], ids=["faixa_preco", "faixa_ano"])
+def test_faixa_fechada_usa_indice_de_faixa(engine_plano, filtros):
+    # Faixas fechadas são estimadas como seletivas: o SQLite busca pelo índice da
+    # faixa e ordena só as poucas linhas encontradas, em vez de varrer a ordenação inteira.
+    plano = plano_de_execucao(engine_plano, consulta_pagina(filtros))
+    assert any(passo.startswith("SEARCH") and "USING INDEX" in passo for passo in plano), plano
+
+@pytest.mark.parametrize("filtros", [
+    FiltrosAutomovel(marca="Volks"),
+    FiltrosAutomovel(marca="Fiat", modelo="Un", preco_max=50000.0),
+    FiltrosAutomovel(modelo="Onix"),
+], ids=["marca", "marca_modelo_preco", "modelo"])
+def test_busca_textual_usa_intervalo_no_indice(engine_plano, filtros):
+    plano = plano_de_execucao(engine_plano, select(func.count()).select_from(AutomovelDB).where(*construir_condicoes(filtros)))
+    assert any(passo.startswith("SEARCH") and "_busca" in passo for passo in plano), plano
+
+def test_normalizar_texto():
+    assert normalizar_texto("  Citroën ") == "citroen"
+    assert normalizar_texto("HÍBRIDO") == "hibrido"
+
+def test_migrar_schema_cria_indices_em_banco_existente():
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    with engine.begin() as conn:
+        # Tabela criada por uma versão anterior, com os índices de coluna única e sem os compostos
+        conn.execute(text("CREATE TABLE automoveis (id_veiculo CHAR(32) PRIMARY KEY, marca VARCHAR(50), modelo VARCHAR(50), "
+                          "ano_fabricacao INTEGER, ano_modelo INTEGER, cor VARCHAR(30), motorizacao FLOAT, tipo_combustivel VARCHAR(8), "
+                          "quilometragem INTEGER, numero_portas INTEGER, transmissao VARCHAR(12), preco FLOAT, data_cadastro DATETIME, observacoes VARCHAR(500))"))
+        conn.execute(text("CREATE INDEX ix_automoveis_marca ON automoveis (marca)"))
+        conn.execute(text("CREATE INDEX ix_automoveis_modelo ON automoveis (modelo)"))
+        conn.execute(text("INSERT INTO automoveis (id_veiculo, marca, modelo) VALUES ('00000000000000000000000000000001', 'Citroën', 'C4 Cactus')"))
+    migrar_schema(engine)
+    migrar_schema(engine) # Deve ser idempotente
+    indices = {indice["name"] for indice in inspect(engine).get_indexes("automoveis")}
+    assert {"ix_automoveis_ordenacao", "ix_automoveis_combustivel_ordenacao", "ix_automoveis_preco", "ix_automoveis_ano_preco",
+            "ix_automoveis_marca_busca", "ix_automoveis_modelo_busca"} <= indices
+    # Os índices de coluna única da versão anterior são removidos
+    assert not {"ix_automoveis_marca", "ix_automoveis_modelo"} & indices
+    with engine.connect() as conn:
+        # Linhas antigas recebem as colunas normalizadas
+        assert conn.execute(text("SELECT marca_normalizada, modelo_normalizado FROM automoveis")).one() == ("citroen", "c4 cactus")
+
+def test_url_com_driver_escolhe_driver_do_backend():
+    assert url_com_driver("sqlite:///./data/automoveis.db") == "sqlite:///./data/automoveis.db"
+    assert url_com_driver("sqlite:///./data/automoveis.db", assincrono=True) == "sqlite+aiosqlite:///./data/automoveis.db"
+    assert url_com_driver("postgresql://u:s@host:5432/db") == "postgresql+psycopg://u:s@host:5432/db"
+    assert url_com_driver("postgresql+psycopg2://u:s@host/db", assincrono=True) == "postgresql+psycopg://u:s@host/db"
+    with pytest.raises(ValueError):
+        url_com_driver("mysql://u:s@host/db")
+
+def test_criar_engine_aplica_pragmas_e_separa_leitura_de_escrita(tmp_path):
+    import asyncio
+    from src.core.database import criar_engine
+
+    url = f"sqlite:///{tmp_path / 'tuning.db'}"
+    engine_escrita = criar_engine(url)
+    engine_leitura = criar_engine(url.replace("sqlite://", "sqlite+aiosqlite://"), somente_leitura=True, assincrono=True)
+    Base.metadata.create_all(bind=engine_escrita)
+    assert engine_escrita.pool.size() == 1
+
+    with engine_escrita.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -65536
+        assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2 # MEMORY
+        assert conn.exec_driver_sql("PRAGMA mmap_size").scalar() > 0
+
+    async def ler_durante_escrita() -> int:
+        # Uma transação de escrita fica aberta (sem commit) enquanto o pool de leitura consulta
+        with engine_escrita.connect() as conn_escrita:
+            conn_escrita.execute(text("INSERT INTO catalogo_versao (id, versao) VALUES (1, 1)"))
+            async with engine_leitura.connect() as conn_leitura:
+                assert (await conn_leitura.exec_driver_sql("PRAGMA query_only")).scalar() == 1
+                return (await conn_leitura.execute(select(func.count()).select_from(AutomovelDB))).scalar()
+
+    try:
+        assert asyncio.run(ler_durante_escrita()) == 0
+    finally:
+        asyncio.run(engine_leitura.dispose())
+        engine_escrita.dispose()
+
+def test_resumo_catalogo_acompanha_insercoes_alteracoes_e_remocoes():
+    from sqlalchemy.orm import Session
+    from src.models.automovel_model import TipoTransmissaoEnum
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+
+    def carro(modelo: str, preco: float) -> AutomovelDB:
+        return AutomovelDB(marca="Fiat", modelo=modelo, ano_fabricacao=2020, ano_modelo=2020, cor="Prata", motorizacao=1.0, tipo_combustivel=TipoCombustivelEnum.FLEX, quilometragem=0, numero_portas=4, transmissao=TipoTransmissaoEnum.MANUAL, preco=preco)
+
+    def resumo(db: Session) -> dict:
+        return {(r.modelo, r.tipo_combustivel): (r.quantidade, r.preco_min, r.preco_max, r.preco_soma) for r in db.scalars(select(ResumoCatalogoDB))}
+
+    with Session(engine) as db:
+        barato, caro = carro("Uno", 30000.0), carro("Uno", 50000.0)
+        db.add_all([barato, caro, carro("Mobi", 40000.0)])
+        db.commit()
+        assert resumo(db) == {("Uno", TipoCombustivelEnum.FLEX): (2, 30000.0, 50000.0, 80000.0), ("Mobi", TipoCombustivelEnum.FLEX): (1, 40000.0, 40000.0, 40000.0)}
+
+        db.delete(caro) # O máximo do grupo precisa ser recalculado
+        barato.tipo_combustivel = TipoCombustivelEnum.GASOLINA # Muda de grupo
+        db.commit()
+        assert resumo(db) == {("Uno", TipoCombustivelEnum.GASOLINA): (1, 30000.0, 30000.0, 30000.0), ("Mobi", TipoCombustivelEnum.FLEX): (1, 40000.0, 40000.0, 40000.0)}
+
+        with engine.begin() as conn:
+            assert verificar_resumo(conn) == []
+            conn.execute(ResumoCatalogoDB.__table__.update().values(quantidade=99))
+            assert len(verificar_resumo(conn)) == 2
+            reconstruir_resumo(conn)
+            assert verificar_resumo(conn) == []
+
+def test_marca_e_modelo_usam_collation_c_no_postgresql():
+    # Ordem por code point, como no SQLite e no motor em memória, qualquer que seja a collation do servidor
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateTable
+    ddl = str(CreateTable(AutomovelDB.__table__).compile(dialect=postgresql.dialect()))
+    assert 'marca VARCHAR(50) COLLATE "C" NOT NULL' in ddl
+    assert 'modelo VARCHAR(50) COLLATE "C" NOT NULL' in ddl
@@ -0,0 +1,86 @@
+# tests/scripts/test_gerador_vetorizado.py
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+from faker import Faker
+
+from src.models.automovel_model import Automovel
+from src.scripts.populate_db import gerar_dados_automovel_ficticio
+from src.scripts.gerador_vetorizado import gerar_colunas, gerar_lotes_vetorizados, colunas_para_tabela, frases_observacoes, salvar_npz
+
+N = 20000
+
+def linhas(tabela: dict) -> list:
+    return [dict(zip(tabela, valores)) for valores in zip(*tabela.values())]
+
+@pytest.fixture(scope="module")
+def amostras():
+    rng = random.Random(123)
+    faker = Faker('pt_BR')
+    faker.seed_instance(123)
+    escalar = [gerar_dados_automovel_ficticio(rng, faker) for _ in range(N)]
+    vetorizado = linhas(colunas_para_tabela(gerar_colunas(N, np.random.default_rng(123)), frases_observacoes(123)))
+    return escalar, vetorizado
+
+def proporcoes(linhas, campo) -> Counter:
+    contagem = Counter(linha[campo] for linha in linhas)
+    return Counter({valor: qtd / len(linhas) for valor, qtd in contagem.items()})
+
+@pytest.mark.parametrize("campo", ["marca", "modelo", "tipo_combustivel", "transmissao", "ano_fabricacao", "numero_portas", "cor"])
+def test_distribuicoes_categoricas_iguais_as_do_gerador_escalar(amostras, campo):
+    escalar, vetorizado = amostras
+    p_escalar, p_vetorizado = proporcoes(escalar, campo), proporcoes(vetorizado, campo)
+    assert set(p_vetorizado) <= set(p_escalar) | {v for v in p_vetorizado if p_vetorizado[v] < 0.005}
+    for valor in set(p_escalar) | set(p_vetorizado):
+        assert abs(p_escalar[valor] - p_vetorizado[valor]) < 0.015, (campo, valor, p_escalar[valor], p_vetorizado[valor])
+
+@pytest.mark.parametrize("campo, tolerancia", [("preco", 0.02), ("quilometragem", 0.03), ("motorizacao", 0.02)])
+def test_distribuicoes_numericas_iguais_as_do_gerador_escalar(amostras, campo, tolerancia):
+    escalar, vetorizado = amostras
+    valores_escalar = np.array([linha[campo] for linha in escalar], dtype=float)
+    valores_vetorizado = np.array([linha[campo] for linha in vetorizado], dtype=float)
+    assert abs(valores_vetorizado.mean() / valores_escalar.mean() - 1) < tolerancia
+    for q in (0.1, 0.5, 0.9):
+        assert abs(np.quantile(valores_vetorizado, q) / np.quantile(valores_escalar, q) - 1) < tolerancia * 2
+
+def test_linhas_vetorizadas_sao_validas_e_reprodutiveis():
+    frases = frases_observacoes(1)
+    primeira = [linha for lote in gerar_lotes_vetorizados(300, 100, semente=1) for linha in linhas(colunas_para_tabela(lote, frases))]
+    segunda = [linha for lote in gerar_lotes_vetorizados(300, 100, semente=1) for linha in linhas(colunas_para_tabela(lote, frases))]
+    assert primeira == segunda
+    assert len({linha["id_veiculo"] for linha in primeira}) == 300
+    for linha in primeira:
+        Automovel(**linha)
+
+def test_salvar_npz_grava_lote_a_lote(tmp_path):
+    caminho = tmp_path / "veiculos.npz"
+    gerados = list(gerar_lotes_vetorizados(250, 100, semente=3))
+    assert salvar_npz(iter(gerados), caminho) == 250
+
+    with np.load(caminho) as arquivo:
+        assert sorted(nome for nome in arquivo.files if nome.endswith("/preco")) == ["lote_000000/preco", "lote_000001/preco", "lote_000002/preco"]
+        precos = np.concatenate([arquivo[f"lote_{i:06d}/preco"] for i in range(3)])
+        assert arquivo["dicionario_cor"].tolist()[:2] == ["Branco", "Preto"]
+    np.testing.assert_array_equal(precos, np.concatenate([lote["preco"] for lote in gerados]))
+
+def test_inserir_lotes_colunares(tmp_path):
+    from sqlalchemy import create_engine, func, select
+    from src.core.database import Base, AutomovelDB, verificar_resumo
+    from src.scripts.populate_db import inserir_lotes
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'colunar.db'}")
+    Base.metadata.create_all(bind=engine)
+    frases = frases_observacoes(5)
+    lotes = [colunas_para_tabela(lote, frases) for lote in gerar_lotes_vetorizados(250, 100, semente=5)]
+    assert inserir_lotes(engine, iter(lotes)) == 250
+
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(AutomovelDB)) == 250
+        assert verificar_resumo(conn) == []
+        # Os valores voltam do banco com os mesmos tipos (UUID, Enum, datetime) com que foram gerados
+        primeiro = conn.execute(select(AutomovelDB.__table__).where(AutomovelDB.id_veiculo == lotes[0]["id_veiculo"][0])).one()._mapping
+        esperado = {coluna: valores[0] for coluna, valores in lotes[0].items()}
+        assert {coluna: primeiro[coluna] for coluna in esperado} == esperado
+    engine.dispose()
@@ -0,0 +1,66 @@
+# tests/scripts/test_populate_db.py
+import pytest
+from sqlalchemy import create_engine, inspect, select, func
+
+from src.core.database import Base, AutomovelDB, CatalogoVersaoDB, verificar_resumo
+from src.models.automovel_model import Automovel
+from src.scripts.populate_db import gerar_dados_automovel_ficticio, popular_banco_em_lote
+
+@pytest.fixture()
+def engine_arquivo(tmp_path):
+    """Banco SQLite em arquivo (os PRAGMAs de journal não se aplicam a bancos em memória)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'carga.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+def test_dados_gerados_passam_na_validacao():
+    # A carga em lote não valida linha a linha, então o gerador precisa produzir dados sempre válidos
+    for _ in range(500):
+        Automovel(**gerar_dados_automovel_ficticio())
+
+@pytest.mark.parametrize("adiar_indices", [False, True])
+def test_popular_banco_em_lote(engine_arquivo, adiar_indices):
+    total = popular_banco_em_lote(engine_arquivo, num_veiculos=1050, tamanho_lote=500, adiar_indices=adiar_indices)
+    assert total == 1050
+
+    with engine_arquivo.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(AutomovelDB)) == 1050
+        assert conn.scalar(select(func.count()).select_from(AutomovelDB).where(AutomovelDB.marca_normalizada.is_(None))) == 0
+        assert conn.scalar(select(CatalogoVersaoDB.versao)) == 3 # Uma versão nova por lote
+        assert verificar_resumo(conn) == [] # Resumo somado lote a lote confere com a tabela
+        # PRAGMAs restaurados após a carga
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 2
+
+    indices = {indice["name"] for indice in inspect(engine_arquivo).get_indexes("automoveis")}
+    assert {indice.name for indice in AutomovelDB.__table__.indexes} <= indices
+
+def test_geracao_paralela_reprodutivel():
+    from src.scripts.populate_db import gerar_lotes_paralelos
+    sequencial = [linha for lote in gerar_lotes_paralelos(70, 20, processos=1, semente=42) for linha in lote]
+    paralelo = [linha for lote in gerar_lotes_paralelos(70, 20, processos=2, semente=42) for linha in lote]
+    outra_semente = [linha for lote in gerar_lotes_paralelos(70, 20, processos=1, semente=7) for linha in lote]
+
+    assert len(sequencial) == 70
+    assert paralelo == sequencial
+    assert outra_semente != sequencial
+    for linha in sequencial[:50]:
+        Automovel(**linha)
+
+def test_geracao_com_semente_nao_depende_do_relogio(monkeypatch):
+    from datetime import datetime
+    from src.scripts import populate_db
+
+    class RelogioNoFuturo(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2031, 6, 1)
+
+    hoje = [linha for lote in populate_db.gerar_lotes_paralelos(30, 10, processos=1, semente=42) for linha in lote]
+    monkeypatch.setattr(populate_db, "datetime", RelogioNoFuturo)
+    no_futuro = [linha for lote in populate_db.gerar_lotes_paralelos(30, 10, processos=1, semente=42) for linha in lote]
+
+    assert no_futuro == hoje
+    assert all(linha["ano_fabricacao"] <= populate_db.ANO_REFERENCIA for linha in hoje)
+    assert all(linha["data_cadastro"].year == populate_db.ANO_REFERENCIA for linha in hoje)
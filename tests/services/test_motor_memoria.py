@@ -0,0 +1,158 @@
+# tests/services/test_motor_memoria.py
+import asyncio
+import random
+
+import pytest
+from faker import Faker
+from sqlalchemy import create_engine, delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.core.database import Base, AutomovelDB, CatalogoVersaoDB
+from src.models.automovel_model import TipoCombustivelEnum, TipoTransmissaoEnum
+from src.scripts.populate_db import gerar_dados_automovel_ficticio, completar_linha, inserir_lotes
+from src.services.mcp_server import MCPRequest, MCPFacetasRequest, AutomovelRespostaParaAPI, executar_busca, calcular_facetas
+from src.services.motor_memoria import MotorBuscaMemoria
+
+@pytest.fixture()
+def bancos(tmp_path):
+    """Arquivo SQLite com 600 carros (sementes fixas), acessível pelos engines síncrono e assíncrono."""
+    caminho = tmp_path / "motor.db"
+    engine = create_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    faker = Faker('pt_BR')
+    faker.seed_instance(7)
+    inserir_lotes(engine, [[completar_linha(gerar_dados_automovel_ficticio(rng, faker)) for _ in range(600)]])
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{caminho}")
+    yield engine, async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    asyncio.run(async_engine.dispose())
+    engine.dispose()
+
+def versao_catalogo(engine) -> int:
+    with Session(engine) as db:
+        return db.get(CatalogoVersaoDB, 1).versao
+
+async def buscar_nos_dois_motores(fabrica, motor, versao, requisicao: dict) -> tuple:
+    mcp_request = MCPRequest.model_validate(requisicao)
+    async with fabrica() as db:
+        await motor.sincronizar(db, versao)
+        return await executar_busca(db, mcp_request), await executar_busca(db, mcp_request, motor=motor)
+
+REQUISICOES = [
+    {},
+    {"paginacao": {"pagina": 3, "itens_por_pagina": 7}},
+    {"filtros": {"marca": "volks"}, "paginacao": {"itens_por_pagina": 4}},
+    {"filtros": {"marca": "CITROEN", "ano_min": 2019}},
+    {"filtros": {"modelo": "c"}, "paginacao": {"pagina": 2, "contagem": "limitada", "limite_contagem": 5}},
+    {"filtros": {"tipo_combustivel": "Diesel", "preco_max": 120000}},
+    {"filtros": {"preco_min": 40000, "preco_max": 60000, "ano_max": 2022}, "paginacao": {"contagem": "nenhuma"}},
+    {"filtros": {"tipo_combustivel": "Elétrico", "marca": "fi"}},
+    {"filtros": {"marca": "inexistente"}},
+]
+
+@pytest.mark.parametrize("requisicao", REQUISICOES)
+def test_motor_memoria_responde_igual_ao_banco(bancos, requisicao):
+    engine, fabrica = bancos
+    motor = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields)
+    resposta_sql, resposta_memoria = asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao_catalogo(engine), requisicao))
+    assert resposta_memoria == resposta_sql
+
+@pytest.mark.parametrize("requisicao", [{}, {"filtros": {"marca": "volks"}, "largura_faixa_preco": 7500, "largura_faixa_ano": 3}, {"filtros": {"marca": "inexistente"}}])
+def test_motor_memoria_calcula_facetas_iguais_as_do_banco(bancos, requisicao):
+    engine, fabrica = bancos
+    motor = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields)
+    facetas_request = MCPFacetasRequest.model_validate(requisicao)
+    async def calcular():
+        async with fabrica() as db:
+            await motor.sincronizar(db, versao_catalogo(engine))
+            return await calcular_facetas(db, facetas_request), await calcular_facetas(db, facetas_request, motor=motor)
+    facetas_sql, facetas_memoria = asyncio.run(calcular())
+    assert facetas_memoria == facetas_sql
+
+def test_motor_memoria_percorre_cursores_como_o_banco(bancos):
+    engine, fabrica = bancos
+    motor = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields)
+    versao = versao_catalogo(engine)
+    requisicao = {"filtros": {"ano_min": 2018}, "paginacao": {"itens_por_pagina": 50}}
+    paginas = 0
+    while True:
+        resposta_sql, resposta_memoria = asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao, requisicao))
+        assert resposta_memoria == resposta_sql
+        paginas += 1
+        cursor = resposta_sql["dados"]["proximo_cursor"]
+        if cursor is None:
+            break
+        requisicao["paginacao"]["cursor"] = cursor
+    assert paginas > 2
+
+def test_motor_memoria_atualiza_por_marca_dagua_e_recarrega_apos_remocao(bancos):
+    engine, fabrica = bancos
+    motor = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields)
+    filtro = {"filtros": {"marca": "Novíssima"}}
+    asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao_catalogo(engine), filtro))
+    assert (motor.total, motor.recargas_completas) == (600, 1)
+
+    with Session(engine) as db:
+        db.add(AutomovelDB(
+            marca="Novíssima", modelo="Z1", ano_fabricacao=2023, ano_modelo=2023, cor="Azul", motorizacao=1.0,
+            tipo_combustivel=TipoCombustivelEnum.FLEX, quilometragem=10, numero_portas=4,
+            transmissao=TipoTransmissaoEnum.MANUAL, preco=70000.0,
+        ))
+        db.commit()
+    resposta_sql, resposta_memoria = asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao_catalogo(engine), filtro))
+    assert resposta_memoria == resposta_sql
+    assert resposta_memoria["dados"]["total_encontrado"] == 1
+    assert (motor.total, motor.atualizacoes_incrementais, motor.recargas_completas) == (601, 1, 1)
+
+    with Session(engine) as db:
+        db.execute(delete(AutomovelDB).where(AutomovelDB.marca == "Novíssima"))
+        db.get(CatalogoVersaoDB, 1).versao += 1 # Remoção pelo Core: a versão é incrementada à mão
+        db.commit()
+    resposta_sql, resposta_memoria = asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao_catalogo(engine), filtro))
+    assert resposta_memoria == resposta_sql
+    assert resposta_memoria["dados"]["total_encontrado"] == 0
+    assert (motor.total, motor.recargas_completas) == (600, 2)
+
+def test_motor_memoria_ordena_acentos_e_maiusculas_como_o_banco(bancos):
+    engine, fabrica = bancos
+    motor = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields)
+    marcas = ["Citroën", "citroen", "Ávila", "BMW", "bmw", "Émile", "Zeta", "álamo"]
+    with Session(engine) as db:
+        db.add_all([
+            AutomovelDB(
+                marca=marca, modelo=modelo, ano_fabricacao=2020, ano_modelo=2020, cor="Azul", motorizacao=1.0,
+                tipo_combustivel=TipoCombustivelEnum.FLEX, quilometragem=10, numero_portas=4,
+                transmissao=TipoTransmissaoEnum.MANUAL, preco=50000.0,
+            )
+            for marca in marcas for modelo in ("Éclair", "eclair", "Eclair")
+        ])
+        db.commit()
+    requisicao = {"filtros": {"ano_min": 2020, "ano_max": 2020, "preco_min": 50000, "preco_max": 50000}, "paginacao": {"itens_por_pagina": 5}}
+    vistas = []
+    while True:
+        resposta_sql, resposta_memoria = asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao_catalogo(engine), requisicao))
+        assert resposta_memoria == resposta_sql
+        vistas += [(carro["marca"], carro["modelo"]) for carro in resposta_sql["dados"]["automoveis"]]
+        if resposta_sql["dados"]["proximo_cursor"] is None:
+            break
+        requisicao["paginacao"]["cursor"] = resposta_sql["dados"]["proximo_cursor"]
+    # Ordem dos code points (maiúsculas antes de minúsculas, acentuadas no fim), a mesma no banco e na memória
+    assert vistas == sorted(vistas)
+
+def test_motor_memoria_intercala_linhas_novas_na_ordem_existente(bancos):
+    engine, fabrica = bancos
+    motor = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields)
+    asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao_catalogo(engine), {}))
+    rng = random.Random(11)
+    for marca in ("Aaa", "Mmm", "Fiat"): # Marcas novas no início e no meio do dicionário, e uma já existente
+        linhas = [completar_linha(gerar_dados_automovel_ficticio(rng)) for _ in range(40)]
+        for linha in linhas[::2]:
+            linha["marca"] = marca
+        inserir_lotes(engine, [linhas])
+        asyncio.run(buscar_nos_dois_motores(fabrica, motor, versao_catalogo(engine), {}))
+    assert (motor.total, motor.atualizacoes_incrementais, motor.recargas_completas) == (720, 3, 1)
+
+    recarregado = MotorBuscaMemoria(AutomovelRespostaParaAPI.model_fields)
+    asyncio.run(buscar_nos_dois_motores(fabrica, recarregado, versao_catalogo(engine), {}))
+    assert motor.pagina(None, None, 0, motor.total) == recarregado.pagina(None, None, 0, recarregado.total)